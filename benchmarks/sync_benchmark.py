@@ -0,0 +1,185 @@
+"""Offline end-to-end sync benchmark.
+
+Runs BrickSync against the in-memory stand-ins in ``bricksync.testing`` and reports
+wall time, remote calls per synced object and peak Python memory for single table,
+view graph and bulk scenarios. Example:
+
+    python -m benchmarks.sync_benchmark --tables 10000 --bulk 500 --latency-ms 2
+"""
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+import argparse, logging, time, tracemalloc
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    objects: int
+    wall_seconds: float
+    remote_calls: int
+    peak_memory_bytes: int
+    calls_by_provider: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def calls_per_object(self) -> float:
+        return self.remote_calls / self.objects if self.objects else 0.0
+
+
+@dataclass
+class BenchmarkSettings:
+    tables: int = 10000
+    schemas: int = 10
+    bulk: int = 500
+    view_depth: int = 8
+    view_width: int = 4
+    snapshots: int = 20
+    latency: float = 0.0
+    track_memory: bool = True
+
+
+def _graph_size(lakehouse: FakeLakehouse, name: str, seen=None) -> int:
+    seen = set() if seen is None else seen
+    if name in seen:
+        return 0
+    seen.add(name)
+    view = lakehouse.views.get(name)
+    if view is None:
+        return 1
+    return 1 + sum(_graph_size(lakehouse, bt, seen) for bt in view.base_tables)
+
+
+def _table_names(lakehouse: FakeLakehouse, count: int) -> List[str]:
+    return [name for name in lakehouse.tables if name.startswith("bench.schema_")][:count]
+
+
+def _sync_cold(target: str):
+    def scenario(env: FakeEnvironment, settings: BenchmarkSettings) -> Callable[[], int]:
+        bs = env.bricksync()
+        name = _table_names(env.lakehouse, 1)[0]
+        def run():
+            bs.sync("databricks", name, target, name)
+            return 1
+        return run
+    return scenario
+
+
+def _sync_warm(target: str):
+    def scenario(env: FakeEnvironment, settings: BenchmarkSettings) -> Callable[[], int]:
+        bs = env.bricksync()
+        name = _table_names(env.lakehouse, 1)[0]
+        bs.sync("databricks", name, target, name)
+        env.lakehouse.commit(name)
+        def run():
+            bs.sync("databricks", name, target, name)
+            return 1
+        return run
+    return scenario
+
+
+def _glue_to_snowflake(env: FakeEnvironment, settings: BenchmarkSettings) -> Callable[[], int]:
+    bs = env.bricksync()
+    name = _table_names(env.lakehouse, 1)[0]
+    bs.sync("databricks", name, "glue", name)
+    glue_name = ".".join(name.split(".")[1:])
+    def run():
+        bs.sync("glue", glue_name, "snowflake", name)
+        return 1
+    return run
+
+
+def _views(env: FakeEnvironment, settings: BenchmarkSettings) -> Callable[[], int]:
+    bs = env.bricksync()
+    root = env.lakehouse.add_view_graph("bench.views.graph", settings.view_depth,
+                                        settings.view_width, settings.snapshots)
+    def run():
+        bs.sync("databricks", root, "snowflake", root)
+        return _graph_size(env.lakehouse, root)
+    return run
+
+
+def _bulk(target: str):
+    def scenario(env: FakeEnvironment, settings: BenchmarkSettings) -> Callable[[], int]:
+        bs = env.bricksync()
+        names = _table_names(env.lakehouse, settings.bulk)
+        def run():
+            for name in names:
+                bs.sync("databricks", name, target, name)
+            return len(names)
+        return run
+    return scenario
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "sync-snowflake-cold": _sync_cold("snowflake"),
+    "sync-snowflake-warm": _sync_warm("snowflake"),
+    "sync-glue-cold": _sync_cold("glue"),
+    "sync-glue-warm": _sync_warm("glue"),
+    "sync-glue-to-snowflake": _glue_to_snowflake,
+    "views-snowflake": _views,
+    "bulk-glue": _bulk("glue"),
+    "bulk-snowflake": _bulk("snowflake"),
+}
+
+
+def run_scenario(name: str, settings: BenchmarkSettings) -> BenchmarkResult:
+    lakehouse = FakeLakehouse.generate(tables=settings.tables, schemas=settings.schemas,
+                                       snapshots=settings.snapshots)
+    env = FakeEnvironment(lakehouse, latency=settings.latency)
+    run = SCENARIOS[name](env, settings)
+    env.log.reset()
+    if settings.track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        objects = run()
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if settings.track_memory else 0
+    finally:
+        if settings.track_memory:
+            tracemalloc.stop()
+    return BenchmarkResult(scenario=name,
+                           objects=objects,
+                           wall_seconds=wall,
+                           remote_calls=env.log.total,
+                           peak_memory_bytes=peak,
+                           calls_by_provider=env.log.by_provider())
+
+
+def run(settings: BenchmarkSettings, scenarios: List[str] = None) -> List[BenchmarkResult]:
+    return [run_scenario(name, settings) for name in (scenarios or list(SCENARIOS))]
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    header = f"{'scenario':<26}{'objects':>8}{'wall s':>10}{'calls':>8}{'calls/obj':>11}{'peak MiB':>10}  by provider"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        providers = ", ".join(f"{k}={v}" for k, v in sorted(r.calls_by_provider.items()))
+        lines.append(f"{r.scenario:<26}{r.objects:>8}{r.wall_seconds:>10.3f}{r.remote_calls:>8}"
+                     f"{r.calls_per_object:>11.1f}{r.peak_memory_bytes / 2**20:>10.2f}  {providers}")
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Offline BrickSync sync benchmark")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run, may be repeated. Defaults to all.")
+    parser.add_argument("--tables", type=int, default=10000, help="Tables in the generated source catalog")
+    parser.add_argument("--schemas", type=int, default=10, help="Schemas the tables are spread over")
+    parser.add_argument("--bulk", type=int, default=500, help="Tables synced by the bulk scenarios")
+    parser.add_argument("--view-depth", type=int, default=8, help="Levels in the view graph")
+    parser.add_argument("--view-width", type=int, default=4, help="Views per level in the view graph")
+    parser.add_argument("--snapshots", type=int, default=20, help="Snapshots in each Iceberg metadata file")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency injected into every remote call")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+    settings = BenchmarkSettings(tables=args.tables, schemas=args.schemas, bulk=args.bulk,
+                                 view_depth=args.view_depth, view_width=args.view_width,
+                                 snapshots=args.snapshots, latency=args.latency_ms / 1000,
+                                 track_memory=not args.no_memory)
+    print(format_results(run(settings, args.scenario)))
+
+
+if __name__ == "__main__":
+    main()
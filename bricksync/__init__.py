@@ -1,13 +1,25 @@
 
-from bricksync.config import BrickSyncConfig, ProviderType, ProviderConfig, SyncConfig
+from bricksync.config import BrickSyncConfig, ProviderType, ProviderConfig, SyncConfig, MetadataCacheConfig
 from bricksync.provider import Provider
 from bricksync.table import Table, View
-from bricksync.provider.catalog import CatalogProvider
+from bricksync.provider.catalog import CatalogProvider, AsyncCatalogProvider
 from bricksync.provider.catalog.databricks import DatabricksCatalog
 from bricksync.provider.catalog.snowflake import SnowflakeCatalog
 from bricksync.provider.catalog.glue import GlueCatalog
-from typing import List, Dict, Optional, Union, Tuple
-import logging
+from bricksync.tracing import Tracer, TraceSink
+from bricksync.cache import MetadataCache
+from bricksync.events import EventSource, EventDrivenSync
+from bricksync.workqueue import WorkQueue, SyncWorker
+from bricksync.checkpoint import SyncCheckpoint, source_fingerprint
+from bricksync.result import (TargetSyncResult, SyncRunResult, SyncRunReport, SyncResult, ObjectSyncResult,
+                              SyncAction, SyncPhase, collect_actions, metadata_location)
+from bricksync.pipeline import SyncPipeline
+from bricksync.retry import RetryPolicy, CircuitBreaker
+from bricksync.ratelimit import RateLimiter
+from bricksync.exceptions import SyncRunError
+from typing import Callable, List, Dict, Optional, Union, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import logging, contextvars, asyncio, time
 
 logging.getLogger(__name__)
 
@@ -16,6 +28,12 @@ class BrickSync():
         self.config = config
         self.initialized = {}
         self.providers = {}
+        self.async_providers = {}
+        self.tracer = Tracer()
+        self.metadata_cache: Optional[MetadataCache] = None
+        if isinstance(self.config.metadata_cache, MetadataCacheConfig):
+            cache_config = self.config.metadata_cache
+            self.metadata_cache = MetadataCache(cache_config.path, cache_config.ttls, cache_config.max_entries)
         
         if len(self.config.providers) >= 1:
             self._initialize_providers()
@@ -44,6 +62,25 @@ class BrickSync():
         except Exception as e:
             raise Exception(f"Provider {provider_name} not found: {e}. You may need to add to config.")
         
+    def get_async_provider(self, provider_name: str) -> AsyncCatalogProvider:
+        """Coroutine interface over a provider. Its thread pool size is read from the
+        provider's ``async_max_threads`` configuration (default 8)."""
+        if provider_name not in self.async_providers:
+            provider: CatalogProvider = self.get_provider(provider_name)
+            max_threads = int(provider.provider.provider_config.configuration.get("async_max_threads", 8))
+            self.async_providers[provider_name] = provider.to_async(max_threads)
+        return self.async_providers[provider_name]
+
+    def set_metadata_cache(self, cache: Optional[MetadataCache]):
+        """Share cache, which persists across runs, with every provider"""
+        self.metadata_cache = cache
+        for provider in self.providers.values():
+            provider.metadata_cache = cache
+
+    def add_trace_sink(self, sink: TraceSink):
+        """Export a span for every remote call, and call counters for every sync, to sink"""
+        self.tracer.add_sink(sink)
+
     def add_sync(self, source: str, source_provider: str, target_provider: str, source_configuration = None):
         sync_conf = SyncConfig(source, source_provider, target_provider, source_configuration)
         self.config.add_sync(sync_conf)
@@ -60,46 +97,379 @@ class BrickSync():
         
         return self._initialize_provider(name, provider)
 
+    def _to_iceberg(self, source_provider: CatalogProvider, src: Table) -> Table:
+        try:
+            return source_provider.to_iceberg_table(src)
+        except Exception as e:
+            if not src.is_delta():
+                raise
+            raise Exception("Error converting delta table to iceberg") from e
+
+    async def _to_iceberg_async(self, source_provider: AsyncCatalogProvider, src: Table) -> Table:
+        try:
+            return await source_provider.to_iceberg_table(src)
+        except Exception as e:
+            if not src.is_delta():
+                raise
+            raise Exception("Error converting delta table to iceberg") from e
+
     def _sync(self, source_provider: CatalogProvider, src: Union[Table, View],
-              target_provider: CatalogProvider, target: str, **kwargs):
-        target_catalog = target_provider.get_catalog_from_name(src)
-        target_schema = target_provider.get_schema_from_name(src)
-        target_provider.create_catalog(target_catalog)
-        target_provider.create_schema(target_catalog, target_schema)
+              target_provider: CatalogProvider, target: str, result: SyncResult = None,
+              visited: Dict[str, Union[Table, View]] = None, before_write: Callable[[], None] = None,
+              **kwargs) -> Union[Table, View]:
+        """Sync src to target_provider and return the object the target now holds,
+        which can be handed straight to a further hop. Every object written and the
+        time spent in each phase are recorded in result, if given. An object several
+        views of the graph depend on is written once, keyed by name in visited.
+        before_write, if given, is called before each write to the target and stops
+        the sync by raising."""
+        if result is None:
+            result = SyncResult(source_provider.provider_name, src.name, target_provider.provider_name, target)
+        if visited is None:
+            visited = {}
+        key = src.name.lower()
+        if key in visited:
+            return visited[key]
+        with result.timed(SyncPhase.ENSURE_NAMESPACE):
+            target_catalog = target_provider.get_catalog_from_name(src)
+            target_schema = target_provider.get_schema_from_name(src)
+            target_provider.ensure_namespace(target_catalog, target_schema)
         if src.is_view():
             base_tables = src.base_tables
             for t in base_tables:
-                self._sync(source_provider, t, target_provider, target)
-            target_provider.create_or_refresh_view(src, **kwargs)
+                self._sync(source_provider, t, target_provider, target, result, visited, before_write)
+            if before_write is not None:
+                before_write()
+            with result.timed(SyncPhase.TARGET_WRITE), collect_actions() as actions:
+                target_provider.create_or_refresh_view(src, **kwargs)
+            result.objects.append(ObjectSyncResult(src.name, True, actions[-1] if actions else SyncAction.WRITTEN))
+            visited[key] = src
+            return src
         else:
-            # if delta table
-            if src.is_delta():
-                try:
-                    iceberg = src.to_iceberg_table()
-                    target_provider.create_or_refresh_external_table(iceberg, **kwargs)
-                except:
-                    raise Exception("Error converting delta table to iceberg")
-            elif src.is_iceberg():
-                target_provider.create_or_refresh_external_table(src, **kwargs)
-            else:
-                raise Exception("Unsupported table type")
-        return
- 
-    
+            with result.timed(SyncPhase.CONVERSION):
+                iceberg = self._to_iceberg(source_provider, src)
+            if before_write is not None:
+                before_write()
+            with result.timed(SyncPhase.TARGET_WRITE), collect_actions() as actions:
+                target_provider.create_or_refresh_external_table(iceberg, **kwargs)
+            result.objects.append(ObjectSyncResult(src.name, False, actions[-1] if actions else SyncAction.WRITTEN,
+                                                   metadata_location(src), iceberg.iceberg_metadata_location))
+            visited[key] = iceberg
+            return iceberg
+
+    def _sync_recorded(self, result: SyncResult, source_provider: CatalogProvider, src: Union[str, Table, View],
+                       target_provider: CatalogProvider, **kwargs) -> Union[Table, View]:
+        """_sync to result.target, reading src first if it is a name, and fill in result
+        with the remote calls made and the time taken"""
+        start = time.perf_counter()
+        with self.tracer.collect() as counters:
+            try:
+                if isinstance(src, str):
+                    with result.timed(SyncPhase.SOURCE_READ):
+                        src = source_provider.get_table(src)
+                return self._sync(source_provider, src, target_provider, result.target, result, **kwargs)
+            finally:
+                result.calls = counters
+                result.seconds = time.perf_counter() - start
+
     def sync(self, source_provider: str, source: str, 
-             target_provider: str, target: str, **kwargs):
+             target_provider: str, target: str, **kwargs) -> SyncResult:
+        """Sync source to target_provider. The result holds the action taken on each
+        object of the source graph, per-phase timings and the remote calls made."""
         src_provider: CatalogProvider = self.get_provider(source_provider)
         tgt_provider: CatalogProvider = self.get_provider(target_provider)
-        source_table: Union[View, Table] = src_provider.get_table(source)
-        self._sync(src_provider, source_table, tgt_provider, target, **kwargs)
-        return
+        result = SyncResult(source_provider, source, target_provider, target)
+        try:
+            self._sync_recorded(result, src_provider, source, tgt_provider, **kwargs)
+        finally:
+            self.tracer.export(result.calls, f"sync {source_provider}:{source} -> {target_provider}:{target}")
+        return result
+
+    def _fan_out(self, src_provider: CatalogProvider, src: Union[Table, View],
+                 tgt_providers: Dict[str, CatalogProvider], target: str,
+                 max_workers: int = None, **kwargs) -> Dict[str, TargetSyncResult]:
+        results: Dict[str, TargetSyncResult] = {tgt: TargetSyncResult(tgt, result=SyncResult(
+            src_provider.provider_name, src.name, tgt, target)) for tgt in tgt_providers}
+        with ThreadPoolExecutor(max_workers=max_workers or max(len(tgt_providers), 1)) as pool:
+            futures = {tgt: pool.submit(contextvars.copy_context().run, self._sync_recorded,
+                                        results[tgt].result, src_provider, src, provider, **kwargs)
+                       for tgt, provider in tgt_providers.items()}
+            for tgt, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"Sync of {src.name} to {tgt} failed: {e}")
+                    results[tgt].error = e
+        return results
     
-    def sync_all(self, source_provider: str, source: str, target_providers: List[str], target: str, **kwargs):
+    def sync_all(self, source_provider: str, source: str, target_providers: List[str], target: str,
+                 max_workers: int = None, **kwargs) -> Dict[str, TargetSyncResult]:
+        """Resolve source once, then push it to every target provider concurrently.
+        A failing target does not stop the others; check the result for each target."""
         src_provider: CatalogProvider = self.get_provider(source_provider)
-        for tgt in target_providers:
-            tgt_provider: CatalogProvider = self.get_provider(tgt)
-            self._sync(src_provider, source, tgt_provider, target)
-        return
+        # Providers initialize lazily, so resolve them before fanning out to threads
+        tgt_providers: Dict[str, CatalogProvider] = {tgt: self.get_provider(tgt) for tgt in target_providers}
+        with self.tracer.collect() as counters:
+            source_table: Union[View, Table] = src_provider.get_table(source)
+            results = self._fan_out(src_provider, source_table, tgt_providers, target, max_workers, **kwargs)
+        self.tracer.export(counters, f"sync_all {source_provider}:{source} -> {','.join(tgt_providers)}")
+        return results
+
+    def sync_chain(self, providers: List[str], source: str,
+                   max_workers: int = None, **kwargs) -> List[TargetSyncResult]:
+        """Sync source from providers[0] through each following provider in turn, e.g.
+        ["databricks", "glue", "snowflake"]. The table produced by each hop is handed
+        straight to the next hop instead of being read back from that hop's catalog.
+
+        A table keeps the same Iceberg metadata location at every hop, so no hop depends
+        on another and they all run concurrently. Views are synced hop by hop, and the
+        hops after a failed one are not attempted. Returns one result per hop."""
+        if len(providers) < 2:
+            raise ValueError("sync_chain needs a source provider and at least one target provider")
+        src_provider: CatalogProvider = self.get_provider(providers[0])
+        hops: List[Tuple[str, CatalogProvider]] = [(name, self.get_provider(name)) for name in providers[1:]]
+        with self.tracer.collect() as counters:
+            current: Union[View, Table] = src_provider.get_table(source)
+            # A provider repeated in the chain would write the same table twice at once
+            if current.is_table() and len({name for name, _ in hops}) == len(hops):
+                current = self._to_iceberg(src_provider, current)
+                by_target = self._fan_out(src_provider, current, dict(hops), source, max_workers, **kwargs)
+                results = [by_target[name] for name, _ in hops]
+            else:
+                results = []
+                previous = src_provider
+                for name, provider in hops:
+                    if results and not results[-1].succeeded:
+                        results.append(TargetSyncResult(name, error=Exception(
+                            f"Skipped because the hop to {results[-1].target_provider} failed")))
+                        continue
+                    result = SyncResult(providers[0], source, name, source)
+                    try:
+                        current = self._sync_recorded(result, previous, current, provider, **kwargs)
+                        results.append(TargetSyncResult(name, result=result))
+                    except Exception as e:
+                        logging.error(f"Sync of {source} to {name} failed: {e}")
+                        results.append(TargetSyncResult(name, error=e, result=result))
+                    previous = provider
+        self.tracer.export(counters, f"sync_chain {source} through {' -> '.join(providers)}")
+        return results
+
+    async def _sync_async(self, source_provider: AsyncCatalogProvider, src: Union[Table, View],
+                          target_provider: AsyncCatalogProvider, target: str, result: SyncResult = None,
+                          visited: Dict[str, asyncio.Future] = None, **kwargs) -> Union[Table, View]:
+        """Coroutine counterpart of _sync; the base tables of a view are synced concurrently,
+        so their phase timings overlap. Views sharing an object await the one sync of it."""
+        if result is None:
+            result = SyncResult(source_provider.provider_name, src.name, target_provider.provider_name, target)
+        if visited is None:
+            visited = {}
+        key = src.name.lower()
+        if key not in visited:
+            visited[key] = asyncio.ensure_future(
+                self._sync_object_async(source_provider, src, target_provider, target, result, visited, **kwargs))
+        return await visited[key]
+
+    async def _sync_object_async(self, source_provider: AsyncCatalogProvider, src: Union[Table, View],
+                                 target_provider: AsyncCatalogProvider, target: str, result: SyncResult,
+                                 visited: Dict[str, asyncio.Future], **kwargs) -> Union[Table, View]:
+        with result.timed(SyncPhase.ENSURE_NAMESPACE):
+            target_catalog = target_provider.catalog.get_catalog_from_name(src)
+            target_schema = target_provider.catalog.get_schema_from_name(src)
+            await target_provider.ensure_namespace(target_catalog, target_schema)
+        if src.is_view():
+            await asyncio.gather(*[self._sync_async(source_provider, t, target_provider, target, result, visited)
+                                   for t in src.base_tables])
+            with result.timed(SyncPhase.TARGET_WRITE), collect_actions() as actions:
+                await target_provider.create_or_refresh_view(src, **kwargs)
+            result.objects.append(ObjectSyncResult(src.name, True, actions[-1] if actions else SyncAction.WRITTEN))
+            return src
+        else:
+            with result.timed(SyncPhase.CONVERSION):
+                iceberg = await self._to_iceberg_async(source_provider, src)
+            with result.timed(SyncPhase.TARGET_WRITE), collect_actions() as actions:
+                await target_provider.create_or_refresh_external_table(iceberg, **kwargs)
+            result.objects.append(ObjectSyncResult(src.name, False, actions[-1] if actions else SyncAction.WRITTEN,
+                                                   metadata_location(src), iceberg.iceberg_metadata_location))
+            return iceberg
+
+    async def _sync_recorded_async(self, result: SyncResult, source_provider: AsyncCatalogProvider,
+                                   src: Union[str, Table, View], target_provider: AsyncCatalogProvider,
+                                   **kwargs) -> Union[Table, View]:
+        """Coroutine counterpart of _sync_recorded"""
+        start = time.perf_counter()
+        with self.tracer.collect() as counters:
+            try:
+                if isinstance(src, str):
+                    with result.timed(SyncPhase.SOURCE_READ):
+                        src = await source_provider.get_table(src)
+                return await self._sync_async(source_provider, src, target_provider, result.target, result, **kwargs)
+            finally:
+                result.calls = counters
+                result.seconds = time.perf_counter() - start
+
+    async def sync_async(self, source_provider: str, source: str,
+                         target_provider: str, target: str, **kwargs) -> SyncResult:
+        """Coroutine counterpart of sync"""
+        src_provider = self.get_async_provider(source_provider)
+        tgt_provider = self.get_async_provider(target_provider)
+        result = SyncResult(source_provider, source, target_provider, target)
+        try:
+            await self._sync_recorded_async(result, src_provider, source, tgt_provider, **kwargs)
+        finally:
+            self.tracer.export(result.calls, f"sync {source_provider}:{source} -> {target_provider}:{target}")
+        return result
+
+    async def sync_all_async(self, source_provider: str, source: str, target_providers: List[str],
+                             target: str, **kwargs) -> Dict[str, TargetSyncResult]:
+        """Coroutine counterpart of sync_all"""
+        src_provider = self.get_async_provider(source_provider)
+        tgt_providers = {tgt: self.get_async_provider(tgt) for tgt in target_providers}
+        results: Dict[str, TargetSyncResult] = {tgt: TargetSyncResult(tgt, result=SyncResult(
+            source_provider, source, tgt, target)) for tgt in tgt_providers}
+        with self.tracer.collect() as counters:
+            source_table: Union[View, Table] = await src_provider.get_table(source)
+            outcomes = await asyncio.gather(*[self._sync_recorded_async(results[tgt].result, src_provider, source_table,
+                                                                        provider, **kwargs)
+                                              for tgt, provider in tgt_providers.items()],
+                                            return_exceptions=True)
+        self.tracer.export(counters, f"sync_all {source_provider}:{source} -> {','.join(tgt_providers)}")
+        for tgt, outcome in zip(tgt_providers, outcomes):
+            if isinstance(outcome, Exception):
+                logging.error(f"Sync of {source} to {tgt} failed: {outcome}")
+                results[tgt].error = outcome
+        return results
+
+    async def sync_many_async(self, source_provider: str, sources: List[str], target_provider: str,
+                              max_concurrency: int = 100, **kwargs) -> Dict[str, TargetSyncResult]:
+        """Sync every table or view in sources to target_provider under its own name,
+        keeping up to max_concurrency of them in flight on the running event loop.
+        A failing source does not stop the others; check the result for each source."""
+        src_provider = self.get_async_provider(source_provider)
+        tgt_provider = self.get_async_provider(target_provider)
+        limit = asyncio.Semaphore(max_concurrency)
+
+        async def sync_one(source: str) -> TargetSyncResult:
+            async with limit:
+                result = SyncResult(source_provider, source, target_provider, source)
+                try:
+                    await self._sync_recorded_async(result, src_provider, source, tgt_provider, **kwargs)
+                    return TargetSyncResult(target_provider, result=result)
+                except Exception as e:
+                    logging.error(f"Sync of {source} to {target_provider} failed: {e}")
+                    return TargetSyncResult(target_provider, error=e, result=result)
+
+        with self.tracer.collect() as counters:
+            results = await asyncio.gather(*[sync_one(source) for source in sources])
+        self.tracer.export(counters, f"sync_many {source_provider} -> {target_provider} ({len(sources)} objects)")
+        return dict(zip(sources, results))
+
+    def run_sync(self, sync: SyncConfig, checkpoint: SyncCheckpoint = None,
+                 before_write: Callable[[], None] = None) -> SyncRunResult:
+        """Run one configured sync under its source name. A failure is returned in the
+        result rather than raised. With a checkpoint, see run. before_write is called
+        before each write to the target, and can stop the sync by raising."""
+        start = time.perf_counter()
+        result = SyncResult(sync.source_provider, sync.source, sync.target_provider, sync.source)
+        try:
+            src_provider: CatalogProvider = self.get_provider(sync.source_provider)
+            tgt_provider: CatalogProvider = self.get_provider(sync.target_provider)
+            if checkpoint is None:
+                try:
+                    self._sync_recorded(result, src_provider, sync.source, tgt_provider, before_write=before_write)
+                finally:
+                    self.tracer.export(result.calls, f"sync {sync.source_provider}:{sync.source} -> "
+                                                     f"{sync.target_provider}:{sync.source}")
+                return SyncRunResult(sync, time.perf_counter() - start, result=result)
+            with self.tracer.collect() as counters:
+                with result.timed(SyncPhase.SOURCE_READ):
+                    source_table: Union[View, Table] = src_provider.get_table(sync.source)
+                fingerprint = source_fingerprint(source_table, src_provider.converted_delta_version)
+                skipped = checkpoint.is_current(sync, fingerprint)
+                if skipped:
+                    result.objects.append(ObjectSyncResult(source_table.name, source_table.is_view(),
+                                                           SyncAction.SKIPPED, metadata_location(source_table)))
+                else:
+                    self._sync(src_provider, source_table, tgt_provider, sync.source, result,
+                               before_write=before_write)
+                    checkpoint.mark_done(sync, fingerprint)
+            result.calls = counters
+            result.seconds = time.perf_counter() - start
+            self.tracer.export(counters, f"sync {sync.source_provider}:{sync.source} -> {sync.target_provider}:{sync.source}")
+            return SyncRunResult(sync, time.perf_counter() - start, skipped=skipped, result=result)
+        except Exception as e:
+            logging.error(f"Sync of {sync.source} to {sync.target_provider} failed: {e}")
+            return SyncRunResult(sync, time.perf_counter() - start, error=e, result=result)
+
+    def run(self, max_workers: int = 8, checkpoint: SyncCheckpoint = None, resume: bool = False) -> SyncRunReport:
+        """Execute every configured sync, each under its source name, on a pool of
+        max_workers threads. With skip_failures a failing sync is recorded in the report
+        and the others carry on; otherwise no further syncs are started after the first
+        failure, and it is raised as a SyncRunError, carrying the report of the syncs
+        attempted, once the running ones have finished.
+
+        With a checkpoint, every completed sync is recorded in it. With resume, syncs
+        the checkpoint holds are skipped unless their source has moved on since; the
+        source is still read to check, but nothing is written to the target. Without
+        resume the checkpoint is cleared first."""
+        syncs: List[SyncConfig] = list(self.config.syncs)
+        if checkpoint is not None and not resume:
+            checkpoint.clear()
+        # Providers initialize lazily, so resolve them before handing out to threads
+        for name in {s.source_provider for s in syncs} | {s.target_provider for s in syncs}:
+            self.get_provider(name)
+        report = SyncRunReport()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, self.run_sync, sync, checkpoint) for sync in syncs]
+            if not self.config.skip_failures:
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    if any(not f.result().succeeded for f in done):
+                        for f in pending:
+                            f.cancel()
+                        break
+            report.results = [f.result() for f in futures if not f.cancelled()]
+        report.wall_seconds = time.perf_counter() - start
+        if report.failures and not self.config.skip_failures:
+            failed = report.failures[0]
+            raise SyncRunError(f"Sync of {failed.sync.source} to {failed.sync.target_provider} failed, "
+                               f"{len(report.results)}/{len(syncs)} syncs attempted", report) from failed.error
+        return report
+
+    def sync_namespace(self, source_provider: str, namespace: str, target_provider: str,
+                       queue_size: int = 256, resolve_workers: int = 8, write_workers: int = 8) -> SyncRunReport:
+        """Sync every table and view of namespace, a catalog or catalog.schema, to
+        target_provider under its own name. Objects stream through listing, metadata
+        resolution, namespace creation and target writes, so syncing starts before the
+        listing ends and memory stays flat. See SyncPipeline to consume results as they land."""
+        start = time.perf_counter()
+        pipeline = SyncPipeline(self, source_provider, target_provider, queue_size, resolve_workers, write_workers)
+        with self.tracer.collect() as counters:
+            results = list(pipeline.run(namespace))
+        self.tracer.export(counters, f"sync_namespace {source_provider}:{namespace} -> {target_provider}")
+        return SyncRunReport(results, time.perf_counter() - start)
+
+    def work(self, queue: WorkQueue, max_tasks: int = None, worker_id: str = None) -> SyncRunReport:
+        """Run as one worker of a distributed sweep: claim table-sync tasks from queue
+        and sync them until it is drained. Populate the queue with queue.enqueue, e.g.
+        from config.syncs. See SyncWorker."""
+        start = time.perf_counter()
+        results = SyncWorker(self, queue, worker_id).run(max_tasks)
+        return SyncRunReport(results, time.perf_counter() - start)
+
+    def close(self):
+        """Shut down the thread pools of the providers"""
+        for provider in self.async_providers.values():
+            provider.close()
+        self.async_providers = {}
+        for provider in self.providers.values():
+            provider.shutdown_resolve_executor()
+
+    def watch(self, source: EventSource, poll_timeout: float = 1.0, max_events: int = None) -> int:
+        """Sync the tables of the configured syncs as new metadata files for them are
+        reported by source, instead of polling the source catalog. See EventDrivenSync."""
+        return EventDrivenSync(self).run(source, poll_timeout, max_events)
 
     def _is_value_secret(self, value: str) -> bool:
         if value.startswith("secret://"):
@@ -117,19 +487,30 @@ class BrickSync():
         v = provider_conf
         if provider_conf.provider.value == 'databricks':
             logging.info(f"Initializing databricks provider {k}...")
-            self.providers[k] = DatabricksCatalog.initialize(v)
+            self._register_provider(k, DatabricksCatalog.initialize(v))
         elif v.provider.value == 'snowflake':
             logging.info(f"Initializing snowflake provider {k}...")
-            self.providers[k] = SnowflakeCatalog.initialize(v)
+            self._register_provider(k, SnowflakeCatalog.initialize(v))
         elif v.provider.value == 'glue':
             logging.info(f"Initializing glue provider {k}...")
-            self.providers[k] = GlueCatalog.initialize(v)
+            self._register_provider(k, GlueCatalog.initialize(v))
         else:
             raise Exception(f"Unknown provider type {v.type}")
 
-        self.initialized[name] = True
         return self
 
+    def _register_provider(self, name: str, provider: CatalogProvider):
+        provider.tracer = self.tracer
+        configuration = provider.provider.provider_config.configuration
+        provider.resolve_max_threads = int(configuration.get("resolve_max_threads", 8))
+        provider.retry_policy = RetryPolicy.from_configuration(configuration)
+        provider.circuit_breaker = CircuitBreaker.from_configuration(configuration)
+        provider.rate_limiter = RateLimiter.from_configuration(configuration)
+        provider.metadata_cache = self.metadata_cache
+        provider.cache_namespace = name
+        self.providers[name] = provider
+        self.initialized[name] = True
+
     def _initialize_providers(self):
         logging.info("Initializing providers")
         for providers in self.config.providers:
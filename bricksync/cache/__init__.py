@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, Optional
+from enum import Enum
+from bricksync.sqlite import SQLiteDatabase
+import threading, time, json, logging
+
+
+class CacheEntryType(Enum):
+    SOURCE_TABLE = "source_table"  # Stable part of a source table, e.g. its type, location and properties
+    TARGET_STATE = "target_state"  # Metadata location last written to a target table
+    PROVIDER = "provider"          # Provider descriptors, e.g. Snowflake external volumes and integrations
+
+
+DEFAULT_TTLS: Dict[CacheEntryType, float] = {
+    CacheEntryType.SOURCE_TABLE: 3600,
+    CacheEntryType.TARGET_STATE: 300,
+    CacheEntryType.PROVIDER: 86400,
+}
+
+_SCHEMA = """CREATE TABLE IF NOT EXISTS entries (
+    entry_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (entry_type, key))"""
+
+
+class MetadataCache():
+    """Metadata cache kept in a SQLite file, so it is shared by every run and every
+    process pointing at the same path.
+
+    Entries are JSON values keyed by entry type and key. Each entry type has its own
+    TTL, after which the entry is treated as missing. The cache holds about
+    ``max_entries`` entries, evicting the least recently used ones. SQLite's WAL mode
+    and busy timeout make concurrent readers and writers from several processes safe.
+
+    To keep reads from taking the write lock, a hit only records its access time once
+    the last recorded access is older than ``touch_fraction`` of the entry's TTL, so
+    recency is tracked to that granularity. The entries are counted, and the excess
+    evicted, every ``max_entries // 100`` puts, so the cache may briefly hold up to 1%
+    more entries than ``max_entries``.
+    """
+    touch_fraction: float = 0.1
+
+    def __init__(self, path: str, ttls: Dict[CacheEntryType, float] = None, max_entries: int = 100000,
+                 timeout: float = 30.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **{CacheEntryType(k): v for k, v in (ttls or {}).items()}}
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.clock = clock
+        self.evict_every = max(1, max_entries // 100)
+        self._db = SQLiteDatabase(path, timeout)
+        self._puts = 0
+        self._puts_lock = threading.Lock()
+        with self._db.transaction() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def get(self, entry_type: CacheEntryType, key: str) -> Optional[Any]:
+        """The cached value, or None if it is missing or older than its entry type's TTL"""
+        now = self.clock()
+        row = self._db.connection.execute("SELECT value, stored_at, accessed_at FROM entries WHERE entry_type = ? AND key = ?",
+                                          (entry_type.value, key)).fetchone()
+        if row is None:
+            return None
+        value, stored_at, accessed_at = row
+        ttl = self.ttls[entry_type]
+        if now - stored_at > ttl:
+            self.invalidate(entry_type, key)
+            return None
+        if now - accessed_at >= ttl * self.touch_fraction:
+            self._db.connection.execute("UPDATE entries SET accessed_at = ? WHERE entry_type = ? AND key = ?",
+                                        (now, entry_type.value, key))
+        return json.loads(value)
+
+    def put(self, entry_type: CacheEntryType, key: str, value: Any):
+        now = self.clock()
+        with self._puts_lock:
+            self._puts += 1
+            evict = self._puts % self.evict_every == 0
+        with self._db.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                         (entry_type.value, key, json.dumps(value), now, now))
+            if not evict:
+                return
+            excess = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+            if excess > 0:
+                logging.debug(f"Evicting {excess} least recently used metadata cache entries")
+                conn.execute("DELETE FROM entries WHERE rowid IN "
+                             "(SELECT rowid FROM entries ORDER BY accessed_at LIMIT ?)", (excess,))
+
+    def invalidate(self, entry_type: CacheEntryType, key: str = None):
+        """Drop one entry, or every entry of entry_type if key is None"""
+        with self._db.transaction() as conn:
+            if key is None:
+                conn.execute("DELETE FROM entries WHERE entry_type = ?", (entry_type.value,))
+            else:
+                conn.execute("DELETE FROM entries WHERE entry_type = ? AND key = ?", (entry_type.value, key))
+
+    def clear(self):
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        return self._db.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        self._db.close()
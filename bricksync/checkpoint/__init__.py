@@ -0,0 +1,75 @@
+from bricksync.config import SyncConfig
+from bricksync.table import Table, View
+from bricksync.sqlite import SQLiteDatabase
+from typing import Callable, Optional, Union
+import time, hashlib
+
+_SCHEMA = """CREATE TABLE IF NOT EXISTS completed (
+    source_provider TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target_provider TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (source_provider, source, target_provider))"""
+
+
+def source_fingerprint(src: Union[Table, View],
+                       delta_version: Callable[[Table], Optional[int]] = None) -> str:
+    """Identifies the state of a source object: the Iceberg metadata file of a table,
+    and the definition and base table fingerprints of a view. A Delta table that is
+    converted in process has no metadata file yet, so it is identified by the Delta
+    version delta_version, the source provider's converted_delta_version, returns for
+    it. It changes whenever a sync of the object would write something new."""
+    if src.is_view():
+        digest = hashlib.sha256(src.view_definition.encode())
+        for t in src.base_tables:
+            digest.update(source_fingerprint(t, delta_version).encode())
+        return f"view:{digest.hexdigest()}"
+    if src.is_delta() and src.is_iceberg():
+        return src.uniform_iceberg_info.metadata_location
+    if src.is_iceberg():
+        return src.iceberg_metadata_location
+    version = delta_version(src) if delta_version is not None else None
+    if version is not None:
+        return f"delta:{src.storage_location}@{version}"
+    return src.storage_location
+
+
+class SyncCheckpoint():
+    """Per-sync completion record of a bulk run, kept in a SQLite file so a failed or
+    interrupted run can be resumed. Each completed sync is stored with the fingerprint
+    of the source it synced; on resume a sync is only skipped if its source still has
+    that fingerprint."""
+    def __init__(self, path: str, timeout: float = 30.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.timeout = timeout
+        self.clock = clock
+        self._db = SQLiteDatabase(path, timeout)
+        with self._db.transaction() as conn:
+            conn.execute(_SCHEMA)
+
+    def get(self, sync: SyncConfig) -> Optional[str]:
+        """Fingerprint the sync completed with, or None if it has not completed"""
+        row = self._db.connection.execute("SELECT fingerprint FROM completed WHERE source_provider = ? AND source = ? "
+                                          "AND target_provider = ?",
+                                          (sync.source_provider, sync.source, sync.target_provider)).fetchone()
+        return row[0] if row else None
+
+    def is_current(self, sync: SyncConfig, fingerprint: str) -> bool:
+        """True if sync completed and its source has not moved on since"""
+        return self.get(sync) == fingerprint
+
+    def mark_done(self, sync: SyncConfig, fingerprint: str):
+        with self._db.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO completed VALUES (?, ?, ?, ?, ?)",
+                         (sync.source_provider, sync.source, sync.target_provider, fingerprint, self.clock()))
+
+    def clear(self):
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM completed")
+
+    def __len__(self) -> int:
+        return self._db.connection.execute("SELECT COUNT(*) FROM completed").fetchone()[0]
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,52 @@
+"""Console entry point: runs every sync in a BrickSync config file.
+
+    bricksync my.yaml --workers 16
+
+With --queue, the process is one worker of a distributed sweep and syncs the tasks
+it claims from a shared work queue instead:
+
+    bricksync my.yaml --queue /shared/bricksync-queue.db --enqueue
+"""
+from bricksync import BrickSync
+from bricksync.workqueue import WorkQueue
+from bricksync.checkpoint import SyncCheckpoint
+from bricksync.exceptions import SyncRunError
+from typing import List
+import argparse, logging, sys
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="bricksync", description="Run the syncs defined in a BrickSync config")
+    parser.add_argument("config", help="Path to the YAML config file")
+    parser.add_argument("--workers", type=int, default=8, help="Syncs run concurrently")
+    parser.add_argument("--checkpoint", help="Path to a SQLite file recording completed syncs")
+    parser.add_argument("--resume", action="store_true", help="Skip syncs the checkpoint holds whose source is unchanged")
+    parser.add_argument("--queue", help="Path to a shared SQLite work queue to claim syncs from")
+    parser.add_argument("--enqueue", action="store_true", help="Add the config's syncs to the queue first")
+    parser.add_argument("--lease-seconds", type=float, default=60.0, help="Lease taken on each claimed sync")
+    parser.add_argument("--log-level", default="INFO", help="Python logging level")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+    bs = BrickSync.load(args.config)
+    try:
+        if args.queue:
+            queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds)
+            if args.enqueue:
+                queue.enqueue(bs.config.syncs)
+            report = bs.work(queue)
+        else:
+            checkpoint = SyncCheckpoint(args.checkpoint) if args.checkpoint else None
+            report = bs.run(max_workers=args.workers, checkpoint=checkpoint, resume=args.resume)
+    except Exception as e:
+        if isinstance(e, SyncRunError):
+            print(e.report.summary())
+        print(f"{e}: {e.__cause__}" if e.__cause__ else str(e), file=sys.stderr)
+        return 1
+    finally:
+        bs.close()
+    print(report.summary())
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -55,12 +55,19 @@ class SyncOptions:
     base_table_schema_override: Optional[str] = None
     target_provider_options: Optional[Dict[str, str]] = None 
 
+@dataclass
+class MetadataCacheConfig:
+    path: str
+    max_entries: int = 100000
+    ttls: Optional[Dict[str, float]] = Field(default_factory=dict) # Seconds per entry type, e.g. target_state: 60
+
 @dataclass
 class BrickSyncConfig:
     providers: List[Dict[str, ProviderConfig]]
     syncs: List[SyncConfig] = dataclasses.field(default_factory=list) 
     skip_failures: bool = False
     continuous: bool = False
+    metadata_cache: Optional[MetadataCacheConfig] = None
     @classmethod
     def load(cls, config_path):
         yml = yaml.safe_load(Path(config_path).read_text())
@@ -0,0 +1,488 @@
+from bricksync.delta import DeltaLogReader
+from bricksync.table import DeltaTable, IcebergTable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+from pyiceberg.io import FileIO
+from pyiceberg.manifest import (DataFile, DataFileContent, FileFormat, ManifestEntry, ManifestEntryStatus,
+                                ManifestFile, write_manifest, write_manifest_list)
+from pyiceberg.partitioning import PartitionField, PartitionSpec
+from pyiceberg.schema import Schema
+from pyiceberg.serializers import FromInputFile, ToOutputFile
+from pyiceberg.table.metadata import TableMetadataV2
+from pyiceberg.table.refs import MAIN_BRANCH, SnapshotRef, SnapshotRefType
+from pyiceberg.table.snapshots import MetadataLogEntry, Operation, Snapshot, SnapshotLogEntry, Summary
+from pyiceberg.table.sorting import UNSORTED_SORT_ORDER
+from pyiceberg.transforms import IdentityTransform
+from pyiceberg.typedef import Record
+from pyiceberg.types import (BinaryType, BooleanType, DateType, DecimalType, DoubleType, FloatType, IcebergType,
+                             IntegerType, ListType, LongType, MapType, NestedField, StringType, StructType,
+                             TimestampType, TimestamptzType)
+import json, logging, os, re, threading, time, uuid
+
+# Table property holding the Delta version a metadata file was converted from
+DELTA_VERSION_PROPERTY = "bricksync.delta.version"
+NAME_MAPPING_PROPERTY = "schema.name-mapping.default"
+VERSION_HINT = "version-hint.text"
+_PARTITION_FIELD_ID_START = 1000
+_METADATA_LOG_MAX = 100
+_DECIMAL = re.compile(r"^decimal\((\d+),\s*(\d+)\)$")
+_PRIMITIVES = {"string": StringType(), "long": LongType(), "integer": IntegerType(), "short": IntegerType(),
+               "byte": IntegerType(), "float": FloatType(), "double": DoubleType(), "boolean": BooleanType(),
+               "binary": BinaryType(), "date": DateType(), "timestamp": TimestamptzType(),
+               "timestamp_ntz": TimestampType()}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _record(cls, **fields):
+    """pyiceberg records are built with from_args in recent versions and with keyword
+    arguments before that"""
+    return cls.from_args(**fields) if hasattr(cls, "from_args") else cls(**fields)
+
+
+class _SchemaBuilder():
+    """Turns a Delta schema into an Iceberg schema. A field keeps the id it had in the
+    previous Iceberg schema, found by its path of names, and new fields take fresh ids."""
+    def __init__(self, previous: Optional[Schema], last_column_id: int):
+        self.previous_ids: Dict[Tuple[str, ...], int] = {}
+        if previous is not None:
+            self._index(previous.as_struct(), ())
+        self.last_column_id = last_column_id
+
+    def _index(self, iceberg_type: IcebergType, path: Tuple[str, ...]):
+        if isinstance(iceberg_type, StructType):
+            for f in iceberg_type.fields:
+                self.previous_ids[path + (f.name,)] = f.field_id
+                self._index(f.field_type, path + (f.name,))
+        elif isinstance(iceberg_type, ListType):
+            self.previous_ids[path + ("element",)] = iceberg_type.element_id
+            self._index(iceberg_type.element_type, path + ("element",))
+        elif isinstance(iceberg_type, MapType):
+            self.previous_ids[path + ("key",)] = iceberg_type.key_id
+            self.previous_ids[path + ("value",)] = iceberg_type.value_id
+            self._index(iceberg_type.key_type, path + ("key",))
+            self._index(iceberg_type.value_type, path + ("value",))
+
+    def _id(self, path: Tuple[str, ...]) -> int:
+        if path in self.previous_ids:
+            return self.previous_ids[path]
+        self.last_column_id += 1
+        return self.last_column_id
+
+    def _type(self, delta_type: Any, path: Tuple[str, ...]) -> IcebergType:
+        if isinstance(delta_type, str):
+            if delta_type in _PRIMITIVES:
+                return _PRIMITIVES[delta_type]
+            decimal = _DECIMAL.match(delta_type)
+            if decimal:
+                return DecimalType(int(decimal.group(1)), int(decimal.group(2)))
+            raise NotImplementedError(f"Delta type {delta_type} has no Iceberg counterpart")
+        kind = delta_type["type"]
+        if kind == "struct":
+            return StructType(*self._fields(delta_type["fields"], path))
+        if kind == "array":
+            element_id = self._id(path + ("element",))
+            return ListType(element_id, self._type(delta_type["elementType"], path + ("element",)),
+                            not delta_type.get("containsNull", True))
+        if kind == "map":
+            key_id, value_id = self._id(path + ("key",)), self._id(path + ("value",))
+            return MapType(key_id, self._type(delta_type["keyType"], path + ("key",)),
+                           value_id, self._type(delta_type["valueType"], path + ("value",)),
+                           not delta_type.get("valueContainsNull", True))
+        raise NotImplementedError(f"Delta type {kind} has no Iceberg counterpart")
+
+    def _fields(self, fields: List[Dict[str, Any]], path: Tuple[str, ...]) -> List[NestedField]:
+        nested = []
+        for f in fields:
+            field_path = path + (f["name"],)
+            field_id = self._id(field_path)
+            nested.append(NestedField(field_id=field_id, name=f["name"], field_type=self._type(f["type"], field_path),
+                                      required=not f.get("nullable", True)))
+        return nested
+
+    def schema(self, schema_string: str, schema_id: int) -> Schema:
+        return Schema(*self._fields(json.loads(schema_string)["fields"], ()), schema_id=schema_id)
+
+
+def _name_mapping(fields: Iterable[NestedField]) -> List[Dict[str, Any]]:
+    """Iceberg name mapping of a schema, which lets readers match the columns of Delta's
+    data files, written without field ids, by name"""
+    def nested(iceberg_type: IcebergType) -> List[Dict[str, Any]]:
+        if isinstance(iceberg_type, StructType):
+            return _name_mapping(iceberg_type.fields)
+        if isinstance(iceberg_type, ListType):
+            return [{"field-id": iceberg_type.element_id, "names": ["element"], **children(iceberg_type.element_type)}]
+        if isinstance(iceberg_type, MapType):
+            return [{"field-id": iceberg_type.key_id, "names": ["key"], **children(iceberg_type.key_type)},
+                    {"field-id": iceberg_type.value_id, "names": ["value"], **children(iceberg_type.value_type)}]
+        return []
+
+    def children(iceberg_type: IcebergType) -> Dict[str, Any]:
+        fields = nested(iceberg_type)
+        return {"fields": fields} if fields else {}
+
+    return [{"field-id": f.field_id, "names": [f.name], **children(f.field_type)} for f in fields]
+
+
+def _partition_value(value: Optional[str], iceberg_type: IcebergType) -> Any:
+    """Iceberg partition value of a Delta partition value, which is always a string"""
+    if value is None or (value == "" and not isinstance(iceberg_type, StringType)):
+        return None
+    if isinstance(iceberg_type, (IntegerType, LongType)):
+        return int(value)
+    if isinstance(iceberg_type, (FloatType, DoubleType)):
+        return float(value)
+    if isinstance(iceberg_type, BooleanType):
+        return value.lower() == "true"
+    if isinstance(iceberg_type, DecimalType):
+        return Decimal(value)
+    if isinstance(iceberg_type, DateType):
+        return (date.fromisoformat(value) - date(1970, 1, 1)).days
+    if isinstance(iceberg_type, (TimestampType, TimestamptzType)):
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        delta = parsed - _EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    if isinstance(iceberg_type, StringType):
+        return value
+    raise NotImplementedError(f"Partition columns of type {iceberg_type} are not supported")
+
+
+
+
+@dataclass
+class _Changes:
+    """What the Delta commits after the last conversion did: the files they added,
+    keyed by absolute path, the paths they removed and their last metaData action"""
+    added: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    removed: Set[str] = field(default_factory=set)
+    metadata: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class _Layout:
+    """Schemas and partition specs of the table being written"""
+    schema: Schema
+    schemas: List[Schema]
+    last_column_id: int
+    spec: PartitionSpec
+    specs: List[PartitionSpec]
+
+    @property
+    def partition_columns(self) -> List[str]:
+        return [f.name for f in self.spec.fields]
+
+
+@dataclass
+class _Converted:
+    version: int # Delta version
+    number: int # Number of the v<N>.metadata.json file
+    metadata_location: str
+    metadata: TableMetadataV2
+
+
+class DeltaIcebergConverter():
+    """Writes Iceberg metadata for a Delta table from its _delta_log, in process, so a
+    table that is not UniForm can be synced without Databricks compute.
+
+    Metadata goes under the table's metadata/ directory as v<N>.metadata.json files,
+    with a version-hint.text holding the latest N. Each metadata file records the Delta
+    version it was converted from, and the next conversion only reads the commits after
+    it: their added files go into a new manifest and the manifests holding removed files
+    are rewritten. The log is replayed in full from its last checkpoint the first time,
+    when the partition columns change or when the commits needed have been cleaned up.
+
+    Tables with deletion vectors or column mapping are not supported. Conversions of a
+    table are serialized within a process; two processes must not convert the same
+    table at once."""
+    def __init__(self, delta_log: DeltaLogReader, file_io: FileIO, max_manifest_entries: int = 100000,
+                 clock: Callable[[], float] = time.time):
+        self.delta_log = delta_log
+        self.file_io = file_io
+        self.max_manifest_entries = max_manifest_entries
+        self.clock = clock
+        self._converted: Dict[str, _Converted] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _table_lock(self, location: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(location, threading.Lock())
+
+    def _now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    def _absolute(self, location: str, path: str) -> str:
+        path = unquote(path)
+        return path if "://" in path or path.startswith("/") else f"{location}/{path}"
+
+    def _current(self, location: str) -> Optional[_Converted]:
+        """The last conversion of the table at location, if there is one"""
+        if location in self._converted:
+            return self._converted[location]
+        try:
+            with self.file_io.new_input(f"{location}/metadata/{VERSION_HINT}").open() as f:
+                number = int(f.read().decode().strip())
+        except FileNotFoundError:
+            return None
+        metadata_location = f"{location}/metadata/v{number}.metadata.json"
+        metadata = FromInputFile.table_metadata(self.file_io.new_input(metadata_location))
+        if DELTA_VERSION_PROPERTY not in metadata.properties:
+            raise ValueError(f"{metadata_location} was not converted from Delta by BrickSync")
+        return _Converted(int(metadata.properties[DELTA_VERSION_PROPERTY]), number, metadata_location, metadata)
+
+    def _changes(self, table: DeltaTable, location: str, previous: Optional[_Converted],
+                 latest: int) -> Optional[_Changes]:
+        """Changes made by the commits since the previous conversion, or None if the
+        table has to be converted in full"""
+        if previous is None:
+            return None
+        changes = _Changes()
+        try:
+            for version in range(previous.version + 1, latest + 1):
+                for action in self.delta_log.commit_actions(location, version):
+                    if "add" in action:
+                        changes.added[self._absolute(location, action["add"]["path"])] = action["add"]
+                    elif "remove" in action:
+                        path = self._absolute(location, action["remove"]["path"])
+                        changes.added.pop(path, None)
+                        changes.removed.add(path)
+                    elif "metaData" in action:
+                        changes.metadata = action["metaData"]
+        except FileNotFoundError:
+            logging.info(f"Commits of {table.name} after version {previous.version} were cleaned up, "
+                         f"converting it in full")
+            return None
+        previous_columns = [f.name for f in previous.metadata.spec().fields]
+        if changes.metadata is not None and list(changes.metadata.get("partitionColumns") or []) != previous_columns:
+            logging.info(f"Partition columns of {table.name} changed, converting it in full")
+            return None
+        return changes
+
+    def _snapshot(self, table: DeltaTable, location: str, version: int) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """metaData action and live files, keyed by absolute path, of the table as of version"""
+        metadata, live = None, {}
+        for action in self.delta_log.snapshot_actions(location, version):
+            if "add" in action:
+                live[self._absolute(location, action["add"]["path"])] = action["add"]
+            elif "remove" in action:
+                live.pop(self._absolute(location, action["remove"]["path"]), None)
+            elif "metaData" in action:
+                metadata = action["metaData"]
+        if metadata is None:
+            raise ValueError(f"No metaData action in the _delta_log of {table.name}")
+        return metadata, live
+
+    def _layout(self, table: DeltaTable, delta_metadata: Optional[Dict[str, Any]],
+                previous: Optional[_Converted]) -> _Layout:
+        """Schema and partition spec for delta_metadata, reusing the previous ones, and
+        their field ids, where they match"""
+        if delta_metadata is None:
+            return _Layout(previous.metadata.schema(), previous.metadata.schemas, previous.metadata.last_column_id,
+                           previous.metadata.spec(), previous.metadata.partition_specs)
+        mode = (delta_metadata.get("configuration") or {}).get("delta.columnMapping.mode", "none")
+        if mode != "none":
+            raise NotImplementedError(f"Table {table.name} uses column mapping mode {mode}, which cannot be converted")
+        schemas = list(previous.metadata.schemas) if previous else []
+        current = previous.metadata.schema() if previous else None
+        builder = _SchemaBuilder(current, previous.metadata.last_column_id if previous else 0)
+        schema = builder.schema(delta_metadata["schemaString"], max((s.schema_id for s in schemas), default=-1) + 1)
+        if current is not None and schema.as_struct() == current.as_struct():
+            schema = current
+        else:
+            schemas.append(schema)
+
+        fields = [PartitionField(source_id=schema.find_field(c).field_id, field_id=_PARTITION_FIELD_ID_START + i,
+                                 transform=IdentityTransform(), name=c)
+                  for i, c in enumerate(delta_metadata.get("partitionColumns") or [])]
+        specs = list(previous.metadata.partition_specs) if previous else []
+        spec = next((s for s in specs if list(s.fields) == fields), None)
+        if spec is None:
+            spec = PartitionSpec(*fields, spec_id=max((s.spec_id for s in specs), default=-1) + 1)
+            specs.append(spec)
+        return _Layout(schema, schemas, max(builder.last_column_id, previous.metadata.last_column_id if previous else 0),
+                       spec, specs)
+
+    def _data_file(self, table: DeltaTable, path: str, add: Dict[str, Any], layout: _Layout) -> DataFile:
+        if add.get("deletionVector"):
+            raise NotImplementedError(f"Table {table.name} has deletion vectors, which cannot be converted")
+        stats = json.loads(add["stats"]) if add.get("stats") else {}
+        if "numRecords" not in stats:
+            raise ValueError(f"File {path} of table {table.name} has no record count in its Delta stats")
+        values = add.get("partitionValues") or {}
+        partition = [_partition_value(values.get(c), layout.schema.find_field(c).field_type)
+                     for c in layout.partition_columns]
+        columns = {f.name: f.field_id for f in layout.schema.fields}
+        null_counts = {columns[c]: n for c, n in (stats.get("nullCount") or {}).items()
+                       if c in columns and isinstance(n, int)}
+        return _record(DataFile, content=DataFileContent.DATA, file_path=path, file_format=FileFormat.PARQUET,
+                       partition=Record(*partition), record_count=stats["numRecords"],
+                       file_size_in_bytes=add["size"], null_value_counts=null_counts or None)
+
+    def _added_entries(self, table: DeltaTable, files: Dict[str, Dict[str, Any]], snapshot_id: int,
+                       layout: _Layout) -> Iterator[ManifestEntry]:
+        for path, add in files.items():
+            yield _record(ManifestEntry, status=ManifestEntryStatus.ADDED, snapshot_id=snapshot_id,
+                          data_sequence_number=None, file_sequence_number=None,
+                          data_file=self._data_file(table, path, add, layout))
+
+    def _write_manifests(self, location: str, snapshot_id: int, layout: _Layout,
+                         entries: Iterable[ManifestEntry]) -> List[ManifestFile]:
+        """Write entries to manifests of at most max_manifest_entries entries each"""
+        manifests, batch = [], []
+
+        def flush():
+            path = f"{location}/metadata/{uuid.uuid4()}-m{len(manifests)}.avro"
+            with write_manifest(format_version=2, spec=layout.spec, schema=layout.schema,
+                                output_file=self.file_io.new_output(path), snapshot_id=snapshot_id) as writer:
+                for entry in batch:
+                    writer.add_entry(entry)
+            manifests.append(writer.to_manifest_file())
+            batch.clear()
+
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= self.max_manifest_entries:
+                flush()
+        if batch:
+            flush()
+        return manifests
+
+    def _carried_manifests(self, location: str, previous: _Converted, removed: Set[str], snapshot_id: int,
+                           layout: _Layout) -> List[ManifestFile]:
+        """Manifests of the previous snapshot, with those holding removed files rewritten
+        to mark them deleted"""
+        if previous.metadata.current_snapshot_id is None:
+            return []
+        snapshot = previous.metadata.snapshot_by_id(previous.metadata.current_snapshot_id)
+        manifests = []
+        for manifest in snapshot.manifests(self.file_io):
+            entries = manifest.fetch_manifest_entry(self.file_io, discard_deleted=True) if removed else []
+            if not any(e.data_file.file_path in removed for e in entries):
+                manifests.append(manifest)
+                continue
+            rewritten = [_record(ManifestEntry, status=ManifestEntryStatus.DELETED, snapshot_id=snapshot_id,
+                                 data_sequence_number=e.data_sequence_number,
+                                 file_sequence_number=e.file_sequence_number, data_file=e.data_file)
+                         if e.data_file.file_path in removed else
+                         _record(ManifestEntry, status=ManifestEntryStatus.EXISTING, snapshot_id=e.snapshot_id,
+                                 data_sequence_number=e.data_sequence_number,
+                                 file_sequence_number=e.file_sequence_number, data_file=e.data_file)
+                         for e in entries]
+            manifests.extend(self._write_manifests(location, snapshot_id, layout, rewritten))
+        return manifests
+
+    def _write_snapshot(self, location: str, previous: Optional[_Converted], snapshot_id: int, version: int,
+                        layout: _Layout, manifests: List[ManifestFile], operation: Operation,
+                        summary: Dict[str, str]) -> Snapshot:
+        parent_snapshot_id = previous.metadata.current_snapshot_id if previous else None
+        sequence_number = (previous.metadata.last_sequence_number if previous else 0) + 1
+        manifest_list = f"{location}/metadata/snap-{snapshot_id}-1-{uuid.uuid4()}.avro"
+        with write_manifest_list(format_version=2, output_file=self.file_io.new_output(manifest_list),
+                                 snapshot_id=snapshot_id, parent_snapshot_id=parent_snapshot_id,
+                                 sequence_number=sequence_number) as writer:
+            writer.add_manifests(manifests)
+        return Snapshot(snapshot_id=snapshot_id, parent_snapshot_id=parent_snapshot_id,
+                        sequence_number=sequence_number, timestamp_ms=self._now_ms(),
+                        manifest_list=manifest_list, schema_id=layout.schema.schema_id,
+                        summary=Summary(operation, **summary, **{DELTA_VERSION_PROPERTY: str(version)}))
+
+    def _commit(self, location: str, table_uuid: uuid.UUID, version: int, previous: Optional[_Converted],
+                layout: _Layout, snapshot: Optional[Snapshot]) -> _Converted:
+        """Write the metadata file for version, then point the version hint at it"""
+        number = previous.number + 1 if previous else 1
+        metadata_location = f"{location}/metadata/v{number}.metadata.json"
+        snapshots = list(previous.metadata.snapshots) if previous else []
+        snapshot_log = list(previous.metadata.snapshot_log) if previous else []
+        metadata_log = list(previous.metadata.metadata_log) if previous else []
+        current_snapshot_id = previous.metadata.current_snapshot_id if previous else None
+        last_sequence_number = previous.metadata.last_sequence_number if previous else 0
+        if previous:
+            metadata_log.append(MetadataLogEntry(metadata_file=previous.metadata_location,
+                                                 timestamp_ms=previous.metadata.last_updated_ms))
+        if snapshot is not None:
+            snapshots.append(snapshot)
+            snapshot_log.append(SnapshotLogEntry(snapshot_id=snapshot.snapshot_id, timestamp_ms=snapshot.timestamp_ms))
+            current_snapshot_id = snapshot.snapshot_id
+            last_sequence_number = snapshot.sequence_number
+        properties = {**(previous.metadata.properties if previous else {}),
+                      DELTA_VERSION_PROPERTY: str(version),
+                      NAME_MAPPING_PROPERTY: json.dumps(_name_mapping(layout.schema.fields))}
+        metadata = TableMetadataV2(
+            location=location,
+            table_uuid=table_uuid,
+            last_updated_ms=self._now_ms(),
+            last_column_id=layout.last_column_id,
+            schemas=layout.schemas,
+            current_schema_id=layout.schema.schema_id,
+            partition_specs=layout.specs,
+            default_spec_id=layout.spec.spec_id,
+            last_partition_id=max([f.field_id for s in layout.specs for f in s.fields],
+                                  default=_PARTITION_FIELD_ID_START - 1),
+            properties=properties,
+            current_snapshot_id=current_snapshot_id,
+            snapshots=snapshots,
+            snapshot_log=snapshot_log,
+            metadata_log=metadata_log[-_METADATA_LOG_MAX:],
+            sort_orders=[UNSORTED_SORT_ORDER],
+            default_sort_order_id=UNSORTED_SORT_ORDER.order_id,
+            refs={MAIN_BRANCH: SnapshotRef(snapshot_id=current_snapshot_id, snapshot_ref_type=SnapshotRefType.BRANCH)}
+                 if current_snapshot_id is not None else {},
+            last_sequence_number=last_sequence_number,
+        )
+        ToOutputFile.table_metadata(metadata, self.file_io.new_output(metadata_location), overwrite=True)
+        with self.file_io.new_output(f"{location}/metadata/{VERSION_HINT}").create(overwrite=True) as f:
+            f.write(str(number).encode())
+        return _Converted(version, number, metadata_location, metadata)
+
+    def _convert(self, table: DeltaTable, location: str) -> _Converted:
+        latest = self.delta_log.latest_version(location)
+        previous = self._current(location)
+        if previous is not None and previous.version >= latest:
+            return previous
+        snapshot_id = uuid.uuid4().int & ((1 << 63) - 1)
+        changes = self._changes(table, location, previous, latest)
+        if changes is None:
+            delta_metadata, live = self._snapshot(table, location, latest)
+            layout = self._layout(table, delta_metadata, previous)
+            table_uuid = previous.metadata.table_uuid if previous else uuid.UUID(delta_metadata["id"])
+            manifests = self._write_manifests(location, snapshot_id, layout,
+                                              self._added_entries(table, live, snapshot_id, layout))
+            # Replaces every file of the previous snapshot, if there is one
+            replaces = previous is not None and previous.metadata.current_snapshot_id is not None
+            snapshot = self._write_snapshot(location, previous, snapshot_id, latest, layout, manifests,
+                                            Operation.OVERWRITE if replaces else Operation.APPEND,
+                                            {"added-data-files": str(len(live))})
+            return self._commit(location, table_uuid, latest, previous, layout, snapshot)
+        layout = self._layout(table, changes.metadata, previous)
+        if not changes.added and not changes.removed:
+            # Only the schema or table properties changed, or nothing did
+            return self._commit(location, previous.metadata.table_uuid, latest, previous, layout, None)
+        manifests = self._carried_manifests(location, previous, changes.removed, snapshot_id, layout)
+        manifests += self._write_manifests(location, snapshot_id, layout,
+                                           self._added_entries(table, changes.added, snapshot_id, layout))
+        operation = (Operation.APPEND if not changes.removed else
+                     Operation.DELETE if not changes.added else Operation.OVERWRITE)
+        snapshot = self._write_snapshot(location, previous, snapshot_id, latest, layout, manifests, operation,
+                                        {"added-data-files": str(len(changes.added)),
+                                         "deleted-data-files": str(len(changes.removed))})
+        return self._commit(location, previous.metadata.table_uuid, latest, previous, layout, snapshot)
+
+    def convert(self, table: DeltaTable) -> IcebergTable:
+        """Bring the table's Iceberg metadata up to its latest Delta version and return
+        the table as Iceberg. A table that is already up to date costs one listing of
+        its _delta_log."""
+        location = table.storage_location.rstrip("/")
+        parsed = urlparse(location)
+        if parsed.scheme in ("", "file"):
+            # Object stores have no directories, a local filesystem needs this one
+            os.makedirs(f"{parsed.path}/metadata", exist_ok=True)
+        with self._table_lock(location):
+            converted = self._convert(table, location)
+            self._converted[location] = converted
+        return IcebergTable(name=table.name, storage_location=table.storage_location,
+                            iceberg_metadata_location=converted.metadata_location,
+                            table_uuid=str(converted.metadata.table_uuid))
@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+import io, json, os, re, threading
+
+_COMMIT_FILE = re.compile(r"^(\d{20})\.json$")
+# Actions that make up a table's state; a checkpoint may hold others, e.g. txn
+_STATE_ACTIONS = ("protocol", "metaData", "add", "remove")
+# Map columns of checkpoint actions, which parquet hands back as lists of pairs
+_MAP_FIELDS = ("configuration", "partitionValues", "tags", "options")
+
+
+class LogFileSystem(ABC):
+    """What DeltaLogReader needs from object storage: reading a small file and listing
+    the file names in a directory in lexicographic order, as object stores do"""
+    @abstractmethod
+    def read(self, path: str) -> bytes:
+        """Contents of path. Raises FileNotFoundError if it does not exist."""
+        pass
+
+    @abstractmethod
+    def list(self, directory: str, start_after: str = None) -> Iterator[str]:
+        """Names of the files in directory that sort after start_after"""
+        pass
+
+
+class LocalFileSystem(LogFileSystem):
+    """Plain paths and file:// URLs"""
+    def _path(self, path: str) -> str:
+        return urlparse(path).path if path.startswith("file:") else path
+
+    def read(self, path: str) -> bytes:
+        with open(self._path(path), "rb") as f:
+            return f.read()
+
+    def list(self, directory: str, start_after: str = None) -> Iterator[str]:
+        try:
+            names = sorted(os.listdir(self._path(directory)))
+        except FileNotFoundError:
+            return
+        for name in names:
+            if start_after is None or name > start_after:
+                yield name
+
+
+class S3FileSystem(LogFileSystem):
+    """s3:// URLs. Listing starts after start_after on the server, so it costs one
+    request per 1000 newer files however long the log is."""
+    def __init__(self, session=None, client=None):
+        self.client = client if client else session.client("s3")
+
+    def _bucket_key(self, path: str):
+        parsed = urlparse(path)
+        return parsed.netloc, parsed.path.lstrip("/")
+
+    def read(self, path: str) -> bytes:
+        bucket, key = self._bucket_key(path)
+        try:
+            return self.client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            raise FileNotFoundError(path)
+
+    def list(self, directory: str, start_after: str = None) -> Iterator[str]:
+        bucket, prefix = self._bucket_key(directory.rstrip("/") + "/")
+        request = {"Bucket": bucket, "Prefix": prefix, "Delimiter": "/"}
+        if start_after:
+            request["StartAfter"] = prefix + start_after
+        while True:
+            response = self.client.list_objects_v2(**request)
+            for obj in response.get("Contents", []):
+                yield obj["Key"][len(prefix):]
+            if not response.get("IsTruncated"):
+                return
+            request["ContinuationToken"] = response["NextContinuationToken"]
+
+
+class DeltaLogReader():
+    """Finds the latest version of a Delta table from the _delta_log under its storage
+    location, without a Spark session or a query.
+
+    The first check of a table reads _last_checkpoint and lists the commit files after
+    the checkpoint. The version found is cached per table, so later checks only list
+    the commit files after it: one request while fewer than 1000 commits have landed."""
+    def __init__(self, filesystem: LogFileSystem):
+        self.filesystem = filesystem
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _log_directory(self, storage_location: str) -> str:
+        return f"{storage_location.rstrip('/')}/_delta_log"
+
+    def _last_checkpoint(self, log_directory: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self.filesystem.read(f"{log_directory}/_last_checkpoint"))
+        except FileNotFoundError:
+            return None
+
+    def _checkpoint_version(self, log_directory: str) -> Optional[int]:
+        checkpoint = self._last_checkpoint(log_directory)
+        return int(checkpoint["version"]) if checkpoint else None
+
+    def latest_version(self, storage_location: str) -> int:
+        log_directory = self._log_directory(storage_location)
+        with self._lock:
+            known = self._versions.get(log_directory)
+        if known is None:
+            known = self._checkpoint_version(log_directory)
+        # Commit files are named by zero-padded version, so the newer ones sort after
+        latest = known
+        for name in self.filesystem.list(log_directory, f"{known:020d}.json" if known is not None else None):
+            match = _COMMIT_FILE.match(name)
+            if match:
+                latest = max(int(match.group(1)), latest if latest is not None else -1)
+        if latest is None:
+            raise FileNotFoundError(f"No Delta commits under {log_directory}")
+        with self._lock:
+            self._versions[log_directory] = max(latest, self._versions.get(log_directory, latest))
+        return latest
+
+    def forget(self, storage_location: str):
+        """Drop the cached version, e.g. after a table was dropped and recreated"""
+        with self._lock:
+            self._versions.pop(self._log_directory(storage_location), None)
+
+    def commit_actions(self, storage_location: str, version: int) -> Iterator[Dict[str, Any]]:
+        """Actions of one commit in order, one dict per line of its commit file, e.g.
+        ``{"add": {...}}``. Raises FileNotFoundError if the commit file is gone."""
+        data = self.filesystem.read(f"{self._log_directory(storage_location)}/{version:020d}.json")
+        for line in data.splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+    def _checkpoint_files(self, log_directory: str, checkpoint: Dict[str, Any]) -> List[str]:
+        version, parts = int(checkpoint["version"]), checkpoint.get("parts")
+        if checkpoint.get("v2Checkpoint"):
+            raise NotImplementedError(f"V2 checkpoints are not supported, found one in {log_directory}")
+        if not parts:
+            return [f"{log_directory}/{version:020d}.checkpoint.parquet"]
+        return [f"{log_directory}/{version:020d}.checkpoint.{i:010d}.{parts:010d}.parquet"
+                for i in range(1, parts + 1)]
+
+    def _checkpoint_actions(self, path: str) -> Iterator[Dict[str, Any]]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Delta checkpoints requires the pyarrow package")
+        parquet = pq.ParquetFile(io.BytesIO(self.filesystem.read(path)))
+        columns = [c for c in _STATE_ACTIONS if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(columns=columns):
+            for row in batch.to_pylist():
+                for kind, action in row.items():
+                    if action is None:
+                        continue
+                    for key in _MAP_FIELDS:
+                        if isinstance(action.get(key), list):
+                            action[key] = dict(action[key])
+                    if isinstance(action.get("format"), dict) and isinstance(action["format"].get("options"), list):
+                        action["format"]["options"] = dict(action["format"]["options"])
+                    yield {kind: action}
+
+    def snapshot_actions(self, storage_location: str, version: int = None) -> Iterator[Dict[str, Any]]:
+        """Actions that rebuild the table as of version, the latest by default: those of
+        the last checkpoint at or before it, then those of each later commit. Replaying
+        them in order and letting a remove cancel an earlier add of the same path gives
+        the live files. Reading a checkpoint requires pyarrow."""
+        log_directory = self._log_directory(storage_location)
+        if version is None:
+            version = self.latest_version(storage_location)
+        checkpoint = self._last_checkpoint(log_directory)
+        start = 0
+        if checkpoint and int(checkpoint["version"]) <= version:
+            for path in self._checkpoint_files(log_directory, checkpoint):
+                yield from self._checkpoint_actions(path)
+            start = int(checkpoint["version"]) + 1
+        for v in range(start, version + 1):
+            for action in self.commit_actions(storage_location, v):
+                if any(kind in action for kind in _STATE_ACTIONS):
+                    yield action
@@ -0,0 +1,190 @@
+from bricksync.table import IcebergTable
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+from urllib.parse import unquote_plus
+import json, logging, os, re, time
+
+if TYPE_CHECKING:
+    from bricksync import BrickSync, TargetSyncResult
+
+METADATA_FILE_SUFFIX = ".metadata.json"
+
+
+@dataclass(frozen=True)
+class MetadataFileEvent:
+    """A new Iceberg metadata file has landed at path"""
+    path: str
+
+    @property
+    def storage_location(self) -> Optional[str]:
+        """Table location the file belongs to, i.e. the part before /metadata/"""
+        head, sep, _ = self.path.rpartition("/metadata/")
+        return head if sep else None
+
+    @property
+    def version(self) -> Optional[int]:
+        """Version number leading the file name, e.g. 5 for 00005-<uuid>.metadata.json"""
+        match = re.match(r"v?(\d+)[-.]", os.path.basename(self.path))
+        return int(match.group(1)) if match else None
+
+
+class EventSource(ABC):
+    @abstractmethod
+    def poll(self, timeout: float = 1.0) -> List[MetadataFileEvent]:
+        """Wait up to timeout seconds and return the metadata files that landed since the last poll"""
+        pass
+
+    def ack(self, events: Iterable[MetadataFileEvent]):
+        """Called once events have been handled"""
+        pass
+
+
+class DirectoryEventSource(EventSource):
+    """Watches a local directory tree for new metadata files by rescanning it. Files
+    present when the source is created are not reported."""
+    def __init__(self, root: str, interval: float = 1.0):
+        self.root = root
+        self.interval = interval
+        self._seen: Set[str] = set(self._scan())
+
+    def _scan(self) -> List[str]:
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            found.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(METADATA_FILE_SUFFIX))
+        return found
+
+    def poll(self, timeout: float = 1.0) -> List[MetadataFileEvent]:
+        deadline = time.monotonic() + timeout
+        while True:
+            new = sorted(p for p in self._scan() if p not in self._seen)
+            if new or time.monotonic() >= deadline:
+                self._seen.update(new)
+                return [MetadataFileEvent(p) for p in new]
+            time.sleep(min(self.interval, max(deadline - time.monotonic(), 0)))
+
+
+class S3EventQueueSource(EventSource):
+    """Reads S3 ObjectCreated notifications from an SQS queue, directly or wrapped by
+    SNS. Messages are deleted once their events have been handled, so a crashed run
+    sees them again."""
+    def __init__(self, queue_url: str, session=None, sqs_client=None, batch_size: int = 10):
+        self.queue_url = queue_url
+        self.client = sqs_client if sqs_client else session.client("sqs")
+        self.batch_size = batch_size
+        self._receipts: Dict[MetadataFileEvent, List[str]] = {}
+
+    def _paths(self, body: str) -> List[str]:
+        message = json.loads(body)
+        if "Message" in message and "Records" not in message:
+            message = json.loads(message["Message"])
+        paths = []
+        for record in message.get("Records", []):
+            if not record.get("eventName", "").startswith("ObjectCreated"):
+                continue
+            key = unquote_plus(record["s3"]["object"]["key"])
+            if key.endswith(METADATA_FILE_SUFFIX):
+                paths.append(f"s3://{record['s3']['bucket']['name']}/{key}")
+        return paths
+
+    def poll(self, timeout: float = 1.0) -> List[MetadataFileEvent]:
+        response = self.client.receive_message(QueueUrl=self.queue_url,
+                                               MaxNumberOfMessages=self.batch_size,
+                                               WaitTimeSeconds=int(timeout))
+        events = []
+        for message in response.get("Messages", []):
+            try:
+                paths = self._paths(message["Body"])
+            except (ValueError, KeyError) as e:
+                logging.warning(f"Ignoring malformed S3 event message {message.get('MessageId')}: {e}")
+                paths = []
+            if not paths:
+                self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message["ReceiptHandle"])
+            for path in paths:
+                event = MetadataFileEvent(path)
+                self._receipts.setdefault(event, []).append(message["ReceiptHandle"])
+                events.append(event)
+        return events
+
+    def ack(self, events: Iterable[MetadataFileEvent]):
+        for event in events:
+            for receipt in self._receipts.pop(event, []):
+                self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=receipt)
+
+
+@dataclass
+class _WatchedTable:
+    source_provider: str
+    source: str
+    storage_location: str
+    target_providers: List[str]
+    version: Optional[int] = None
+
+
+class EventDrivenSync():
+    """Pushes a table to its targets as soon as a new metadata file lands under its
+    storage location, using that file directly instead of reading the source catalog.
+
+    Every table in the BrickSync config's syncs is resolved once to learn its storage
+    location; views are not watched. Files older than one already synced are ignored."""
+    def __init__(self, bricksync: "BrickSync"):
+        self.bricksync = bricksync
+        self.tables: Dict[str, _WatchedTable] = {}
+
+    def index(self):
+        for sync in self.bricksync.config.syncs:
+            key = (sync.source_provider, sync.source)
+            watched = next((t for t in self.tables.values() if (t.source_provider, t.source) == key), None)
+            if watched is None:
+                table = self.bricksync.get_provider(sync.source_provider).get_table(sync.source)
+                if table.is_view():
+                    logging.info(f"Not watching view {sync.source}, only tables are event driven")
+                    continue
+                watched = _WatchedTable(sync.source_provider, sync.source, table.storage_location.rstrip("/"), [])
+                self.tables[watched.storage_location] = watched
+            if sync.target_provider not in watched.target_providers:
+                watched.target_providers.append(sync.target_provider)
+        return self
+
+    def _match(self, event: MetadataFileEvent) -> Optional[_WatchedTable]:
+        location = event.storage_location
+        return self.tables.get(location.rstrip("/")) if location else None
+
+    def handle(self, event: MetadataFileEvent) -> Dict[str, "TargetSyncResult"]:
+        """Sync the table event belongs to; returns the result per target, or nothing
+        if the file belongs to no registered sync or is older than the last one synced"""
+        watched = self._match(event)
+        if watched is None:
+            logging.debug(f"No registered sync for {event.path}")
+            return {}
+        if event.version is not None and watched.version is not None and event.version <= watched.version:
+            logging.info(f"Skipping {event.path}, version {watched.version} was already synced")
+            return {}
+        table = IcebergTable(name=watched.source,
+                             storage_location=watched.storage_location,
+                             iceberg_metadata_location=event.path)
+        src_provider = self.bricksync.get_provider(watched.source_provider)
+        tgt_providers = {tgt: self.bricksync.get_provider(tgt) for tgt in watched.target_providers}
+        with self.bricksync.tracer.collect() as counters:
+            results = self.bricksync._fan_out(src_provider, table, tgt_providers, watched.source)
+        self.bricksync.tracer.export(counters, f"event {event.path} -> {','.join(tgt_providers)}")
+        if all(r.succeeded for r in results.values()) and event.version is not None:
+            watched.version = event.version
+        return results
+
+    def run(self, source: EventSource, poll_timeout: float = 1.0, max_events: int = None) -> int:
+        """Handle events from source until max_events have been handled (forever by
+        default). Returns the number of events handled."""
+        if not self.tables:
+            self.index()
+        handled = 0
+        while max_events is None or handled < max_events:
+            events = source.poll(poll_timeout)
+            for event in events:
+                results = self.handle(event)
+                failed = {tgt: r.error for tgt, r in results.items() if not r.succeeded}
+                if failed and not self.bricksync.config.skip_failures:
+                    raise Exception(f"Event driven sync of {event.path} failed: {failed}")
+            source.ack(events)
+            handled += len(events)
+        return handled
@@ -12,3 +12,15 @@ class ViewNotFoundError(Exception):
 
 class UnsupportedTableTypeError(Exception):
     pass
+
+class CircuitOpenError(Exception):
+    pass
+
+class LeaseLostError(Exception):
+    pass
+
+class SyncRunError(Exception):
+    """A run stopped by a failed sync. report holds the syncs attempted until then."""
+    def __init__(self, message: str, report):
+        super().__init__(message)
+        self.report = report
@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from pyiceberg.io import InputFile
+from pyiceberg.schema import Schema
+import codecs, json, re
+
+# Top-level metadata fields needed to describe a table; the snapshot, log and ref
+# arrays, which grow with every commit, are skipped without being materialized
+SUMMARY_FIELDS = {"format-version", "table-uuid", "location", "current-schema-id",
+                  "schemas", "current-snapshot-id", "properties"}
+
+_CONTAINER_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]|"')
+_WHITESPACE = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+class PartialMetadataParseError(Exception):
+    pass
+
+
+@dataclass
+class IcebergMetadataSummary:
+    """The parts of an Iceberg metadata file a catalog needs to register or refresh a
+    table. Provides the attributes pyiceberg's Glue table input builder reads from
+    TableMetadata (location, schemas, current_schema_id, schema_by_id)."""
+    format_version: int
+    table_uuid: Optional[str]
+    location: str
+    current_schema_id: int
+    schemas: List[Schema]
+    current_snapshot_id: Optional[int] = None
+    properties: Dict[str, str] = field(default_factory=dict)
+
+    def schema_by_id(self, schema_id: int) -> Optional[Schema]:
+        return next((s for s in self.schemas if s.schema_id == schema_id), None)
+
+    def schema(self) -> Schema:
+        return self.schema_by_id(self.current_schema_id)
+
+
+class _MetadataScanner():
+    """Walks the top-level members of a JSON object read incrementally from stream,
+    decoding only the values of the requested members"""
+    def __init__(self, stream, chunk_size: int = 65536):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self):
+        if self.eof:
+            raise PartialMetadataParseError("Unexpected end of metadata file")
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buf += self.decoder.decode(b"", final=True)
+            return
+        # Drop what has been consumed so skipped arrays never accumulate in memory
+        self.buf = self.buf[self.pos:] + self.decoder.decode(chunk)
+        self.pos = 0
+
+    def _peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self._read_more()
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise PartialMetadataParseError(f"Expected '{char}' in metadata file, found '{self.buf[self.pos]}'")
+        self.pos += 1
+
+    def _decode(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A number or literal running into the end of the buffer may be cut short
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise PartialMetadataParseError("Malformed metadata file")
+            self._read_more()
+
+    def _skip(self):
+        if self._peek() not in "[{":
+            self._decode()
+            return
+        depth = 0
+        while True:
+            for token in _CONTAINER_TOKEN.finditer(self.buf, self.pos):
+                text = token.group()
+                if text == '"':
+                    # String cut by the end of the buffer
+                    self.pos = token.start()
+                    break
+                if text in "[{":
+                    depth += 1
+                elif text in "]}":
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = token.end()
+                        return
+            else:
+                self.pos = len(self.buf)
+            self._read_more()
+
+    def members(self, wanted: set) -> Dict[str, Any]:
+        """Values of the wanted top-level members. Stops reading once all are found."""
+        found: Dict[str, Any] = {}
+        self._expect("{")
+        if self._peek() == "}":
+            return found
+        while True:
+            key = self._decode()
+            self._expect(":")
+            if key in wanted:
+                found[key] = self._decode()
+                if len(found) == len(wanted):
+                    return found
+            else:
+                self._skip()
+            separator = self._peek()
+            self.pos += 1
+            if separator == "}":
+                return found
+            if separator != ",":
+                raise PartialMetadataParseError(f"Expected ',' or '}}' in metadata file, found '{separator}'")
+
+
+def read_metadata_summary(input_file: InputFile, chunk_size: int = 65536) -> IcebergMetadataSummary:
+    """Read the table uuid, location, schemas and current snapshot from an Iceberg
+    metadata file without building its snapshot and log arrays. Reading stops as soon
+    as those fields are found. Raises PartialMetadataParseError for files this cannot
+    summarize (e.g. format version 1 with a single ``schema``), so callers can fall
+    back to a full parse."""
+    with input_file.open() as stream:
+        members = _MetadataScanner(stream, chunk_size).members(SUMMARY_FIELDS)
+    missing = {"location", "schemas", "current-schema-id"} - set(members)
+    if missing:
+        raise PartialMetadataParseError(f"Metadata file {input_file.location} has no {', '.join(sorted(missing))}")
+    try:
+        schemas = [Schema.model_validate(s) for s in members["schemas"]]
+    except Exception as e:
+        raise PartialMetadataParseError(f"Invalid schema in metadata file {input_file.location}: {e}")
+    current_snapshot_id = members.get("current-snapshot-id")
+    return IcebergMetadataSummary(
+        format_version=members.get("format-version", 1),
+        table_uuid=members.get("table-uuid"),
+        location=members["location"],
+        current_schema_id=members["current-schema-id"],
+        schemas=schemas,
+        current_snapshot_id=None if current_snapshot_id in (None, -1) else current_snapshot_id,
+        properties=members.get("properties") or {},
+    )
@@ -0,0 +1,145 @@
+from bricksync.config import SyncConfig
+from bricksync.result import SyncRunResult, SyncResult, SyncPhase
+from bricksync.table import Table, View
+from typing import Callable, Iterator, List, Optional, Union, TYPE_CHECKING
+import queue, threading, contextvars, time, logging
+
+if TYPE_CHECKING:
+    from bricksync import BrickSync
+
+_END = object()
+
+
+class _Item():
+    __slots__ = ("name", "start", "table", "error", "result")
+
+    def __init__(self, name: str, start: float, result: SyncResult):
+        self.name = name
+        self.start = start
+        self.table: Optional[Union[Table, View]] = None
+        self.error: Optional[Exception] = None
+        self.result = result
+
+
+class SyncPipeline():
+    """Syncs every table and view of a source namespace to a target as a stream.
+
+    Four stages run concurrently: listing the namespace with iter_tables, resolving
+    each object's metadata, ensuring the target namespace and writing the target.
+    They are connected by queues of at most ``queue_size`` objects, so a slow stage
+    holds back the ones before it. The first objects reach the target while the
+    namespace is still being listed, and memory does not grow with its size.
+
+    A failing object is reported in its result and does not stop the others."""
+    def __init__(self, bricksync: "BrickSync", source_provider: str, target_provider: str,
+                 queue_size: int = 256, resolve_workers: int = 8, write_workers: int = 8):
+        self.bricksync = bricksync
+        self.source_provider = source_provider
+        self.target_provider = target_provider
+        self.queue_size = queue_size
+        self.resolve_workers = resolve_workers
+        self.write_workers = write_workers
+        self._stop = threading.Event()
+
+    def _put(self, q: queue.Queue, item):
+        while not self._stop.is_set():
+            try:
+                return q.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _start(self, fn, *args) -> threading.Thread:
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(fn,) + args, daemon=True)
+        thread.start()
+        return thread
+
+    def _list(self, namespace: str, outbox: queue.Queue, errors: List[Exception]):
+        try:
+            for name in self.bricksync.get_provider(self.source_provider).iter_tables(namespace):
+                if self._stop.is_set():
+                    break
+                self._put(outbox, _Item(name, time.perf_counter(),
+                                        SyncResult(self.source_provider, name, self.target_provider, name)))
+        except Exception as e:
+            logging.error(f"Listing {self.source_provider}:{namespace} failed: {e}")
+            errors.append(e)
+        finally:
+            self._put(outbox, _END)
+
+    def _stage(self, fn: Callable[[_Item], None], inbox: queue.Queue, outbox: queue.Queue,
+               workers: int) -> List[threading.Thread]:
+        """Apply fn to the items of inbox on workers threads and pass them on to outbox.
+        Items that already failed are passed on untouched. The end marker is handed
+        from worker to worker, and the last one forwards it."""
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def work():
+            while True:
+                item = self._get(inbox)
+                if item is _END:
+                    with lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    self._put(outbox if last else inbox, _END)
+                    return
+                if item.error is None:
+                    try:
+                        with self.bricksync.tracer.collect() as counters:
+                            try:
+                                fn(item)
+                            finally:
+                                item.result.calls.merge(counters)
+                    except Exception as e:
+                        logging.error(f"Sync of {item.name} to {self.target_provider} failed: {e}")
+                        item.error = e
+                self._put(outbox, item)
+
+        return [self._start(work) for _ in range(workers)]
+
+    def run(self, namespace: str) -> Iterator[SyncRunResult]:
+        """Sync every object in namespace, yielding each result as its object lands.
+        Raises once the stream is drained if the namespace could not be listed."""
+        src = self.bricksync.get_provider(self.source_provider)
+        tgt = self.bricksync.get_provider(self.target_provider)
+        self._stop.clear()
+        listed, resolved, ready, written = (queue.Queue(self.queue_size) for _ in range(4))
+        errors: List[Exception] = []
+
+        def resolve(item: _Item):
+            with item.result.timed(SyncPhase.SOURCE_READ):
+                item.table = src.get_table(item.name)
+
+        def ensure_namespace(item: _Item):
+            with item.result.timed(SyncPhase.ENSURE_NAMESPACE):
+                tgt.ensure_namespace(tgt.get_catalog_from_name(item.table), tgt.get_schema_from_name(item.table))
+
+        def write(item: _Item):
+            self.bricksync._sync(src, item.table, tgt, item.name, item.result)
+
+        self._start(self._list, namespace, listed, errors)
+        self._stage(resolve, listed, resolved, self.resolve_workers)
+        # One worker, so each target namespace is created once
+        self._stage(ensure_namespace, resolved, ready, 1)
+        self._stage(write, ready, written, self.write_workers)
+        try:
+            while True:
+                item = self._get(written)
+                if item is _END:
+                    break
+                item.result.seconds = time.perf_counter() - item.start
+                yield SyncRunResult(SyncConfig(item.name, self.source_provider, self.target_provider),
+                                    item.result.seconds, error=item.error, result=item.result)
+        finally:
+            # Unblocks every stage if the caller stops consuming early
+            self._stop.set()
+        if errors:
+            raise errors[0]
@@ -1,16 +1,140 @@
 from abc import ABC, ABCMeta, abstractmethod
-from typing import Union, Tuple
+from typing import Union, Tuple, Dict, Optional, Iterator
+from concurrent.futures import ThreadPoolExecutor, Future
 from bricksync.provider import Provider
-from bricksync.table import Table, View
+from bricksync.table import Table, IcebergTable, View, TableIdentifier
 from bricksync.exceptions import UnsupportedTableTypeError
+from bricksync.tracing import Tracer, get_tracer
+from bricksync.cache import MetadataCache, CacheEntryType
+from bricksync.retry import ErrorClassifier, RetryPolicy, CircuitBreaker, call_with_retry
+from bricksync.ratelimit import RateLimiter, OperationClass, operation_class
 from sqlglot.dialects.dialect import Dialect
 import sqlglot
 import sqlglot.expressions as exp
+import asyncio, contextvars, functools, threading
+
+_lazy_lock = threading.Lock()
 
 class CatalogProvider():
+    provider_name: str = "catalog"
+    metadata_cache: Optional[MetadataCache] = None
+    # Distinguishes providers of the same type sharing one metadata cache
+    cache_namespace: Optional[str] = None
+    # Threads fetching the base objects of views concurrently
+    resolve_max_threads: int = 8
+    # Sorts the provider's errors into retryable, idempotent success and fatal
+    error_classifier: ErrorClassifier = ErrorClassifier()
+    retry_policy: RetryPolicy = RetryPolicy()
+    # Operations that must not be repeated as they are, e.g. updates guarded by a version
+    non_idempotent_operations: frozenset = frozenset()
+    # Operations other than DDL statements that count against the write rate limit
+    write_operations: frozenset = frozenset()
+
+    @property
+    def tracer(self) -> Tracer:
+        return getattr(self, "_tracer", None) or get_tracer()
+
+    @tracer.setter
+    def tracer(self, tracer: Tracer):
+        self._tracer = tracer
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        breaker = self.__dict__.get("_circuit_breaker")
+        if breaker is None:
+            with _lazy_lock:
+                breaker = self.__dict__.setdefault("_circuit_breaker", CircuitBreaker())
+        return breaker
+
+    @circuit_breaker.setter
+    def circuit_breaker(self, breaker: CircuitBreaker):
+        self.__dict__["_circuit_breaker"] = breaker
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        limiter = self.__dict__.get("_rate_limiter")
+        if limiter is None:
+            with _lazy_lock:
+                limiter = self.__dict__.setdefault("_rate_limiter", RateLimiter())
+        return limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, limiter: RateLimiter):
+        self.__dict__["_rate_limiter"] = limiter
+
+    def operation_class(self, operation: str) -> Optional[OperationClass]:
+        return operation_class(operation, self.write_operations)
+
+    def _remote(self, operation: str, target: str, fn, *args, **kwargs):
+        """Make a remote call through fn, recording a span for each attempt on the
+        provider's tracer. Every attempt waits for the provider's rate limit first.
+        Transient failures of idempotent operations are retried."""
+        op_class = self.operation_class(operation)
+
+        def attempt():
+            self.rate_limiter.acquire(op_class)
+            return self.tracer.call(self.provider_name, operation, target, fn, *args, **kwargs)
+
+        return call_with_retry(attempt, self.error_classifier, self.retry_policy, self.circuit_breaker,
+                               idempotent=operation not in self.non_idempotent_operations,
+                               label=f"{self.provider_name} {operation}")
+
+    def _retrying(self, fn, *args, **kwargs):
+        """Call fn, an idempotent unit of work made of several remote calls, retrying it
+        as a whole on transient failures. Its remote calls are attempted once each."""
+        return call_with_retry(lambda: fn(*args, **kwargs), self.error_classifier, self.retry_policy,
+                               self.circuit_breaker, label=f"{self.provider_name} {fn.__name__}")
+
+    def _cache_key(self, key: str) -> str:
+        return f"{self.cache_namespace or self.provider_name}:{key}"
+
+    def _cache_get(self, entry_type: CacheEntryType, key: str):
+        return self.metadata_cache.get(entry_type, self._cache_key(key)) if self.metadata_cache is not None else None
+
+    def _cache_put(self, entry_type: CacheEntryType, key: str, value):
+        if self.metadata_cache is not None:
+            self.metadata_cache.put(entry_type, self._cache_key(key), value)
+
+    def _cache_invalidate(self, entry_type: CacheEntryType, key: str):
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate(entry_type, self._cache_key(key))
+
+    @property
+    def resolve_executor(self) -> ThreadPoolExecutor:
+        """Bounded pool shared by every get_table on this provider for fetching sibling
+        base objects of views concurrently. Only fetches that do not themselves wait on
+        the pool are submitted to it, so it cannot deadlock."""
+        executor = self.__dict__.get("_resolve_executor")
+        if executor is None:
+            with _lazy_lock:
+                executor = self.__dict__.get("_resolve_executor")
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=self.resolve_max_threads,
+                                                  thread_name_prefix=f"{self.provider_name}-resolve")
+                    self.__dict__["_resolve_executor"] = executor
+        return executor
+
+    def _submit_resolve(self, fn, *args) -> Future:
+        return self.resolve_executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def shutdown_resolve_executor(self):
+        executor = self.__dict__.pop("_resolve_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def to_async(self, max_threads: int = 8) -> "AsyncCatalogProvider":
+        """Coroutine interface over this provider, see AsyncCatalogProvider"""
+        return AsyncCatalogProvider(self, max_threads)
+
     @abstractmethod
     def get_table(self) -> Union[Table, View]:
         pass
+
+    def iter_tables(self, namespace: str) -> Iterator[str]:
+        """Yield the full name of every table and view in namespace, a catalog or a
+        catalog.schema, a page at a time, so a catalog of any size is listed in
+        constant memory"""
+        raise NotImplementedError(f"Listing tables is not supported by {self.provider_name}")
     
     @abstractmethod
     def create_catalog(self, catalog_name: str):
@@ -20,6 +144,32 @@ class CatalogProvider():
     def create_schema(self, catalog_name: str, schema_name: str):
         pass
     
+    def ensure_namespace(self, catalog_name: str, schema_name: str):
+        """Create the catalog and schema if this provider has not already done so"""
+        ensured = self.__dict__.setdefault("_ensured_namespaces", set())
+        if (catalog_name, schema_name) in ensured:
+            return
+        cache_key = f"namespace:{catalog_name}.{schema_name}"
+        if not self._cache_get(CacheEntryType.TARGET_STATE, cache_key):
+            self.create_catalog(catalog_name)
+            self.create_schema(catalog_name, schema_name)
+            self._cache_put(CacheEntryType.TARGET_STATE, cache_key, True)
+        ensured.add((catalog_name, schema_name))
+
+    def to_iceberg_table(self, table: Table) -> IcebergTable:
+        """The Iceberg form of one of this provider's tables, which targets register.
+        Providers that can write Iceberg metadata for a table lacking it override this."""
+        if table.is_delta():
+            return table.to_iceberg_table()
+        if table.is_iceberg():
+            return table
+        raise UnsupportedTableTypeError(f"Table {table.name} is neither Delta nor Iceberg")
+
+    def converted_delta_version(self, table: Table) -> Optional[int]:
+        """Delta version to_iceberg_table would convert a table from, for providers
+        that write its Iceberg metadata themselves, and None otherwise"""
+        return None
+
     @abstractmethod
     def create_or_refresh_external_table(self, table: Table):
         pass
@@ -32,32 +182,23 @@ class CatalogProvider():
     def convert_view_dialect(self, view_definition: str, source_dialect: Dialect):
         pass
 
-    def get_fqtn_parts(self, table: Union[Table, View, str]) -> Tuple[str]:
+    def get_identifier(self, table: Union[Table, View, str]) -> TableIdentifier:
+        """Parsed name of table; parsed once per table object and interned per name"""
         if type(table) is str:
-            return tuple(table.split("."))
-        else:
-            return tuple(table.name.split("."))
+            return TableIdentifier.parse(table)
+        return table.identifier
+
+    def get_fqtn_parts(self, table: Union[Table, View, str]) -> Tuple[str]:
+        return self.get_identifier(table).parts
     
     def get_catalog_from_name(self, table: Union[Table, View, str]) -> str:
-        parts = self.get_fqtn_parts(table)
-        if len(parts) == 3:
-            return parts[0]
-        else:
-            return None
+        return self.get_identifier(table).catalog
           
     def get_schema_from_name(self, table: Union[Table, View, str]) -> str:
-        parts = self.get_fqtn_parts(table)
-        if len(parts) == 3:
-            return parts[1]
-        else:
-            return parts[0]
+        return self.get_identifier(table).schema
         
     def get_table_from_name(self, table: Union[Table, View, str]) -> str:
-        parts = self.get_fqtn_parts(table)
-        if len(parts) == 3:
-            return parts[2]
-        else:
-            return parts[1]
+        return self.get_identifier(table).table
         
     def replace_table_identifiers(self, table: Table, 
                               catalog_name: str = None, 
@@ -111,7 +252,74 @@ class CatalogProvider():
             raise UnsupportedTableTypeError(f"Unsupported table type: {type(table)}")
         
         return
-    
 
 
+class AsyncCatalogProvider():
+    """Coroutine counterpart of a CatalogProvider.
+
+    Blocking provider calls run on a thread pool of at most ``max_threads`` threads
+    owned by this provider, so any number of operations can be in flight on one
+    event loop without the thread count growing with them. Providers whose client
+    can submit work without blocking override these coroutines with native ones."""
+    def __init__(self, catalog: CatalogProvider, max_threads: int = 8):
+        self.catalog = catalog
+        self.max_threads = max_threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._namespaces: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @property
+    def provider_name(self) -> str:
+        return self.catalog.provider_name
+
+    @property
+    def tracer(self) -> Tracer:
+        return self.catalog.tracer
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_threads,
+                                                thread_name_prefix=f"bricksync-{self.provider_name}")
+        return self._executor
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking call on the provider's thread pool, keeping the caller's
+        context so its remote calls are still traced"""
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+
+    async def get_table(self, name: str) -> Union[Table, View]:
+        return await self._run(self.catalog.get_table, name)
+
+    async def _ensure_namespace(self, catalog_name: str, schema_name: str):
+        await self._run(self.catalog.ensure_namespace, catalog_name, schema_name)
+
+    async def ensure_namespace(self, catalog_name: str, schema_name: str):
+        """Create the catalog and schema once, however many coroutines ask for them at the same time"""
+        key = (catalog_name, schema_name)
+        future = self._namespaces.get(key)
+        if future is None:
+            future = self._namespaces[key] = asyncio.ensure_future(self._ensure_namespace(catalog_name, schema_name))
+        try:
+            await asyncio.shield(future)
+        except BaseException:
+            if future.done():
+                self._namespaces.pop(key, None)
+            raise
+
+    async def to_iceberg_table(self, table: Table) -> IcebergTable:
+        if table.is_iceberg():
+            # Already has Iceberg metadata, so nothing is read or written
+            return self.catalog.to_iceberg_table(table)
+        return await self._run(self.catalog.to_iceberg_table, table)
+
+    async def create_or_refresh_external_table(self, table: Table, **kwargs):
+        return await self._run(self.catalog.create_or_refresh_external_table, table, **kwargs)
+
+    async def create_or_refresh_view(self, view: View, **kwargs):
+        return await self._run(self.catalog.create_or_refresh_view, view, **kwargs)
 
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
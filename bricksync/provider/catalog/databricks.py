@@ -2,13 +2,23 @@ from databricks.sdk import WorkspaceClient
 import databricks.connect
 from databricks.connect.session import SparkSession
 from databricks.sdk.service.catalog import TableInfo, TableType, DataSourceFormat
+from databricks.sdk.service.sql import (StatementResponse, StatementState, ColumnInfoTypeName, Disposition, Format,
+                                        ExecuteStatementRequestOnWaitTimeout)
 from sqlglot import Dialect
-from bricksync.provider.catalog import CatalogProvider
+from bricksync.provider.catalog import CatalogProvider, AsyncCatalogProvider
 from bricksync.provider.databricks import DatabricksProvider
 from bricksync.config import ProviderConfig
 from bricksync.table import Table, DeltaTable, IcebergTable, View, UniformIcebergInfo
-from typing import List, Union, Optional
-import logging, time
+from bricksync.tracing import statement_operation
+from bricksync.cache import CacheEntryType
+from bricksync.retry import ErrorClassifier, ErrorClass, call_with_retry_async
+from bricksync.delta import DeltaLogReader, LocalFileSystem, S3FileSystem
+from bricksync.convert import DeltaIcebergConverter
+from pyiceberg.io import load_file_io
+from typing import List, Union, Optional, Dict, Tuple, Iterator
+from concurrent.futures import Future
+from decimal import Decimal
+import asyncio, logging, re, time, boto3
 import sqlglot
 import pyspark
 from sqlglot.dialects.dialect import Dialects
@@ -17,22 +27,166 @@ from dataclasses import dataclass
 class DBSQLException(Exception):
     pass
 
+_RUNNING_STATES = (StatementState.PENDING, StatementState.RUNNING)
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`")
+
+
+def split_statements(sql: str) -> List[str]:
+    """The statements of a semicolon separated script, ignoring semicolons in quotes"""
+    statements, start, pos = [], 0, 0
+    while pos < len(sql):
+        literal = _STRING_LITERAL.match(sql, pos)
+        if literal:
+            pos = literal.end()
+            continue
+        if sql[pos] == ";":
+            statements.append(sql[start:pos])
+            start = pos + 1
+        pos += 1
+    statements.append(sql[start:])
+    return [s.strip() for s in statements if s.strip()]
+
+
+def _decode(value: Optional[str], type_name: Optional[ColumnInfoTypeName]):
+    if value is None or type_name is None:
+        return value
+    if type_name in (ColumnInfoTypeName.LONG, ColumnInfoTypeName.INT, ColumnInfoTypeName.SHORT,
+                     ColumnInfoTypeName.BYTE):
+        return int(value)
+    if type_name in (ColumnInfoTypeName.FLOAT, ColumnInfoTypeName.DOUBLE):
+        return float(value)
+    if type_name == ColumnInfoTypeName.DECIMAL:
+        return Decimal(value)
+    if type_name == ColumnInfoTypeName.BOOLEAN:
+        return value.lower() == "true"
+    return value
+
+
+class SqlWarehouse():
+    """Runs statements on a Databricks SQL warehouse through the statement execution
+    REST API, so metadata-only work needs no Spark session. A statement is submitted
+    with a wait of ``wait_timeout`` seconds (0, or 5 to 50) and polled with backoff if
+    it is still running after that. Rows come back as pyspark Rows with the values
+    typed by their column, like the rows of a Spark query."""
+    poll_interval: float = 0.05
+    max_poll_interval: float = 2.0
+
+    def __init__(self, client: WorkspaceClient, warehouse_id: str, wait_timeout: int = 30):
+        self.client = client
+        self.warehouse_id = warehouse_id
+        self.wait_timeout = wait_timeout
+
+    def submit(self, statement: str, wait_timeout: int = None) -> StatementResponse:
+        return self.client.statement_execution.execute_statement(
+            statement=statement, warehouse_id=self.warehouse_id,
+            wait_timeout=f"{self.wait_timeout if wait_timeout is None else wait_timeout}s",
+            on_wait_timeout=ExecuteStatementRequestOnWaitTimeout.CONTINUE,
+            disposition=Disposition.INLINE, format=Format.JSON_ARRAY)
+
+    def get(self, statement_id: str) -> StatementResponse:
+        return self.client.statement_execution.get_statement(statement_id)
+
+    @staticmethod
+    def is_running(response: StatementResponse) -> bool:
+        return response.status.state in _RUNNING_STATES
+
+    def rows(self, response: StatementResponse) -> List[pyspark.sql.Row]:
+        """Rows of a finished statement, fetching the chunks after the first. Raises
+        DBSQLException if the statement did not succeed."""
+        state = response.status.state
+        if state != StatementState.SUCCEEDED:
+            error = response.status.error
+            detail = f"{error.error_code.value if error.error_code else ''}: {error.message}" if error else ""
+            raise DBSQLException(f"Statement {response.statement_id} {state.value} {detail}".strip())
+        if response.manifest is None or response.result is None:
+            return []
+        columns = [(c.name, c.type_name) for c in response.manifest.schema.columns]
+        rows, chunk = [], response.result
+        while True:
+            rows.extend(pyspark.sql.Row(**{name: _decode(v, type_name) for (name, type_name), v in zip(columns, values)})
+                        for values in chunk.data_array or [])
+            if chunk.next_chunk_index is None:
+                return rows
+            chunk = self.client.statement_execution.get_statement_result_chunk_n(response.statement_id,
+                                                                                 chunk.next_chunk_index)
+
+    def execute(self, statement: str) -> List[pyspark.sql.Row]:
+        response = self.submit(statement)
+        delay = self.poll_interval
+        while self.is_running(response):
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+            response = self.get(response.statement_id)
+        return self.rows(response)
+
+_VIEW_TYPES = [TableType.VIEW, TableType.STREAMING_TABLE, TableType.MATERIALIZED_VIEW]
+
 class DatabricksCatalog(CatalogProvider):
-    def __init__(self, provider: DatabricksProvider):
+    provider_name = "databricks"
+    error_classifier = ErrorClassifier(
+        retryable=("TEMPORARILY_UNAVAILABLE", "REQUEST_LIMIT_EXCEEDED", "RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED"),
+        idempotent_success=("already exists", "RESOURCE_ALREADY_EXISTS"))
+    write_operations = frozenset({"catalogs.create", "schemas.create"})
+
+    def __init__(self, provider: DatabricksProvider, delta_log: DeltaLogReader = None,
+                 converter: DeltaIcebergConverter = None, warehouse: SqlWarehouse = None):
         self.provider = provider
         self.client: WorkspaceClient = provider.client
-        self.spark: SparkSession = provider.spark
+        # Reads Delta versions from storage instead of through Spark, if configured
+        self.delta_log = delta_log
+        # Writes Iceberg metadata for tables that are not UniForm, if configured
+        self.converter = converter
+        # Runs statements instead of Spark, if configured
+        self.warehouse = warehouse
+
+    @property
+    def spark(self) -> SparkSession:
+        """Session for statements when no SQL warehouse is configured, started on first use"""
+        return self.provider.spark
+
+    def to_async(self, max_threads: int = 8) -> AsyncCatalogProvider:
+        if self.warehouse is not None:
+            return AsyncDatabricksCatalog(self, max_threads)
+        return super().to_async(max_threads)
 
     @classmethod
     def initialize(cls, provider_config: ProviderConfig):
-        return cls(provider=DatabricksProvider.initialize(provider_config))
+        configuration = provider_config.configuration or {}
+        filesystem = configuration.get("delta_log_filesystem")
+        if filesystem == "s3":
+            session = boto3.Session(profile_name=configuration.get("aws_profile_name"),
+                                    region_name=configuration.get("aws_region_name"))
+            delta_log = DeltaLogReader(S3FileSystem(session))
+        elif filesystem == "local":
+            delta_log = DeltaLogReader(LocalFileSystem())
+        elif filesystem is None:
+            delta_log = None
+        else:
+            raise ValueError(f"Unknown delta_log_filesystem {filesystem}, expected s3 or local")
+        converter = None
+        if str(configuration.get("convert_delta_tables", "false")).lower() == "true":
+            if delta_log is None:
+                raise ValueError("convert_delta_tables requires delta_log_filesystem")
+            converter = DeltaIcebergConverter(delta_log, load_file_io(configuration))
+        backend = configuration.get("sql_backend", "spark")
+        if backend not in ("spark", "warehouse"):
+            raise ValueError(f"Unknown sql_backend {backend}, expected spark or warehouse")
+        if backend == "warehouse" and not configuration.get("warehouse_id"):
+            raise ValueError("sql_backend warehouse requires warehouse_id")
+        provider = DatabricksProvider.initialize(provider_config)
+        warehouse = None
+        if backend == "warehouse":
+            warehouse = SqlWarehouse(provider.client, configuration["warehouse_id"],
+                                     int(configuration.get("warehouse_wait_timeout", 30)))
+        return cls(provider=provider, delta_log=delta_log, converter=converter, warehouse=warehouse)
 
     def _get_table_internal(self, table_name: str) -> TableInfo:
-        return self.client.tables.get(table_name)
+        return self._remote("tables.get", table_name, self.client.tables.get, table_name)
     
     def get_uniform_iceberg_metadata(self, table_name: str) -> UniformIcebergInfo:
         """Workaround for sdk TableInfo dataclass not including this info. Eventually we can get rid of this second call"""
-        extended = self.client.api_client.do("GET", f"/api/2.1/unity-catalog/tables/{table_name}")
+        extended = self._remote("rest.tables.get", table_name,
+                                self.client.api_client.do, "GET", f"/api/2.1/unity-catalog/tables/{table_name}")
         if "delta_uniform_iceberg" not in extended:
             return None
         
@@ -46,27 +200,36 @@ class DatabricksCatalog(CatalogProvider):
      
     def create_catalog(self, catalog_name: str):
         try:
-           self.client.catalogs.create(catalog_name)
+           self._remote("catalogs.create", catalog_name, self.client.catalogs.create, catalog_name)
            return
         except Exception as e:
-            if 'already exists' in str(e):
+            if self.error_classifier.classify(e) == ErrorClass.IDEMPOTENT_SUCCESS:
               return
             else:
               raise(e)
     
     def create_schema(self, catalog_name: str, schema_name: str):
         try:
-            self.client.schemas.create(schema_name, catalog_name=catalog_name)
+            self._remote("schemas.create", f"{catalog_name}.{schema_name}",
+                         self.client.schemas.create, schema_name, catalog_name=catalog_name)
             return
         except Exception as e:
-            if 'already exists' in str(e):
+            if self.error_classifier.classify(e) == ErrorClass.IDEMPOTENT_SUCCESS:
               return
             else:
               raise
     
-    def sql(self, statement: str) -> List[pyspark.sql.Row]:
+    def sql(self, statement: str, target: str = None) -> List[pyspark.sql.Row]:
+        """Rows of the last statement of a script, run on the SQL warehouse if there is
+        one and through Spark otherwise"""
+        if self.warehouse is not None:
+            rows = []
+            for part in split_statements(statement):
+                rows = self._remote(statement_operation(part), target, self.warehouse.execute, part)
+            return rows
         try:
-            return self.spark.sql(statement).collect()
+            return self._remote(statement_operation(statement), target,
+                                lambda: self.spark.sql(statement).collect())
         except Exception as e:
             if 'PARSE_EMPTY_STATEMENT' in str(e):
               logging.error(f"Error executing SQL statement: {e}")
@@ -77,9 +240,27 @@ class DatabricksCatalog(CatalogProvider):
             else:
                 raise
     
+    def sql_batch(self, statements: List[str], targets: List[str] = None) -> List[List[pyspark.sql.Row]]:
+        """Rows of each of several independent statements. On a SQL warehouse they are all
+        submitted without waiting and then polled together, so the batch takes about as
+        long as its slowest statement. Through Spark they run one after another."""
+        targets = targets or [None] * len(statements)
+        if self.warehouse is None:
+            return [self.sql(statement, target) for statement, target in zip(statements, targets)]
+        responses = [self._remote(statement_operation(statement), target, self.warehouse.submit, statement, 0)
+                     for statement, target in zip(statements, targets)]
+        delay = self.warehouse.poll_interval
+        while any(SqlWarehouse.is_running(r) for r in responses):
+            time.sleep(delay)
+            delay = min(delay * 2, self.warehouse.max_poll_interval)
+            responses = [self._remote("statements.get", target, self.warehouse.get, r.statement_id)
+                         if SqlWarehouse.is_running(r) else r for r, target in zip(responses, targets)]
+        return [self.warehouse.rows(r) for r in responses]
+
     def get_uniform_iceberg_metadata(self, table_name: str) -> UniformIcebergInfo:
         """Workaround for sdk TableInfo dataclass not including this info. Eventually we can get rid of this second call"""
-        extended = self.client.api_client.do("GET", f"/api/2.1/unity-catalog/tables/{table_name}")
+        extended = self._remote("rest.tables.get", table_name,
+                                self.client.api_client.do, "GET", f"/api/2.1/unity-catalog/tables/{table_name}")
         if "delta_uniform_iceberg" not in extended:
             return None
         
@@ -91,6 +272,25 @@ class DatabricksCatalog(CatalogProvider):
             converted_delta_timestamp=extended["converted_delta_timestamp"]
         )
     
+    def latest_delta_version(self, table: DeltaTable) -> int:
+        """Latest version of a Delta table, read from its _delta_log in storage if the
+        catalog has a DeltaLogReader and with DESCRIBE HISTORY otherwise"""
+        if self.delta_log is not None:
+            return self._remote("read_delta_log", table.name, self.delta_log.latest_version, table.storage_location)
+        return self.sql(f"DESCRIBE HISTORY {table.name} LIMIT 1", table.name)[0].version
+
+    def to_iceberg_table(self, table: Table) -> IcebergTable:
+        """UniForm tables carry their Iceberg metadata. With a converter, the metadata of
+        any other Delta table is written from its _delta_log, in process."""
+        if table.is_delta() and not table.is_iceberg() and self.converter is not None:
+            return self._remote("convert_delta", table.name, self.converter.convert, table)
+        return super().to_iceberg_table(table)
+
+    def converted_delta_version(self, table: Table) -> Optional[int]:
+        if table.is_delta() and not table.is_iceberg() and self.converter is not None:
+            return self.latest_delta_version(table)
+        return None
+
     def generate_iceberg_metadata(self, table_name: str, timeout_seconds: int = 300) -> DeltaTable:
         """Synchronously generate Iceberg metadata for a table by comparing latest Delta version to 
         most current UniForm version and ensuring they are equivalent before exiting."""
@@ -102,9 +302,7 @@ class DatabricksCatalog(CatalogProvider):
         if not properties.get("delta.enableIcebergCompatV2").lower() == "true":
             raise Exception(f"Table {table_name} is not a UniForm table")
         
-        # Get latest delta version
-        detail = self.sql(f"DESCRIBE HISTORY {table_name} LIMIT 1")
-        last_delta_version = detail[0].version
+        last_delta_version = self.latest_delta_version(tbl)
         last_uniform_version = (tbl.uniform_iceberg_info.converted_delta_version 
                                 if tbl.uniform_iceberg_info else 0)
         logging.info(f"Last delta version: {last_delta_version}. Last uniform version: {last_uniform_version}")
@@ -113,7 +311,7 @@ class DatabricksCatalog(CatalogProvider):
             logging.info(f"Table {table_name} Iceberg metadata is already up to date")
             return tbl
         # Gen metadata
-        self.sql(f"MSCK REPAIR TABLE {table_name} SYNC METADATA")
+        self.sql(f"MSCK REPAIR TABLE {table_name} SYNC METADATA", table_name)
         # Wait for Uniform delta version to match or > than delta version
         backoff = 1
         timeout_start = time.time()
@@ -128,58 +326,189 @@ class DatabricksCatalog(CatalogProvider):
             time.sleep(backoff)
         raise Exception(f"Timed out waiting for Iceberg metadata to be generated for table {table_name}")
             
+    def _get_cached_delta_table(self, table_name: str) -> Optional[DeltaTable]:
+        """A Delta table's location and properties rarely change, so with a metadata cache
+        only its UniForm metadata, which moves on every commit, is fetched again"""
+        descriptor = self._cache_get(CacheEntryType.SOURCE_TABLE, table_name)
+        if descriptor is None:
+            return None
+        try:
+            iceberg_metadata = self.get_uniform_iceberg_metadata(table_name)
+        except Exception:
+            self._cache_invalidate(CacheEntryType.SOURCE_TABLE, table_name)
+            raise
+        return DeltaTable(
+            name=table_name,
+            storage_location=descriptor["storage_location"],
+            uniform_iceberg_info=iceberg_metadata,
+            delta_properties=descriptor["properties"]
+        )
+
     def get_table(self, table_name: str) -> Union[View, Table]:
-        table_info = self.client.tables.get(table_name, include_delta_metadata=True)
+        cached = self._get_cached_delta_table(table_name)
+        if cached:
+            return cached
+        table_info = self._remote("tables.get", table_name,
+                                  self.client.tables.get, table_name, include_delta_metadata=True)
+        if table_info.table_type in _VIEW_TYPES:
+            return self.get_views([table_name], {table_name.lower(): table_info})[table_name]
+        return self._delta_table(table_name, table_info)
+
+    def _delta_table(self, table_name: str, table_info: TableInfo) -> DeltaTable:
         if table_info.table_type in [TableType.MANAGED,TableType.EXTERNAL]:
             if table_info.data_source_format != DataSourceFormat.DELTA:
                 raise Exception(f"Table {table_name} is not a Delta table. Only Delta tables are supported currently.")
             iceberg_metadata = self.get_uniform_iceberg_metadata(table_name)
+            self._cache_put(CacheEntryType.SOURCE_TABLE, table_name,
+                            {"storage_location": table_info.storage_location,
+                             "properties": table_info.properties})
             return DeltaTable(
                 name=table_name,
                 storage_location=table_info.storage_location,
                 uniform_iceberg_info=iceberg_metadata,
                 delta_properties=table_info.properties
             )
-        elif table_info.table_type in [TableType.VIEW, TableType.STREAMING_TABLE, TableType.MATERIALIZED_VIEW] :
-            view_def = (table_info.view_definition if 
-                        table_info.table_type in [TableType.VIEW] 
-                        else None)
-            # Handling for MV and ST
-            if not view_def:
-                properties = table_info.properties
-                print(table_info.table_type.value)
-                view_def = properties.get(f"spark.internal.{table_info.table_type.value.lower()}.reconciliation_query", None)
-            view_query = view_def.replace('`','')
-            view_dependencies = [vd.table.table_full_name for vd in table_info.view_dependencies.dependencies]
-            base_table_names = [bt for bt in view_dependencies if bt in view_query]
-            base_tables = [self.get_table(bt) for bt in base_table_names]
-            return View(
-                name=table_name,
-                view_definition=view_query,
+        else:
+            raise Exception(f"Table type {table_info.table_type.value} is not currently supported")
+
+    def _list_pages(self, operation: str, path: str, key: str, query: dict, page_size: int) -> Iterator[dict]:
+        page_token = None
+        while True:
+            page_query = {**query, "max_results": page_size}
+            if page_token:
+                page_query["page_token"] = page_token
+            response = self._remote(operation, ".".join(query.values()),
+                                    self.client.api_client.do, "GET", path, query=page_query)
+            yield from response.get(key, [])
+            page_token = response.get("next_page_token")
+            if not page_token:
+                return
+
+    def iter_tables(self, namespace: str, page_size: int = 1000) -> Iterator[str]:
+        parts = self.get_fqtn_parts(namespace)
+        catalog_name = parts[0]
+        if len(parts) == 1:
+            schemas = (s["name"] for s in self._list_pages("rest.schemas.list", "/api/2.1/unity-catalog/schemas",
+                                                           "schemas", {"catalog_name": catalog_name}, page_size)
+                       if s["name"] != "information_schema")
+        else:
+            schemas = [parts[1]]
+        for schema_name in schemas:
+            for table in self._list_pages("rest.tables.list", "/api/2.1/unity-catalog/tables", "tables",
+                                          {"catalog_name": catalog_name, "schema_name": schema_name}, page_size):
+                yield table["full_name"]
+
+    def _view_definition(self, table_info: TableInfo) -> str:
+        view_def = (table_info.view_definition if
+                    table_info.table_type in [TableType.VIEW]
+                    else None)
+        # Handling for MV and ST
+        if not view_def:
+            properties = table_info.properties
+            view_def = properties.get(f"spark.internal.{table_info.table_type.value.lower()}.reconciliation_query", None)
+        return view_def.replace('`','')
+
+    def _view_base_table_names(self, view_name: str, table_info: TableInfo) -> List[str]:
+        """Tables and views a view reads from, fully qualified as Unity Catalog resolved
+        them when the view was created. Functions it calls are left out."""
+        dependencies = table_info.view_dependencies.dependencies if table_info.view_dependencies else None
+        base_table_names, seen = [], {view_name.lower()}
+        for dependency in dependencies or []:
+            if dependency.table is None:
+                continue
+            name = dependency.table.table_full_name
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                base_table_names.append(name)
+        return base_table_names
+
+    def _list_table_infos(self, catalog_name: str, schema_name: str) -> List[TableInfo]:
+        """Every object of a schema with its type, definition and view_dependencies,
+        read page by page from the tables API"""
+        return list(self.client.tables.list(catalog_name=catalog_name, schema_name=schema_name,
+                                            include_delta_metadata=True))
+
+    def get_views(self, view_names: List[str], table_infos: Dict[str, TableInfo] = None) -> Dict[str, View]:
+        """Resolve views and everything they depend on as one graph. Each schema the graph
+        reaches is listed once through the tables API, which carries every object's type,
+        definition and view_dependencies, so the calls made grow with the number of
+        schemas and base tables the graph spans rather than with its views or depth.
+        table_infos, keyed by lower case name, are used where already fetched. A base
+        object shared by several views is a single node. Schemas are listed, and Delta
+        base tables fetched, concurrently on resolve_executor, a level of the graph at a
+        time."""
+        table_infos = dict(table_infos or {})
+        fetches: Dict[str, Future] = {}
+        listed = set()
+        pending, visited = list(view_names), set()
+        while pending:
+            schemas = sorted({tuple(name.lower().split(".")[:2]) for name in pending
+                              if name.lower() not in table_infos} - listed)
+            listings = [self._submit_resolve(self._remote, "tables.list", f"{catalog_name}.{schema_name}",
+                                             self._list_table_infos, catalog_name, schema_name)
+                        for catalog_name, schema_name in schemas]
+            listed.update(schemas)
+            for listing in listings:
+                for table_info in listing.result():
+                    table_infos.setdefault(table_info.full_name.lower(), table_info)
+            next_pending = []
+            for name in pending:
+                key = name.lower()
+                if key in visited:
+                    continue
+                visited.add(key)
+                if key not in table_infos:
+                    # Not listed, e.g. created since; look it up on its own
+                    table_infos[key] = self._remote("tables.get", name, self.client.tables.get,
+                                                    name, include_delta_metadata=True)
+                table_info = table_infos[key]
+                if table_info.table_type in _VIEW_TYPES:
+                    next_pending.extend(self._view_base_table_names(name, table_info))
+                else:
+                    fetches[key] = self._submit_resolve(self._delta_table, name, table_info)
+            pending = next_pending
+
+        nodes: Dict[str, Union[Table, View]] = {}
+
+        def resolve(name: str, path: Tuple[str, ...]) -> Union[Table, View]:
+            key = name.lower()
+            if key in nodes:
+                return nodes[key]
+            if key in path:
+                raise Exception(f"Circular view dependency: {' -> '.join(path + (key,))}")
+            if key in fetches:
+                nodes[key] = fetches[key].result()
+                return nodes[key]
+            table_info = table_infos[key]
+            base_tables = [resolve(bt, path + (key,)) for bt in self._view_base_table_names(name, table_info)]
+            nodes[key] = View(
+                name=name,
+                view_definition=self._view_definition(table_info),
                 dialect=Dialects.DATABRICKS,
                 base_tables=base_tables
             )
-        else:
-            raise Exception(f"Table type {table_info.table_type.value} is not currently supported")
+            return nodes[key]
 
+        return {name: resolve(name, ()) for name in view_names}
     
-    def create_or_refresh_external_table(self, table: Union[DeltaTable, IcebergTable], **kwargs):
+    def _external_table_statement(self, table: Union[DeltaTable, IcebergTable]) -> str:
         # Given an Iceberg table, convert to Delta
         if table.is_delta():
-            statement = f"""CREATE TABLE IF NOT EXISTS {table.name}
+            return f"""CREATE TABLE IF NOT EXISTS {table.name}
             USING DELTA
             LOCATION '{table.storage_location}'
             """ 
-            self.sql(statement)
         elif table.is_iceberg():
-            statement = f"""CREATE TABLE IF NOT EXISTS {table.name}
+            return f"""CREATE TABLE IF NOT EXISTS {table.name}
             UNIFORM iceberg
             METADATA_PATH '{table.iceberg_metadata_location}';
             REFRESH TABLE {table.name} METADATA_PATH '{table.iceberg_metadata_location}';
             """ 
-            self.sql(statement)
         else:
             raise Exception(f"Unsupported table type for table {table.name}")
+
+    def create_or_refresh_external_table(self, table: Union[DeltaTable, IcebergTable], **kwargs):
+        self.sql(self._external_table_statement(table))
     
     def create_or_refresh_view(self, view: View, **kwargs):
         # Issue query to create or refresh view
@@ -194,4 +523,37 @@ class DatabricksCatalog(CatalogProvider):
             raise Exception(f"Error converting view definition from {source_dialect} to Databricks dialect: {e}")
         return converted[0]
 
-        
\ No newline at end of file
+        
+
+
+class AsyncDatabricksCatalog(AsyncCatalogProvider):
+    """Coroutine interface over a DatabricksCatalog with a SQL warehouse. Statements are
+    submitted without waiting and polled with backoff, so a statement running on the
+    warehouse does not hold a thread: only each submit, status check and result fetch
+    takes one, for its round trip. Everything else goes through the catalog on the
+    thread pool."""
+    async def _sql(self, sql: str, target: str = None) -> List[pyspark.sql.Row]:
+        rows = []
+        for part in split_statements(sql):
+            operation = statement_operation(part)
+            rows = await call_with_retry_async(lambda: self._execute(part, operation, target),
+                                               self.catalog.error_classifier, self.catalog.retry_policy,
+                                               self.catalog.circuit_breaker, label=f"{self.provider_name} {operation}")
+        return rows
+
+    async def _execute(self, sql: str, operation: str, target: str = None) -> List[pyspark.sql.Row]:
+        warehouse = self.catalog.warehouse
+        await self.catalog.rate_limiter.acquire_async(self.catalog.operation_class(operation))
+        with self.tracer.span(self.provider_name, operation, target):
+            # The SDK's calls are blocking HTTP requests, so they go through the thread
+            # pool; only the wait between polls is on the loop
+            response = await self._run(warehouse.submit, sql, 0)
+            delay = warehouse.poll_interval
+            while warehouse.is_running(response):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, warehouse.max_poll_interval)
+                response = await self._run(warehouse.get, response.statement_id)
+            return await self._run(warehouse.rows, response)
+
+    async def create_or_refresh_external_table(self, table: Union[DeltaTable, IcebergTable], **kwargs):
+        await self._sql(self.catalog._external_table_statement(table), table.name)
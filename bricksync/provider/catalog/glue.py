@@ -1,20 +1,34 @@
 from bricksync.provider.catalog import CatalogProvider
 from bricksync.provider.aws import AwsProvider
 from bricksync.table import Table, View, IcebergTable
-from typing import Union
+from typing import Union, Iterator
 from sqlglot.dialects.dialect import Dialect
 from pyiceberg.catalog import glue
 from pyiceberg.serializers import FromInputFile
 from pyiceberg import table
 from pyiceberg import exceptions
 from bricksync.provider import ProviderConfig
+from bricksync.cache import CacheEntryType
+from bricksync.retry import ErrorClassifier, ErrorClass
+from bricksync.result import SyncAction, record_action
+from bricksync.iceberg import IcebergMetadataSummary, PartialMetadataParseError, read_metadata_summary
 import logging
 
 class GlueCatalog(CatalogProvider):
-    def __init__(self, provider: AwsProvider):
+    provider_name = "glue"
+    error_classifier = ErrorClassifier(
+        retryable=("ConcurrentModificationException", "ThrottlingException", "InternalServiceException",
+                   "OperationTimeoutException", "detected concurrent update"),
+        idempotent_success=("AlreadyExists", "already exists"))
+    # The update is guarded by the version id read before it, so refresh_external_table
+    # is retried as a whole instead; a retried register cannot return the table
+    non_idempotent_operations = frozenset({"update_glue_table", "register_table"})
+    write_operations = frozenset({"update_glue_table", "register_table", "create_namespace"})
+
+    def __init__(self, provider: AwsProvider, client: glue.GlueCatalog = None):
         self.provider = provider
         self.session = provider.boto_session
-        self.client = glue.GlueCatalog("glue", **provider.provider_config.configuration)
+        self.client = client if client else glue.GlueCatalog("glue", **provider.provider_config.configuration)
         self.target_catalog_name = self.provider.provider_config.configuration.get("catalog_name", "glue_catalog")
 
 
@@ -26,12 +40,19 @@ class GlueCatalog(CatalogProvider):
         return IcebergTable(
             name=".".join(elem for elem in table.name()),
             storage_location=table.location(),
-            iceberg_metadata_location=table.metadata_location
+            iceberg_metadata_location=table.metadata_location,
+            table_uuid=str(table.metadata.table_uuid)
         )
     
     def _list_tables(self, database: str):
-        return self.client.list_tables(database)
+        return self._remote("list_tables", database, self.client.list_tables, database)
     
+    def iter_tables(self, namespace: str) -> Iterator[str]:
+        # A Glue database is a schema; pyiceberg pages through it before returning
+        database = self.get_fqtn_parts(namespace)[-1]
+        for identifier in self._list_tables(database):
+            yield f"{namespace}.{identifier[-1]}"
+
     def get_table(self, name: str) -> Union[Table, View]:
         table_parts = self.get_fqtn_parts(name)
         if len(table_parts) == 3:
@@ -40,7 +61,7 @@ class GlueCatalog(CatalogProvider):
             schema = table_parts[0]
             table_name = table_parts[1]
         glue_table_name = f"{schema}.{table_name}"
-        tbl = self.client.load_table(glue_table_name)
+        tbl = self._remote("load_table", glue_table_name, self.client.load_table, glue_table_name)
         return self._pyiceberg_table_to_table(tbl)
     
     def create_catalog(self, catalog_name: str):
@@ -50,29 +71,41 @@ class GlueCatalog(CatalogProvider):
     
     def create_schema(self, catalog_name: str, schema_name: str):
         try:
-            self.client.create_namespace(schema_name)
+            self._remote("create_namespace", schema_name, self.client.create_namespace, schema_name)
         except Exception as e:
-            if 'already exists' in str(e):
+            if self.error_classifier.classify(e) == ErrorClass.IDEMPOTENT_SUCCESS:
               logging.info(f"Schema {schema_name} already exists, skipping creation.")
               pass
             else:
               raise(e)
         return
     
+    def _read_metadata(self, metadata_location: str) -> IcebergMetadataSummary:
+        """Read just what the Glue table input needs from the metadata file, falling back
+        to a full parse for files the streaming reader cannot summarize"""
+        io = self.client._load_file_io(location=metadata_location)
+        file = io.new_input(metadata_location)
+        try:
+            return self._remote("read_metadata", metadata_location, read_metadata_summary, file)
+        except PartialMetadataParseError as e:
+            logging.info(f"Falling back to a full parse of {metadata_location}: {e}")
+            return self._remote("read_metadata", metadata_location, FromInputFile.table_metadata, file)
+
     def refresh_external_table(self, schema: str, table_name: str, metadata_location: str, **kwargs) -> Table:
-        glue_table = self.client._get_glue_table(schema, table_name)
         glue_table_name = f"{schema}.{table_name}"
+        glue_table = self._remote("get_glue_table", glue_table_name, self.client._get_glue_table, schema, table_name)
         glue_table_version_id = glue_table.get("VersionId")
         prev_metadata_location = glue_table.get("Parameters").get("metadata_location")
         logging.info(f"Glue table {table_name} previous metadata location: {prev_metadata_location}")
         logging.info(f"Glue table {table_name} new metadata location: {metadata_location}")
         if prev_metadata_location == metadata_location:
            logging.info(f"Metadata location for {table_name} has not changed, skipping refresh.")
-           return self.get_table(glue_table_name)
+           record_action(SyncAction.UNCHANGED)
+           return IcebergTable(name=glue_table_name,
+                               storage_location=glue_table.get("StorageDescriptor", {}).get("Location"),
+                               iceberg_metadata_location=metadata_location)
         
-        io = self.client._load_file_io(location=metadata_location)
-        file = io.new_input(metadata_location)
-        metadata = FromInputFile.table_metadata(file)
+        metadata = self._read_metadata(metadata_location)
         
         update_table_req = glue._construct_table_input(
             table_name=table_name,
@@ -82,13 +115,19 @@ class GlueCatalog(CatalogProvider):
             properties={}
         )
 
-        self.client._update_glue_table(
+        self._remote("update_glue_table", glue_table_name,
+            self.client._update_glue_table,
             database_name=schema,
             table_name=table_name,
             table_input=update_table_req,
             version_id=glue_table_version_id
         )
-        return self.get_table(glue_table_name)
+        record_action(SyncAction.REFRESHED)
+        # We just wrote this metadata location, no need to load the table back
+        return IcebergTable(name=glue_table_name,
+                            storage_location=metadata.location,
+                            iceberg_metadata_location=metadata_location,
+                            table_uuid=str(metadata.table_uuid) if metadata.table_uuid else None)
 
          
     def create_or_refresh_external_table(self, table: Union[Table, View], **kwargs) -> Table:
@@ -99,20 +138,29 @@ class GlueCatalog(CatalogProvider):
         schema = self.get_schema_from_name(table)
         table_name = self.get_table_from_name(table)
         glue_table_name = f"{schema}.{table_name}"
+        # A table already at this metadata location, as of a recent run, needs no Glue call
+        if self._cache_get(CacheEntryType.TARGET_STATE, glue_table_name) == table.iceberg_metadata_location:
+            logging.info(f"Metadata location for {table_name} has not changed, skipping refresh.")
+            record_action(SyncAction.UNCHANGED)
+            return IcebergTable(name=glue_table_name,
+                                storage_location=table.storage_location,
+                                iceberg_metadata_location=table.iceberg_metadata_location)
+        # Refresh reads the Glue table record directly, so an existing table is not
+        # loaded (and its possibly missing metadata file read) first
         try:
-            self.get_table(table.name)
+            # A concurrent update makes the version id stale, so the read is redone with the update
+            result = self._retrying(self.refresh_external_table, schema, table_name, table.iceberg_metadata_location)
         except exceptions.NoSuchTableError:
             # Table does not exist, need to create it
-            self.client.register_table(glue_table_name, table.iceberg_metadata_location)
-            return self.get_table(table.name)
-        except FileNotFoundError:
-            # Table was found but metadata location might no longer exist for some reason
-            # Assumption that table needs to be refreshed
-            pass
-        except Exception as e:
+            tbl = self._remote("register_table", glue_table_name,
+                               self.client.register_table, glue_table_name, table.iceberg_metadata_location)
+            result = self._pyiceberg_table_to_table(tbl)
+            record_action(SyncAction.CREATED)
+        except Exception:
+            self._cache_invalidate(CacheEntryType.TARGET_STATE, glue_table_name)
             raise
-        # Table exists, need to refresh it
-        return self.refresh_external_table(schema, table_name, table.iceberg_metadata_location)
+        self._cache_put(CacheEntryType.TARGET_STATE, glue_table_name, table.iceberg_metadata_location)
+        return result
 
     def create_or_refresh_view(self, view: View, **kwargs):
         raise NotImplementedError("GlueCatalog does not support creating or refreshing views currently")
@@ -1,18 +1,28 @@
 from bricksync.provider.snowflake import SnowflakeProvider
-from bricksync.provider.catalog import CatalogProvider
+from bricksync.provider.catalog import CatalogProvider, AsyncCatalogProvider
 from bricksync.config import ProviderConfig
-from typing import List, Union, Optional, Dict
+from typing import Callable, List, Union, Optional, Dict, Tuple, Iterator
 from bricksync.table import Table, DeltaTable, IcebergTable, View
+from bricksync.tracing import statement_operation
+from bricksync.cache import CacheEntryType
+from bricksync.result import SyncAction, record_action
+from bricksync.retry import ErrorClassifier, call_with_retry_async
+from bricksync.iceberg import read_metadata_summary
+from pyiceberg.io import FileIO, load_file_io
 from snowflake.connector.cursor import DictCursor, SnowflakeCursor
 from snowflake.connector import SnowflakeConnection
 import snowflake.connector as sf
-from dataclasses import dataclass
-import json, logging
+from dataclasses import dataclass, asdict
+import json, logging, re, threading, asyncio
 import sqlglot
 import sqlglot.expressions as exp
 from sqlglot.dialects.dialect import Dialect, Dialects
 from enum import Enum
 
+# Snowflake's error for a table or other object that does not exist or is not visible
+_OBJECT_DOES_NOT_EXIST = 2003
+_MISSING_OBJECT = re.compile(r"(?:table|object) '([^']+)' does not exist", re.IGNORECASE)
+
 
 class SnowflakeTableType(Enum):
     VIEW = "VIEW"
@@ -51,13 +61,39 @@ class SnowflakeExternalVolume:
             metadata_str = metadata_str[1:]
         return metadata_str
 
+def _string_literal(value: str) -> str:
+    """value as a Snowflake string literal, with quotes and backslashes escaped"""
+    return "'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+
+def _object_name(side: str, alias: str = None) -> str:
+    """Fully qualified name expression for one side of an OBJECT_DEPENDENCIES row"""
+    prefix = f"{alias}.{side}" if alias else side
+    return f"{prefix}_database || '.' || {prefix}_schema || '.' || {prefix}_object_name"
+
 class SnowflakeCatalog(CatalogProvider):
-    def __init__(self, provider: SnowflakeProvider):
+    provider_name = "snowflake"
+    error_classifier = ErrorClassifier(
+        retryable=("Authentication token has expired", "Session no longer exists", "Could not connect to Snowflake",
+                   "HTTP 429", "HTTP 503", "HTTP 504"),
+        idempotent_success=("already exists",))
+
+    def __init__(self, provider: SnowflakeProvider, file_io: FileIO = None):
         self.provider = provider
         self.client: SnowflakeConnection = provider.client
+        # Optional access to table metadata files, used to learn a source's table uuid
+        self.file_io = file_io
+        self._table_uuids: Dict[str, str] = {}
+        self._external_volumes: Optional[List[SnowflakeExternalVolume]] = None
+        self._default_catalog_integrations: Dict[str, SnowflakeCatalogIntegration] = {}
+        # Concurrent syncs share the cached lookups, so only one of them fills each cache
+        self._lookup_lock = threading.RLock()
+
+    def to_async(self, max_threads: int = 8) -> "AsyncSnowflakeCatalog":
+        return AsyncSnowflakeCatalog(self, max_threads)
 
-    def _sql(self, sql: str):
-        return self.client.cursor(DictCursor).execute(sql)
+    def _sql(self, sql: str, target: str = None):
+        return self._remote(statement_operation(sql), target,
+                            self.client.cursor(DictCursor).execute, sql)
     
     def _format_describe_response(self, response):
         return {str.lower(rec['property']): rec['property_value'] for rec in response.fetchall()}
@@ -68,39 +104,89 @@ class SnowflakeCatalog(CatalogProvider):
 
     def _get_iceberg_metadata_location(self, table_name: str) -> str:
         try:
-           q = self._sql(f"SELECT SYSTEM$GET_ICEBERG_TABLE_INFORMATION('{table_name}') as ICEBERG_INFO")
+           q = self._sql(f"SELECT SYSTEM$GET_ICEBERG_TABLE_INFORMATION({_string_literal(table_name)}) as ICEBERG_INFO", table_name)
            iceberg_info_str = q.fetchone()['ICEBERG_INFO']
-           print(iceberg_info_str)
            iceberg_info = json.loads(iceberg_info_str)
            iceberg_metadata = iceberg_info["metadataLocation"]
            return iceberg_metadata
         except Exception as e:
             raise Exception(f"Error getting Iceberg metadata location for table {table_name}: {e}")
 
+    def get_iceberg_metadata_locations(self, table_names: List[str], chunk_size: int = 100) -> Dict[str, str]:
+        """Current metadata location of each table, fetched with one multi-column SELECT
+        per chunk_size tables. Tables that do not exist are left out of the result."""
+        locations: Dict[str, str] = {}
+        for i in range(0, len(table_names), chunk_size):
+            locations.update(self._fetch_existing(table_names[i:i + chunk_size],
+                                                  self._fetch_iceberg_metadata_locations))
+        return locations
+
+    def _fetch_iceberg_metadata_locations(self, table_names: List[str]) -> Dict[str, str]:
+        columns = ", ".join(f"SYSTEM$GET_ICEBERG_TABLE_INFORMATION({_string_literal(name)}) AS T{i}"
+                            for i, name in enumerate(table_names))
+        row = self._sql(f"SELECT {columns}", table_names[0] if len(table_names) == 1 else None).fetchone()
+        return {name: json.loads(row[f"T{i}"])["metadataLocation"] for i, name in enumerate(table_names)}
+
+    def _fetch_existing(self, names: List[str], fetch: Callable[[List[str]], Dict[str, str]]) -> Dict[str, str]:
+        """fetch(names), leaving out the objects that do not exist"""
+        try:
+            return fetch(names)
+        except Exception as e:
+            if not any(self._is_missing_table_error(e, name) for name in names):
+                raise
+            if len(names) == 1:
+                logging.info(f"{names[0]} does not exist: {e}")
+                return {}
+            # A single missing object fails the whole statement, so split the batch to isolate it
+            middle = len(names) // 2
+            return {**self._fetch_existing(names[:middle], fetch),
+                    **self._fetch_existing(names[middle:], fetch)}
+
+    def stale_tables(self, tables: List[IcebergTable], chunk_size: int = 100) -> List[IcebergTable]:
+        """The tables whose Snowflake copy is missing or not at their metadata location"""
+        current = self.get_iceberg_metadata_locations([t.name for t in tables], chunk_size)
+        return [t for t in tables if current.get(t.name) != t.iceberg_metadata_location]
+
     @classmethod
     def initialize(cls, provider_config: ProviderConfig):
-        return cls(provider=SnowflakeProvider.initialize(provider_config))
+        configuration = provider_config.configuration or {}
+        file_io = (load_file_io(configuration)
+                   if str(configuration.get("read_table_metadata", "false")).lower() == "true" else None)
+        return cls(provider=SnowflakeProvider.initialize(provider_config), file_io=file_io)
 
     def create_catalog_integration(self, name: str, source: str = 'OBJECT_STORE', table_format: str = 'ICEBERG', enabled: bool = True):
         self._sql(f"""CREATE CATALOG INTEGRATION IF NOT EXISTS {name} 
                   CATALOG_SOURCE = {source} 
                   TABLE_FORMAT = {table_format}
-                  ENABLED = {enabled}""")
+                  ENABLED = {enabled}""", name)
     
     def get_catalog_integration(self, name: str = None, table_format: str = "ICEBERG") -> SnowflakeCatalogIntegration:
-        """Get a Snowflake catalog integration by name. If no name is specified, attempts to get one"""
+        """Get a Snowflake catalog integration by name. If no name is specified, attempts to get one.
+        The integration found that way is cached for the lifetime of the catalog"""
         if not name:
-            integrations = self.list_catalog_integrations()
-            for integration in integrations:
-                if (str.upper(integration.table_format) == str.upper(table_format)
-                    and str.upper(integration.catalog_source) == 'OBJECT_STORE' 
-                    and integration.enabled):
+            if str.upper(table_format) in self._default_catalog_integrations:
+                return self._default_catalog_integrations[str.upper(table_format)]
+            with self._lookup_lock:
+                if str.upper(table_format) in self._default_catalog_integrations:
+                    return self._default_catalog_integrations[str.upper(table_format)]
+                cache_key = f"catalog_integration:{str.upper(table_format)}"
+                cached = self._cache_get(CacheEntryType.PROVIDER, cache_key)
+                if cached:
+                    integration = SnowflakeCatalogIntegration(**cached)
+                    self._default_catalog_integrations[str.upper(table_format)] = integration
                     return integration
-            raise Exception(f"No {table_format} catalog integration found. Create one.")
+                integrations = self.list_catalog_integrations()
+                for integration in integrations:
+                    if (str.upper(integration.table_format) == str.upper(table_format)
+                        and str.upper(integration.catalog_source) == 'OBJECT_STORE' 
+                        and integration.enabled):
+                        self._default_catalog_integrations[str.upper(table_format)] = integration
+                        self._cache_put(CacheEntryType.PROVIDER, cache_key, asdict(integration))
+                        return integration
+                raise Exception(f"No {table_format} catalog integration found. Create one.")
         else:
             res = self._format_describe_response(
-            self._sql(f"DESCRIBE CATALOG INTEGRATION {name}"))
-            print(res)
+            self._sql(f"DESCRIBE CATALOG INTEGRATION {name}", name))
             return SnowflakeCatalogIntegration(
                 name=name,
                 **res)
@@ -113,56 +199,185 @@ class SnowflakeCatalog(CatalogProvider):
         return integrations
     
     def get_catalog(self, name: str):
-        q = self._sql(f"DESCRIBE DATABASE {name}")
+        q = self._sql(f"DESCRIBE DATABASE {name}", name)
 
         return self._format_describe_response(q)
     
     def create_catalog(self, catalog_name: str):
-        return self._sql(f"""CREATE DATABASE IF NOT EXISTS {catalog_name}""")
+        return self._sql(f"""CREATE DATABASE IF NOT EXISTS {catalog_name}""", catalog_name)
     
     def create_schema(self, catalog_name: str, schema_name: str):
-        return self._sql(f"""CREATE SCHEMA IF NOT EXISTS {catalog_name}.{schema_name}""")
+        return self._sql(f"""CREATE SCHEMA IF NOT EXISTS {catalog_name}.{schema_name}""", f"{catalog_name}.{schema_name}")
     
     def get_object_type(self, object_name: str) -> SnowflakeTableType:
         try:
-            q = self._sql(f"SELECT SYSTEM$REFERENCE('VIEW', '{object_name}')")
-            print(q.fetchall())
+            q = self._sql(f"SELECT SYSTEM$REFERENCE('VIEW', '{object_name}')", object_name)
             return SnowflakeTableType.VIEW
         except:
             try:
-                q = self._sql(f"SELECT SYSTEM$REFERENCE('TABLE', '{object_name}')")
+                q = self._sql(f"SELECT SYSTEM$REFERENCE('TABLE', '{object_name}')", object_name)
                 return SnowflakeTableType.TABLE
             except:
                 raise Exception(f"Object {object_name} not found as table or view")
                    
+    def _view_base_table_names(self, view_name: str, ddl_str: str) -> List[str]:
+        expression = sqlglot.parse_one(ddl_str, read=Dialects.SNOWFLAKE)
+        base_table_list = list(expression.find_all(exp.Table))
+        base_table_list_fmt = [f"{bt.catalog}.{bt.db}.{bt.name}" for bt in base_table_list]
+        return [bt for bt in base_table_list_fmt if bt not in [view_name.upper(), view_name.lower()]]
+
+    def _iceberg_table(self, table_name: str, iceberg_metadata: str) -> IcebergTable:
+        return IcebergTable(name=table_name,
+                            storage_location=iceberg_metadata.split('/metadata')[0],
+                            iceberg_metadata_location=iceberg_metadata)
+
     def get_table(self, table_name: str) -> Union[IcebergTable, DeltaTable, View]:
-        object_type = self.get_object_type(table_name)
+        return self._get_table(table_name, self.get_object_type(table_name))
+
+    def _get_table(self, table_name: str, object_type: SnowflakeTableType) -> Union[IcebergTable, View]:
         if object_type == SnowflakeTableType.VIEW:
-            q = self._sql(f"SELECT GET_DDL('VIEW','{table_name}', true) as VIEW_DDL")
-            ddl_str = q.fetchone()['VIEW_DDL']
-            expression = sqlglot.parse_one(ddl_str, read=Dialects.SNOWFLAKE)
-            base_table_list = list(expression.find_all(exp.Table))
-            base_table_list_fmt = [f"{bt.catalog}.{bt.db}.{bt.name}" for bt in base_table_list]
-            base_tables = [self.get_table(bt) 
-                           for bt in base_table_list_fmt if bt not in [table_name.upper(), table_name.lower()]]
-            return View(name=table_name,
-                        view_definition=ddl_str,
-                        dialect=Dialects.SNOWFLAKE,
-                        base_tables=base_tables)
+            return self.get_views([table_name])[table_name]
         else:
             iceberg_metadata = self._get_iceberg_metadata_location(table_name)
-            return IcebergTable(name=table_name,
-                                storage_location=iceberg_metadata.split('/metadata')[0],
-                                iceberg_metadata_location=iceberg_metadata)
-     
-    def create_external_table(self, table: Union[IcebergTable, DeltaTable], replace=False, **kwargs):
-        if not table.is_iceberg():
-            raise Exception(f"Table {table.name} does not have Iceberg metadata")
+            return self._iceberg_table(table_name, iceberg_metadata)
+
+    def _show_pages(self, kind: str, scope: str, page_size: int) -> Iterator[dict]:
+        """Rows of SHOW <kind> IN <scope>, page_size at a time in name order"""
+        last = None
+        while True:
+            start = f" FROM '{last}'" if last else ""
+            rows = self._sql(f"SHOW {kind} IN {scope} LIMIT {page_size}{start}", scope.split()[-1]).fetchall()
+            # FROM is inclusive of the name it starts from
+            page = [r for r in rows if r['name'] != last]
+            yield from page
+            if len(rows) < page_size or not page:
+                return
+            last = page[-1]['name']
+
+    def iter_tables(self, namespace: str, page_size: int = 1000) -> Iterator[str]:
+        parts = self.get_fqtn_parts(namespace)
+        if len(parts) == 1:
+            schemas = (f"{parts[0]}.{r['name']}" for r in self._show_pages("SCHEMAS", f"DATABASE {parts[0]}", page_size)
+                       if r['name'].upper() != "INFORMATION_SCHEMA")
+        else:
+            schemas = [namespace]
+        for schema in schemas:
+            for kind in ("ICEBERG TABLES", "VIEWS"):
+                for row in self._show_pages(kind, f"SCHEMA {schema}", page_size):
+                    yield f"{row['database_name']}.{row['schema_name']}.{row['name']}"
+
+    def _object_dependencies(self, view_names: List[str]) -> Dict[str, List[Tuple[str, str]]]:
+        """Every (referenced table or view, domain) pair of each view in the dependency
+        closure of view_names, in one recursive query over ACCOUNT_USAGE.OBJECT_DEPENDENCIES.
+        Keys and names are upper case fully qualified names. Functions, stages and other
+        referenced objects are left out."""
+        roots = ", ".join(_string_literal(name.upper()) for name in view_names)
+        q = self._sql(f"""WITH RECURSIVE deps (referencing, referenced, referenced_domain) AS (
+                SELECT {_object_name('referencing')}, {_object_name('referenced')}, referenced_object_domain
+                FROM SNOWFLAKE.ACCOUNT_USAGE.OBJECT_DEPENDENCIES
+                WHERE referencing_object_domain = 'VIEW' AND referenced_object_domain IN ('TABLE', 'VIEW')
+                  AND {_object_name('referencing')} IN ({roots})
+              UNION ALL
+                SELECT {_object_name('referencing', 'd')}, {_object_name('referenced', 'd')}, d.referenced_object_domain
+                FROM SNOWFLAKE.ACCOUNT_USAGE.OBJECT_DEPENDENCIES d
+                JOIN deps ON {_object_name('referencing', 'd')} = deps.referenced
+                WHERE d.referencing_object_domain = 'VIEW' AND d.referenced_object_domain IN ('TABLE', 'VIEW'))
+            SELECT DISTINCT referencing, referenced, referenced_domain FROM deps""")
+        dependencies: Dict[str, List[Tuple[str, str]]] = {}
+        for row in q.fetchall():
+            if row['REFERENCED_DOMAIN'].upper() not in (SnowflakeTableType.TABLE.value, SnowflakeTableType.VIEW.value):
+                continue
+            dependencies.setdefault(row['REFERENCING'].upper(), []).append(
+                (row['REFERENCED'].upper(), row['REFERENCED_DOMAIN'].upper()))
+        return dependencies
+
+    def get_view_ddls(self, view_names: List[str], chunk_size: int = 50) -> Dict[str, str]:
+        """DDL of each view, fetched with one multi-column GET_DDL SELECT per chunk_size views.
+        Views that do not exist are left out of the result."""
+        ddls: Dict[str, str] = {}
+        for i in range(0, len(view_names), chunk_size):
+            ddls.update(self._fetch_existing(view_names[i:i + chunk_size], self._fetch_view_ddls))
+        return ddls
+
+    def _fetch_view_ddls(self, view_names: List[str]) -> Dict[str, str]:
+        columns = ", ".join(f"GET_DDL('VIEW', {_string_literal(name)}, true) AS V{j}" for j, name in enumerate(view_names))
+        row = self._sql(f"SELECT {columns}", view_names[0] if len(view_names) == 1 else None).fetchone()
+        return {name: row[f"V{j}"] for j, name in enumerate(view_names)}
+
+    def _lookup_object(self, name: str) -> Tuple[SnowflakeTableType, str]:
+        """Type of an object with its DDL if it is a view, or its metadata location"""
+        if self.get_object_type(name) == SnowflakeTableType.VIEW:
+            return SnowflakeTableType.VIEW, self._fetch_view_ddls([name])[name]
+        return SnowflakeTableType.TABLE, self._get_iceberg_metadata_location(name)
+
+    def get_views(self, view_names: List[str]) -> Dict[str, View]:
+        """Resolve views and everything they depend on as one graph, in a constant number
+        of round trips whatever the depth: one dependency query, then batched GET_DDL and
+        metadata location lookups over the whole closure. A base object shared by several
+        views is a single node. DDL stays the source of truth for base tables; objects
+        missing from ACCOUNT_USAGE, which lags behind, are looked up individually, a level
+        of the graph at a time with siblings fetched concurrently on resolve_executor, and
+        objects it still lists after they were dropped are left out of the batches.
+        Reading ACCOUNT_USAGE needs IMPORTED PRIVILEGES on the SNOWFLAKE database; a role
+        without them resolves the whole graph that way."""
+        try:
+            dependencies = self._object_dependencies(view_names)
+        except Exception as e:
+            logging.info(f"Could not read view dependencies from ACCOUNT_USAGE, resolving views from their DDL: {e}")
+            dependencies = {}
+        prefetch_views = {name.upper() for name in view_names} | set(dependencies)
+        prefetch_tables = set()
+        for referenced in dependencies.values():
+            for name, domain in referenced:
+                (prefetch_views if domain == SnowflakeTableType.VIEW.value else prefetch_tables).add(name)
+        ddls = {name.upper(): ddl for name, ddl in self.get_view_ddls(sorted(prefetch_views)).items()}
+        locations = {name.upper(): location for name, location
+                     in self.get_iceberg_metadata_locations(sorted(prefetch_tables)).items()}
+        base_table_names: Dict[str, List[str]] = {}
+        pending = list(view_names)
+        while pending:
+            # Objects outside the prefetched closure, each looked up once
+            lookups = {}
+            for name in pending:
+                key = name.upper()
+                if key not in ddls and key not in locations and key not in lookups:
+                    lookups[key] = self._submit_resolve(self._lookup_object, name)
+            for key, lookup in lookups.items():
+                object_type, value = lookup.result()
+                (ddls if object_type == SnowflakeTableType.VIEW else locations)[key] = value
+            next_pending = []
+            for name in pending:
+                key = name.upper()
+                if key in ddls and key not in base_table_names:
+                    base_table_names[key] = self._view_base_table_names(name, ddls[key])
+                    next_pending.extend(base_table_names[key])
+            pending = next_pending
+        nodes: Dict[str, Union[IcebergTable, View]] = {}
+
+        def resolve(name: str, path: Tuple[str, ...]) -> Union[IcebergTable, View]:
+            key = name.upper()
+            if key in nodes:
+                return nodes[key]
+            if key in path:
+                raise Exception(f"Circular view dependency: {' -> '.join(path + (key,))}")
+            if key in ddls:
+                base_tables = [resolve(bt, path + (key,)) for bt in base_table_names[key]]
+                nodes[key] = View(name=name,
+                                  view_definition=ddls[key],
+                                  dialect=Dialects.SNOWFLAKE,
+                                  base_tables=base_tables)
+            else:
+                nodes[key] = self._iceberg_table(name, locations[key])
+            return nodes[key]
+
+        return {name: resolve(name, ()) for name in view_names}
+
+    def _create_external_table_statement(self, table: IcebergTable,
+                                         catalog_integration: SnowflakeCatalogIntegration,
+                                         external_volume: SnowflakeExternalVolume, replace=False) -> str:
         table_name = table.name
         location = table.iceberg_metadata_location
         table_format = "ICEBERG"
-        catalog_integration = self.get_catalog_integration(table_format=table_format)
-        external_volume = self.get_external_volume_by_path(location)
         metadata_str = (
             f"METADATA_FILE_PATH='{external_volume.to_iceberg_metadata_string(location)}'"
             if str.upper(table_format) == 'ICEBERG' else
@@ -181,52 +396,151 @@ class SnowflakeCatalog(CatalogProvider):
             CATALOG='{catalog_integration.name}'
             {metadata_str}
             COPY GRANTS""")
+        return statement
+
+    def _refresh_external_table_statement(self, table: IcebergTable, external_volume: SnowflakeExternalVolume) -> str:
+        metadata_file_path = external_volume.to_iceberg_metadata_string(table.iceberg_metadata_location)
+        return f"""ALTER ICEBERG TABLE {table.name} REFRESH '{metadata_file_path}'"""
 
-        logging.info(f"Creating external table {table_name} with statement: {statement}")
-        return self._sql(statement)
+    def _is_missing_table_error(self, e: Exception, table_name: str) -> bool:
+        """True if e is Snowflake's error for table_name not existing. A missing metadata
+        file or external volume fails with "does not exist" too, and creating the table
+        would then leave an existing one where it was."""
+        if getattr(e, "errno", None) not in (None, _OBJECT_DOES_NOT_EXIST):
+            return False
+        match = _MISSING_OBJECT.search(str(e))
+        if match is None:
+            return False
+        missing = [part.strip('"').upper() for part in match.group(1).split(".")]
+        name = [part.upper() for part in self.get_fqtn_parts(table_name)]
+        parts = min(len(missing), len(name))
+        return missing[-parts:] == name[-parts:]
+
+    def _is_uuid_mismatch_error(self, e: Exception) -> bool:
+        return "does not match the table uuid in metadata file" in str(e).lower()
+     
+    def _table_statement(self, table: IcebergTable, action: SyncAction, external_volume: SnowflakeExternalVolume,
+                         catalog_integration: SnowflakeCatalogIntegration = None) -> str:
+        """Statement that takes action on table: a refresh, a create, or for RECREATED a
+        replace. Creating needs the catalog integration."""
+        if action == SyncAction.REFRESHED:
+            return self._refresh_external_table_statement(table, external_volume)
+        return self._create_external_table_statement(table, catalog_integration, external_volume,
+                                                     replace=action == SyncAction.RECREATED)
+
+    def _first_table_action(self, table: IcebergTable, source_uuid: Optional[str]) -> SyncAction:
+        """What to try first for a table that is not already at its metadata location"""
+        target_uuid = self._target_table_uuid(table.name)
+        if source_uuid and target_uuid and source_uuid != target_uuid:
+            # The source was overwritten: replacing is the only statement that can succeed
+            logging.info(f"Table {table.name} uuid changed from {target_uuid} to {source_uuid}, replacing it")
+            return SyncAction.RECREATED
+        # Refreshing first means an existing table costs a single statement
+        return SyncAction.REFRESHED
+
+    def _fallback_table_action(self, table: IcebergTable, action: SyncAction, error: Exception) -> SyncAction:
+        """What to try after the statement for action failed with error. Raises error if
+        no other statement can succeed."""
+        logging.info(f"Snowflake error on {action.value} attempt of {table.name}: {error}")
+        if action == SyncAction.REFRESHED and self._is_uuid_mismatch_error(error):
+            # The replacing table is created straight at the new metadata file, so it needs no refresh
+            logging.info(f"Table UUID does not match - source was likely overwritten - attempting to recreate table")
+            return SyncAction.RECREATED
+        if action != SyncAction.CREATED and self._is_missing_table_error(error, table.name):
+            logging.info(f"Table {table.name} does not exist, creating it")
+            return SyncAction.CREATED
+        raise error
+
+    def _write_table(self, table: IcebergTable, action: SyncAction, external_volume: SnowflakeExternalVolume):
+        """Run the statement for action, and the fallbacks _fallback_table_action picks
+        when it fails"""
+        while True:
+            catalog_integration = (None if action == SyncAction.REFRESHED
+                                   else self.get_catalog_integration(table_format="ICEBERG"))
+            statement = self._table_statement(table, action, external_volume, catalog_integration)
+            logging.info(f"Syncing table {table.name} with statement: {statement}")
+            try:
+                result = self._sql(statement, table.name)
+            except Exception as e:
+                self._forget_target_state(table.name)
+                action = self._fallback_table_action(table, action, e)
+                continue
+            record_action(action)
+            return result
+
+    def create_external_table(self, table: Union[IcebergTable, DeltaTable], replace=False,
+                              external_volume: SnowflakeExternalVolume = None, **kwargs):
+        if not table.is_iceberg():
+            raise Exception(f"Table {table.name} does not have Iceberg metadata")
+        external_volume = external_volume or self.get_external_volume_by_path(table.iceberg_metadata_location)
+        return self._write_table(table, SyncAction.RECREATED if replace else SyncAction.CREATED, external_volume)
     
-    def refresh_external_table(self, table: Union[IcebergTable, DeltaTable], **kwargs):
+    def refresh_external_table(self, table: Union[IcebergTable, DeltaTable],
+                               external_volume: SnowflakeExternalVolume = None, **kwargs):
         if not table.is_iceberg():
             raise Exception(f"Table {table.name} does not have Iceberg metadata")
-        table_name = table.name
-        location = table.iceberg_metadata_location
-        table_format = "ICEBERG"
-        external_volume = self.get_external_volume_by_path(location)
-        metadata_file_path = external_volume.to_iceberg_metadata_string(location)
-        statement =  f"""ALTER ICEBERG TABLE {table_name} REFRESH '{metadata_file_path}'"""
+        external_volume = external_volume or self.get_external_volume_by_path(table.iceberg_metadata_location)
+        return self._write_table(table, SyncAction.REFRESHED, external_volume)
+
+    def _source_table_uuid(self, table: IcebergTable) -> Optional[str]:
+        """table-uuid of the metadata file being synced, if the source reported it or
+        the catalog can read table metadata"""
+        if table.table_uuid or self.file_io is None:
+            return table.table_uuid
         try:
-           result = self._sql(statement)
-           return result
+            summary = self._remote("read_metadata", table.iceberg_metadata_location,
+                                   read_metadata_summary, self.file_io.new_input(table.iceberg_metadata_location))
+            return summary.table_uuid
         except Exception as e:
-            logging.info(f"Snowflake error on refresh attempt: {str(e)}")
-            if "does not match the table uuid in metadata file" in str(e).lower():
-                logging.info(f"Table UUID does not match - source was likely overwritten - attempting to recreate table")
-                self.create_external_table(table, replace=True, **kwargs)
-                return self.refresh_external_table(table, **kwargs)
-            else:
-                raise
+            logging.info(f"Could not read table uuid from {table.iceberg_metadata_location}: {e}")
+            return None
+
+    def _target_table_uuid(self, table_name: str) -> Optional[str]:
+        """table-uuid of the metadata this catalog last pointed table_name at"""
+        return self._table_uuids.get(table_name) or self._cache_get(CacheEntryType.TARGET_STATE, f"uuid:{table_name}")
 
+    def _record_target_state(self, table: IcebergTable, table_uuid: Optional[str]):
+        self._cache_put(CacheEntryType.TARGET_STATE, table.name, table.iceberg_metadata_location)
+        if table_uuid:
+            self._table_uuids[table.name] = table_uuid
+            self._cache_put(CacheEntryType.TARGET_STATE, f"uuid:{table.name}", table_uuid)
+        else:
+            # The table now points at metadata of unknown uuid, so the last one no longer applies
+            self._table_uuids.pop(table.name, None)
+            self._cache_invalidate(CacheEntryType.TARGET_STATE, f"uuid:{table.name}")
+
+    def _forget_target_state(self, table_name: str):
+        self._table_uuids.pop(table_name, None)
+        self._cache_invalidate(CacheEntryType.TARGET_STATE, table_name)
+        self._cache_invalidate(CacheEntryType.TARGET_STATE, f"uuid:{table_name}")
     
+    def _is_current(self, table: IcebergTable) -> bool:
+        """True if a recent run already pointed the table at this metadata location, so
+        it needs no statement"""
+        if self._cache_get(CacheEntryType.TARGET_STATE, table.name) == table.iceberg_metadata_location:
+            logging.info(f"Table {table.name} is already at {table.iceberg_metadata_location}, skipping refresh")
+            return True
+        return False
+
     def create_or_refresh_external_table(self, table: Union[IcebergTable, DeltaTable], **kwargs):
-        # If table exists
         if not table.is_iceberg():
             raise Exception(f"Table {table.name} does not have Iceberg metadata")
-        table_name = table.name
-        location = table.iceberg_metadata_location
-        table_format = "ICEBERG"
-        try:
-          existing_table = self.get_table(table_name)
-          return self.refresh_external_table(table)
-        #todo: handle specific exception
-        except:
-            self.create_external_table(table)
-            return self.refresh_external_table(table)
+        if self._is_current(table):
+            record_action(SyncAction.UNCHANGED)
+            return None
+        external_volume = self.get_external_volume_by_path(table.iceberg_metadata_location)
+        source_uuid = self._source_table_uuid(table)
+        result = self._write_table(table, self._first_table_action(table, source_uuid), external_volume)
+        self._record_target_state(table, source_uuid)
+        return result
     
-    def create_or_refresh_view(self, view: View, **kwargs):
-        name = view.name
+    def _create_view_statement(self, view: View) -> str:
         view_def = self.convert_view_dialect(view.view_definition, view.dialect)
-        q = self._sql(f"""CREATE OR REPLACE VIEW {name} 
-                      COPY GRANTS AS {view_def}""")
+        return f"""CREATE OR REPLACE VIEW {view.name} 
+                      COPY GRANTS AS {view_def}"""
+
+    def create_or_refresh_view(self, view: View, **kwargs):
+        q = self._sql(self._create_view_statement(view), view.name)
         return q
     
     def convert_view_dialect(self, view_definition: str, source_dialect: Dialect):
@@ -237,7 +551,7 @@ class SnowflakeCatalog(CatalogProvider):
         return converted[0]
                  
     def get_external_volume(self, external_volume_name: str) -> SnowflakeExternalVolume:
-        q = self._sql(f"DESCRIBE EXTERNAL VOLUME {external_volume_name}")
+        q = self._sql(f"DESCRIBE EXTERNAL VOLUME {external_volume_name}", external_volume_name)
         for rec in q.fetchall():
             if rec['property'] == 'STORAGE_LOCATION_1':
                 location_info = json.loads(rec['property_value'])
@@ -248,25 +562,43 @@ class SnowflakeCatalog(CatalogProvider):
                     )
             
     def get_external_volume_by_path(self, path: str) -> SnowflakeExternalVolume:
-        """_summary_
+        """Find the external volume whose storage base URL contains path. Volumes are
+        listed once and cached; the cache is refreshed if no cached volume matches.
 
         Args:
-            path (str): _description_
+            path (str): Full storage path, e.g. an Iceberg metadata file location
 
         Raises:
-            Exception: _description_
+            Exception: If no external volume covers the path
 
         Returns:
-            SnowflakeExternalVolume: _description_
+            SnowflakeExternalVolume: The matching external volume
         """
-        path = path
         logging.info(f"Inferring Snowflake external volume for path {path}")
-        q = self.client.cursor(DictCursor).execute(f"SHOW EXTERNAL VOLUMES")
-        for volume in q.fetchall():
-            volume_info = self.get_external_volume(volume['name'])
-            if volume_info.storage_base_url in path:
-                return volume_info
-        raise Exception(f"No external volume found for path {path}")
+        with self._lookup_lock:
+            cached = self._external_volumes is not None or self._load_cached_external_volumes()
+            volumes = self._external_volumes if cached else self.list_external_volumes()
+            for volume_info in volumes:
+                if volume_info and volume_info.storage_base_url in path:
+                    return volume_info
+            if cached:
+                return self._refresh_external_volume_by_path(path)
+            raise Exception(f"No external volume found for path {path}")
+
+    def _load_cached_external_volumes(self) -> bool:
+        cached = self._cache_get(CacheEntryType.PROVIDER, "external_volumes")
+        if cached is None:
+            return False
+        self._external_volumes = [SnowflakeExternalVolume(**v) for v in cached]
+        return True
+
+    def _invalidate_external_volumes(self):
+        self._external_volumes = None
+        self._cache_invalidate(CacheEntryType.PROVIDER, "external_volumes")
+
+    def _refresh_external_volume_by_path(self, path: str) -> SnowflakeExternalVolume:
+        self._invalidate_external_volumes()
+        return self.get_external_volume_by_path(path)
 
     def list_external_volumes(self) -> List[SnowflakeExternalVolume]:
         """List all Snowflake external volumes
@@ -279,6 +611,8 @@ class SnowflakeCatalog(CatalogProvider):
         for volume in q.fetchall():
             volumes.append(self.get_external_volume(volume['name']))
         
+        self._external_volumes = volumes
+        self._cache_put(CacheEntryType.PROVIDER, "external_volumes", [asdict(v) for v in volumes if v])
         return volumes
     
     def create_external_volume(self, name: str, 
@@ -313,8 +647,114 @@ class SnowflakeCatalog(CatalogProvider):
                       STORAGE_AWS_ROLE_ARN = '{storage_aws_role_arn}'
                       STORAGE_BASE_URL = '{storage_base_url}'
                     )
-                  )""")
+                  )""", name)
+        self._invalidate_external_volumes()
         return self.get_external_volume(name)
 
 
- 
\ No newline at end of file
+class AsyncSnowflakeCatalog(AsyncCatalogProvider):
+    """Coroutine interface over a SnowflakeCatalog. Statements are submitted with
+    ``execute_async`` and polled with backoff, so a statement waiting on Snowflake
+    does not hold a thread: only each submit, status check and fetch takes one, for
+    its round trip. Cached lookups (external volumes, catalog integrations) still go
+    through the catalog on the thread pool."""
+    poll_interval: float = 0.01
+    max_poll_interval: float = 1.0
+
+    async def _sql(self, sql: str, target: str = None):
+        operation = statement_operation(sql)
+        return await call_with_retry_async(lambda: self._execute(sql, operation, target), self.catalog.error_classifier,
+                                           self.catalog.retry_policy, self.catalog.circuit_breaker,
+                                           label=f"{self.provider_name} {operation}")
+
+    async def _execute(self, sql: str, operation: str, target: str = None):
+        await self.catalog.rate_limiter.acquire_async(self.catalog.operation_class(operation))
+        with self.tracer.span(self.provider_name, operation, target):
+            # Submitting, polling and fetching are each a blocking round trip, so they go
+            # through the thread pool; only the wait between polls is on the loop
+            cursor = self.catalog.client.cursor(DictCursor)
+            await self._run(cursor.execute_async, sql)
+            query_id = cursor.sfqid
+            delay = self.poll_interval
+            while self.catalog.client.is_still_running(
+                    await self._run(self.catalog.client.get_query_status_throw_if_error, query_id)):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_poll_interval)
+            await self._run(cursor.get_results_from_sfqid, query_id)
+            return cursor
+
+    async def _object_type(self, object_name: str) -> SnowflakeTableType:
+        try:
+            await self._sql(f"SELECT SYSTEM$REFERENCE('VIEW', '{object_name}')", object_name)
+            return SnowflakeTableType.VIEW
+        except Exception:
+            try:
+                await self._sql(f"SELECT SYSTEM$REFERENCE('TABLE', '{object_name}')", object_name)
+                return SnowflakeTableType.TABLE
+            except Exception:
+                raise Exception(f"Object {object_name} not found as table or view")
+
+    async def get_table(self, table_name: str) -> Union[IcebergTable, DeltaTable, View]:
+        object_type = await self._object_type(table_name)
+        if object_type == SnowflakeTableType.VIEW:
+            # The whole graph costs a constant number of statements, so it is resolved in one go
+            views = await self._run(self.catalog.get_views, [table_name])
+            return views[table_name]
+        try:
+            q = await self._sql(f"SELECT SYSTEM$GET_ICEBERG_TABLE_INFORMATION({_string_literal(table_name)}) as ICEBERG_INFO", table_name)
+            iceberg_metadata = json.loads(q.fetchone()['ICEBERG_INFO'])["metadataLocation"]
+        except Exception as e:
+            raise Exception(f"Error getting Iceberg metadata location for table {table_name}: {e}")
+        return self.catalog._iceberg_table(table_name, iceberg_metadata)
+
+    async def _ensure_namespace(self, catalog_name: str, schema_name: str):
+        cache_key = f"namespace:{catalog_name}.{schema_name}"
+        if self.catalog._cache_get(CacheEntryType.TARGET_STATE, cache_key):
+            return
+        await self._sql(f"""CREATE DATABASE IF NOT EXISTS {catalog_name}""", catalog_name)
+        await self._sql(f"""CREATE SCHEMA IF NOT EXISTS {catalog_name}.{schema_name}""", f"{catalog_name}.{schema_name}")
+        self.catalog._cache_put(CacheEntryType.TARGET_STATE, cache_key, True)
+
+    async def _write_table(self, table: IcebergTable, action: SyncAction, external_volume: SnowflakeExternalVolume):
+        # The catalog decides what to run; only running it is done here
+        while True:
+            catalog_integration = (None if action == SyncAction.REFRESHED else
+                                   await self._run(self.catalog.get_catalog_integration, table_format="ICEBERG"))
+            statement = self.catalog._table_statement(table, action, external_volume, catalog_integration)
+            logging.info(f"Syncing table {table.name} with statement: {statement}")
+            try:
+                result = await self._sql(statement, table.name)
+            except Exception as e:
+                self.catalog._forget_target_state(table.name)
+                action = self.catalog._fallback_table_action(table, action, e)
+                continue
+            record_action(action)
+            return result
+
+    async def create_external_table(self, table: IcebergTable, replace=False,
+                                    external_volume: SnowflakeExternalVolume = None, **kwargs):
+        external_volume = external_volume or await self._run(self.catalog.get_external_volume_by_path,
+                                                             table.iceberg_metadata_location)
+        return await self._write_table(table, SyncAction.RECREATED if replace else SyncAction.CREATED, external_volume)
+
+    async def refresh_external_table(self, table: IcebergTable, external_volume: SnowflakeExternalVolume = None,
+                                     **kwargs):
+        external_volume = external_volume or await self._run(self.catalog.get_external_volume_by_path,
+                                                             table.iceberg_metadata_location)
+        return await self._write_table(table, SyncAction.REFRESHED, external_volume)
+
+    async def create_or_refresh_external_table(self, table: Union[IcebergTable, DeltaTable], **kwargs):
+        if not table.is_iceberg():
+            raise Exception(f"Table {table.name} does not have Iceberg metadata")
+        if self.catalog._is_current(table):
+            record_action(SyncAction.UNCHANGED)
+            return None
+        external_volume = await self._run(self.catalog.get_external_volume_by_path, table.iceberg_metadata_location)
+        source_uuid = (table.table_uuid if table.table_uuid or self.catalog.file_io is None
+                       else await self._run(self.catalog._source_table_uuid, table))
+        result = await self._write_table(table, self.catalog._first_table_action(table, source_uuid), external_volume)
+        self.catalog._record_target_state(table, source_uuid)
+        return result
+
+    async def create_or_refresh_view(self, view: View, **kwargs):
+        return await self._sql(self.catalog._create_view_statement(view), view.name)
@@ -0,0 +1,90 @@
+from typing import Callable, Dict, Optional
+from enum import Enum
+import asyncio, threading, time
+
+
+class OperationClass(Enum):
+    READ = "read"
+    WRITE = "write"
+
+
+# Leading keywords of statements that change a catalog
+_WRITE_KEYWORDS = {"CREATE", "ALTER", "DROP", "INSERT", "MSCK", "REFRESH", "GRANT"}
+# Object storage reads, which do not count against a catalog's API limits
+_STORAGE_OPERATIONS = {"read_metadata", "read_delta_log", "convert_delta"}
+
+
+class TokenBucket():
+    """Allows ``rate`` calls per second on average and bursts of up to ``burst`` calls.
+
+    Each acquire reserves a token under a lock and then waits, outside the lock, until
+    its token has accrued. Callers are served in arrival order whether they are threads
+    or coroutines, and the bucket never lets more through than it accrues."""
+    def __init__(self, rate: float, burst: float = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter():
+    """Token buckets for a provider's read and write calls, shared by every thread and
+    coroutine using the provider. A class without a rate is not limited."""
+    def __init__(self, read_rate: float = None, write_rate: float = None,
+                 read_burst: float = None, write_burst: float = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.buckets: Dict[OperationClass, Optional[TokenBucket]] = {
+            OperationClass.READ: TokenBucket(read_rate, read_burst, clock) if read_rate else None,
+            OperationClass.WRITE: TokenBucket(write_rate, write_burst, clock) if write_rate else None,
+        }
+
+    @classmethod
+    def from_configuration(cls, configuration: Dict) -> "RateLimiter":
+        def number(key: str) -> Optional[float]:
+            value = configuration.get(key)
+            return float(value) if value is not None else None
+        return cls(read_rate=number("read_requests_per_second"), write_rate=number("write_requests_per_second"),
+                   read_burst=number("read_burst"), write_burst=number("write_burst"))
+
+    def acquire(self, operation_class: Optional[OperationClass]):
+        bucket = self.buckets.get(operation_class)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def acquire_async(self, operation_class: Optional[OperationClass]):
+        bucket = self.buckets.get(operation_class)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+
+def operation_class(operation: str, write_operations: frozenset = frozenset()) -> Optional[OperationClass]:
+    """WRITE for statements that change a catalog and for write_operations, None for
+    object storage reads and READ otherwise"""
+    if operation in _STORAGE_OPERATIONS:
+        return None
+    if operation in write_operations or operation.split(" ", 1)[0] in _WRITE_KEYWORDS:
+        return OperationClass.WRITE
+    return OperationClass.READ
@@ -0,0 +1,199 @@
+from bricksync.config import SyncConfig
+from bricksync.table import Table, View
+from bricksync.tracing import CallCounters
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Union
+from enum import Enum
+import math, time
+
+
+class SyncAction(Enum):
+    CREATED = "created"
+    REFRESHED = "refreshed"
+    RECREATED = "recreated" # The source was overwritten, so the target table was replaced
+    UNCHANGED = "unchanged" # The target was already at the source's metadata
+    SKIPPED = "skipped" # Completed in a checkpointed earlier run and the source has not moved on
+    WRITTEN = "written" # Created or refreshed by a single statement that does not tell which
+
+
+class SyncPhase(Enum):
+    SOURCE_READ = "source_read"
+    ENSURE_NAMESPACE = "ensure_namespace"
+    CONVERSION = "conversion"
+    TARGET_WRITE = "target_write"
+
+
+_actions: ContextVar[Optional[List[SyncAction]]] = ContextVar("bricksync_sync_actions", default=None)
+
+
+def record_action(action: SyncAction):
+    """Called by a catalog provider to report what a write did to the target"""
+    actions = _actions.get()
+    if actions is not None:
+        actions.append(action)
+
+
+@contextmanager
+def collect_actions():
+    """Collect the actions reported by the writes made in this context, the last
+    one being what happened to the target"""
+    actions: List[SyncAction] = []
+    token = _actions.set(actions)
+    try:
+        yield actions
+    finally:
+        _actions.reset(token)
+
+
+def metadata_location(table: Union[Table, View]) -> Optional[str]:
+    """Iceberg metadata file of a table, or the storage location of a Delta table
+    without Iceberg metadata. None for views."""
+    if table.is_view():
+        return None
+    if table.is_delta():
+        return table.uniform_iceberg_info.metadata_location if table.is_iceberg() else table.storage_location
+    return table.iceberg_metadata_location
+
+
+@dataclass
+class ObjectSyncResult:
+    """What a sync did to one object of the source graph: the table or view synced,
+    or a base table of a view"""
+    name: str
+    is_view: bool
+    action: SyncAction
+    source_metadata_location: Optional[str] = None
+    target_metadata_location: Optional[str] = None
+
+
+@dataclass
+class SyncResult:
+    """Outcome of BrickSync.sync. objects lists every object of the source graph in
+    the order it was written, the synced object last; phases holds the seconds spent
+    in each SyncPhase, summed over the graph."""
+    source_provider: str
+    source: str
+    target_provider: str
+    target: str
+    objects: List[ObjectSyncResult] = field(default_factory=list)
+    phases: Dict[SyncPhase, float] = field(default_factory=dict)
+    calls: CallCounters = field(default_factory=CallCounters)
+    seconds: float = 0.0
+
+    @contextmanager
+    def timed(self, phase: SyncPhase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - start
+
+    @property
+    def action(self) -> Optional[SyncAction]:
+        """Action taken on the synced object itself"""
+        return self.objects[-1].action if self.objects else None
+
+    @property
+    def source_metadata_location(self) -> Optional[str]:
+        return self.objects[-1].source_metadata_location if self.objects else None
+
+    @property
+    def target_metadata_location(self) -> Optional[str]:
+        return self.objects[-1].target_metadata_location if self.objects else None
+
+    @property
+    def remote_calls(self) -> int:
+        return self.calls.calls
+
+@dataclass
+class TargetSyncResult:
+    target_provider: str
+    error: Optional[Exception] = None
+    result: Optional[SyncResult] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+@dataclass
+class SyncRunResult:
+    sync: SyncConfig
+    seconds: float
+    error: Optional[Exception] = None
+    skipped: bool = False # Completed in a checkpointed earlier run and the source has not moved on
+    abandoned: bool = False # Lease on the work queue task lost, so the sync was stopped; another worker owns the task
+    result: Optional[SyncResult] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of values, 0 when there are none"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)]
+
+@dataclass
+class SyncRunReport:
+    """Outcome of a bulk run such as BrickSync.run: one result per sync that was attempted"""
+    results: List[SyncRunResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def failures(self) -> List[SyncRunResult]:
+        return [r for r in self.results if not r.succeeded]
+
+    @property
+    def tables_per_second(self) -> float:
+        return len(self.results) / self.wall_seconds if self.wall_seconds else 0.0
+
+    def latency(self, percentile: float) -> float:
+        """Per-sync latency in seconds at percentile"""
+        return _percentile([r.seconds for r in self.results], percentile)
+
+    @property
+    def skipped(self) -> List[SyncRunResult]:
+        return [r for r in self.results if r.skipped]
+
+    @property
+    def abandoned(self) -> List[SyncRunResult]:
+        return [r for r in self.results if r.abandoned]
+
+    @property
+    def remote_calls(self) -> int:
+        return sum(r.result.remote_calls for r in self.results if r.result)
+
+    def phase_seconds(self) -> Dict[SyncPhase, float]:
+        """Seconds spent in each phase, summed over every sync"""
+        totals: Dict[SyncPhase, float] = {}
+        for r in self.results:
+            for phase, seconds in (r.result.phases.items() if r.result else ()):
+                totals[phase] = totals.get(phase, 0.0) + seconds
+        return totals
+
+    def action_counts(self) -> Dict[SyncAction, int]:
+        """Number of objects each action was taken on, over every sync's graph"""
+        counts: Dict[SyncAction, int] = {}
+        for r in self.results:
+            for o in (r.result.objects if r.result else ()):
+                counts[o.action] = counts.get(o.action, 0) + 1
+        return counts
+
+    def summary(self) -> str:
+        lines = [f"Synced {len(self.results) - len(self.failures)}/{len(self.results)} in {self.wall_seconds:.2f}s "
+                 f"({self.tables_per_second:.2f} tables/s, p50 {self.latency(50):.3f}s, p95 {self.latency(95):.3f}s)"]
+        if self.skipped:
+            lines.append(f"{len(self.skipped)} unchanged since the checkpoint were skipped")
+        if self.abandoned:
+            lines.append(f"{len(self.abandoned)} stopped after their lease was lost")
+        if any(r.result for r in self.results):
+            actions = ", ".join(f"{n} {a.value}" for a, n in self.action_counts().items())
+            phases = ", ".join(f"{p.value} {s:.2f}s" for p, s in self.phase_seconds().items())
+            lines.append(f"{self.remote_calls} remote calls; objects: {actions}; phases: {phases}")
+        for r in self.failures:
+            lines.append(f"FAILED {r.sync.source_provider}:{r.sync.source} -> {r.sync.target_provider}: {r.error}")
+        return "\n".join(lines)
@@ -0,0 +1,178 @@
+from bricksync.exceptions import CircuitOpenError
+from dataclasses import dataclass
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Optional, TypeVar
+from enum import Enum
+import asyncio, logging, random, threading, time
+
+T = TypeVar("T")
+
+
+class ErrorClass(Enum):
+    RETRYABLE = "retryable" # Transient: the same call can succeed if it is made again
+    IDEMPOTENT_SUCCESS = "idempotent_success" # What the call does is already in place, e.g. the object exists
+    FATAL = "fatal"
+
+
+# Transient failures every provider can surface through its HTTP or socket layer
+_TRANSIENT = ("timed out", "connection reset", "connection aborted", "connection refused",
+              "temporarily unavailable", "service unavailable", "too many requests", "throttl", "rate exceeded")
+
+
+class ErrorClassifier():
+    """Sorts a provider's errors by the fragments found in their type name and message,
+    matched case-insensitively. Connection and timeout errors are always retryable."""
+    def __init__(self, retryable: Iterable[str] = (), idempotent_success: Iterable[str] = ()):
+        self.retryable = tuple(p.lower() for p in _TRANSIENT + tuple(retryable))
+        self.idempotent_success = tuple(p.lower() for p in idempotent_success)
+
+    def classify(self, e: BaseException) -> ErrorClass:
+        if isinstance(e, CircuitOpenError):
+            return ErrorClass.FATAL
+        text = f"{type(e).__name__}: {e}".lower()
+        if any(p in text for p in self.idempotent_success):
+            return ErrorClass.IDEMPOTENT_SUCCESS
+        if isinstance(e, (ConnectionError, TimeoutError)) or any(p in text for p in self.retryable):
+            return ErrorClass.RETRYABLE
+        return ErrorClass.FATAL
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter: the wait before attempt n + 1 is
+    drawn uniformly from [0, min(max_delay, base_delay * 2 ** (n - 1))]"""
+    max_attempts: int = 4
+    base_delay: float = 0.2
+    max_delay: float = 10.0
+
+    @classmethod
+    def from_configuration(cls, configuration: Dict) -> "RetryPolicy":
+        return cls(max_attempts=int(configuration.get("retry_max_attempts", cls.max_attempts)),
+                   base_delay=float(configuration.get("retry_base_delay", cls.base_delay)),
+                   max_delay=float(configuration.get("retry_max_delay", cls.max_delay)))
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker():
+    """Stops calls to a provider that keeps failing transiently. After
+    ``failure_threshold`` retryable failures in a row the circuit opens and calls
+    fail straight away with CircuitOpenError. After ``reset_seconds`` one trial call
+    is let through: its success closes the circuit, a failure opens it again."""
+    def __init__(self, failure_threshold: int = 20, reset_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_configuration(cls, configuration: Dict) -> "CircuitBreaker":
+        return cls(failure_threshold=int(configuration.get("circuit_failure_threshold", 20)),
+                   reset_seconds=float(configuration.get("circuit_reset_seconds", 30.0)))
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self, label: str = None):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if self._trial or self.clock() < self.opened_at + self.reset_seconds:
+                raise CircuitOpenError(f"Circuit for {label or 'provider'} is open after {self.failures} "
+                                       f"consecutive transient failures")
+            self._trial = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                if not self.is_open:
+                    logging.warning(f"Opening circuit after {self.failures} consecutive transient failures")
+                self.opened_at = self.clock()
+                self._trial = False
+
+
+# Set while a unit of work is being retried as a whole, so the calls it makes are
+# attempted once each instead of multiplying the retries
+_retrying: ContextVar[bool] = ContextVar("bricksync_retrying", default=False)
+
+
+def _on_error(e: Exception, attempt: int, classifier: ErrorClassifier, policy: RetryPolicy,
+              breaker: CircuitBreaker, idempotent: bool, label: str) -> Optional[ErrorClass]:
+    """Outcome of a failed attempt: IDEMPOTENT_SUCCESS to return, RETRYABLE to try
+    again, or None to raise"""
+    kind = classifier.classify(e)
+    if kind == ErrorClass.RETRYABLE:
+        breaker.record_failure()
+    elif not isinstance(e, CircuitOpenError):
+        # The provider answered, so it is up
+        breaker.record_success()
+    if kind == ErrorClass.IDEMPOTENT_SUCCESS and attempt > 1:
+        # An earlier attempt that seemed to fail went through
+        logging.info(f"{label} already took effect on an earlier attempt: {e}")
+        return kind
+    if kind == ErrorClass.RETRYABLE and idempotent and attempt < policy.max_attempts:
+        logging.warning(f"{label} failed on attempt {attempt}/{policy.max_attempts}, retrying: {e}")
+        return kind
+    return None
+
+
+def call_with_retry(fn: Callable[[], T], classifier: ErrorClassifier, policy: RetryPolicy,
+                    breaker: CircuitBreaker, idempotent: bool = True, label: str = None) -> Optional[T]:
+    """Call fn, retrying retryable errors with backoff while idempotent. On a retry, an
+    error saying the call already took effect is a success and None is returned. Inside
+    another call_with_retry, fn is called once and the outer call retries."""
+    if _retrying.get():
+        return fn()
+    attempt = 1
+    while True:
+        breaker.before_call(label)
+        token = _retrying.set(True)
+        try:
+            result = fn()
+        except Exception as e:
+            kind = _on_error(e, attempt, classifier, policy, breaker, idempotent, label)
+            if kind is None:
+                raise
+            if kind == ErrorClass.IDEMPOTENT_SUCCESS:
+                return None
+        else:
+            breaker.record_success()
+            return result
+        finally:
+            _retrying.reset(token)
+        time.sleep(policy.backoff(attempt))
+        attempt += 1
+
+
+async def call_with_retry_async(fn: Callable, classifier: ErrorClassifier, policy: RetryPolicy,
+                                breaker: CircuitBreaker, idempotent: bool = True, label: str = None):
+    """Coroutine counterpart of call_with_retry for a coroutine function fn"""
+    attempt = 1
+    while True:
+        breaker.before_call(label)
+        try:
+            result = await fn()
+        except Exception as e:
+            kind = _on_error(e, attempt, classifier, policy, breaker, idempotent, label)
+            if kind is None:
+                raise
+            if kind == ErrorClass.IDEMPOTENT_SUCCESS:
+                return None
+        else:
+            breaker.record_success()
+            return result
+        await asyncio.sleep(policy.backoff(attempt))
+        attempt += 1
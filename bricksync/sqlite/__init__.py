@@ -0,0 +1,48 @@
+import sqlite3, threading, os
+
+
+class SQLiteDatabase():
+    """SQLite file shared by every thread and process pointing at the same path, e.g.
+    the metadata cache, sync checkpoints and the work queue. Each thread gets its own
+    connection in WAL mode with a busy timeout, so concurrent readers and writers from
+    several processes are safe."""
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross threads, or a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def transaction(self) -> "Transaction":
+        return Transaction(self.connection)
+
+    def close(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class Transaction():
+    """Write transaction that takes SQLite's write lock up front, so two processes
+    updating the same file never deadlock upgrading a read lock"""
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -1,11 +1,104 @@
-from dataclasses import dataclass
-from typing import List, Dict, Union, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Union, Optional, Tuple, Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from sqlglot.dialects.dialect import Dialect
+import sys
 
-@dataclass
-class Table():
+_QUOTES = {"`": "`", '"': '"', "[": "]"}
+
+
+@dataclass(frozen=True, slots=True)
+class TableIdentifier:
+    """Parsed ``[catalog.]schema.table`` name. Parts may be quoted with backticks, double
+    quotes or brackets, which lets them contain dots; doubled closing quotes escape one.
+    Identifiers come from TableIdentifier.parse, which interns them and their parts."""
+    name: str
+    parts: Tuple[str, ...]
+
+    @staticmethod
+    @lru_cache(maxsize=262144)
+    def parse(name: str) -> "TableIdentifier":
+        parts, i = [], 0
+        while i <= len(name):
+            close = _QUOTES.get(name[i]) if i < len(name) else None
+            if close:
+                part, i = [], i + 1
+                while i < len(name):
+                    if name[i] == close:
+                        if name[i + 1:i + 2] == close:
+                            part.append(close)
+                            i += 2
+                            continue
+                        break
+                    part.append(name[i])
+                    i += 1
+                else:
+                    raise ValueError(f"Unterminated quoted identifier in {name}")
+                parts.append("".join(part))
+                i += 1
+                if i < len(name) and name[i] != ".":
+                    raise ValueError(f"Expected '.' after quoted identifier in {name}")
+            else:
+                end = name.find(".", i)
+                end = len(name) if end == -1 else end
+                parts.append(name[i:end])
+                i = end
+            i += 1
+        if len(parts) > 3:
+            raise ValueError(f"Expected at most catalog.schema.table, got {len(parts)} parts in {name}")
+        return TableIdentifier(sys.intern(name), tuple(sys.intern(p) for p in parts))
+
+    @property
+    def catalog(self) -> Optional[str]:
+        return self.parts[0] if len(self.parts) == 3 else None
+
+    @property
+    def schema(self) -> str:
+        return self.parts[-2] if len(self.parts) >= 2 else self.parts[0]
+
+    @property
+    def table(self) -> str:
+        return self.parts[-1] if len(self.parts) >= 2 else None
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@lru_cache(maxsize=4096)
+def _shared_properties(items: frozenset) -> Mapping[str, str]:
+    return MappingProxyType(dict(items))
+
+def shared_properties(properties: Optional[Mapping[str, str]]) -> Optional[Mapping[str, str]]:
+    """One read-only mapping for every table with the same properties. It is shared,
+    so it cannot be modified; copy it with dict() to make changes."""
+    if not properties:
+        return properties
+    try:
+        return _shared_properties(frozenset(properties.items()))
+    except TypeError:
+        return MappingProxyType(dict(properties))
+
+
+class _Named():
+    __slots__ = ()
+
+    @property
+    def identifier(self) -> TableIdentifier:
+        """Parsed name, kept until the name changes"""
+        identifier = self._identifier
+        if identifier is None or identifier.name is not self.name:
+            identifier = TableIdentifier.parse(self.name)
+            self.name = identifier.name
+            self._identifier = identifier
+        return identifier
+
+
+@dataclass(slots=True)
+class Table(_Named):
     name: str
     storage_location: str
+    _identifier: Optional[TableIdentifier] = field(default=None, init=False, repr=False, compare=False)
 
     def is_view(self) -> bool:
         return False
@@ -23,24 +116,33 @@ class Table():
         self.name = name
     
 
-@dataclass
+@dataclass(slots=True)
 class UniformIcebergInfo:
     metadata_location: str
     converted_delta_version: int
     converted_delta_timestamp: str
 
-@dataclass
+@dataclass(slots=True)
 class IcebergTable(Table):
     iceberg_metadata_location: str
+    table_uuid: Optional[str] = None # table-uuid of the metadata file, when the source already knows it
 
     def is_iceberg(self) -> bool:
         return True
 
-@dataclass
+@dataclass(slots=True)
 class DeltaTable(Table):
-    delta_properties: Dict[str, str]
+    delta_properties: Mapping[str, str] # Read-only, shared between tables with the same properties
     uniform_iceberg_info: Optional[UniformIcebergInfo]
 
+    def __post_init__(self):
+        self.delta_properties = shared_properties(self.delta_properties)
+
+    def __reduce__(self):
+        # The read-only proxy cannot be pickled or copied; rebuild from a plain dict
+        properties = dict(self.delta_properties) if self.delta_properties is not None else None
+        return (type(self), (self.name, self.storage_location, properties, self.uniform_iceberg_info))
+
     def is_iceberg(self) -> bool:
         return self.uniform_iceberg_info is not None
     
@@ -55,9 +157,10 @@ class DeltaTable(Table):
                             storage_location=self.storage_location, 
                             iceberg_metadata_location=self.uniform_iceberg_info.metadata_location)
 
-@dataclass
-class ViewSource():
+@dataclass(slots=True)
+class ViewSource(_Named):
     name: str
+    _identifier: Optional[TableIdentifier] = field(default=None, init=False, repr=False, compare=False)
 
     def is_view(self) -> bool:
         return True
@@ -68,7 +171,7 @@ class ViewSource():
     def set_name(self, name: str):
         self.name = name
 
-@dataclass
+@dataclass(slots=True)
 class View(ViewSource):
     view_definition: str
     dialect: Dialect
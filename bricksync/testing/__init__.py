@@ -0,0 +1,5 @@
+from bricksync.testing.fakes import (RemoteCallLog, FakeLakehouse, FakeEnvironment,
+                                     FakeWorkspaceClient, FakeSparkSession,
+                                     FakeSnowflakeConnection, FakeGlueCatalog, FakeFileIO, FakeDeltaLogFileSystem,
+                                     iceberg_metadata_json)
+from bricksync.testing.budget import CallBudget, CallBudgetExceeded, assert_call_budget
@@ -0,0 +1,58 @@
+"""Remote-call budgets for regression tests.
+
+A budget declares how many remote calls a logical operation may make, in total,
+per provider and per provider operation. ``assert_call_budget`` counts the calls
+made inside its block, by any catalog provider, and fails when the budget is
+exceeded:
+
+    with assert_call_budget("warm Delta->Snowflake refresh", per_provider={"snowflake": 2}):
+        bs.sync("databricks", name, "snowflake", name)
+"""
+from bricksync.tracing import CallCounters, get_tracer
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+class CallBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass
+class CallBudget:
+    total: Optional[int] = None
+    per_provider: Dict[str, int] = field(default_factory=dict)
+    per_operation: Dict[str, int] = field(default_factory=dict)
+
+    def violations(self, counters: CallCounters) -> List[str]:
+        found = []
+        if self.total is not None and counters.calls > self.total:
+            found.append(f"{counters.calls} remote calls, budget is {self.total}")
+        for provider, limit in self.per_provider.items():
+            calls = counters.calls_for(provider)
+            if calls > limit:
+                found.append(f"{calls} {provider} calls, budget is {limit}")
+        for key, limit in self.per_operation.items():
+            provider, operation = key.split(".", 1)
+            calls = counters.calls_for(provider, operation)
+            if calls > limit:
+                found.append(f"{calls} {key} calls, budget is {limit}")
+        return found
+
+    def check(self, counters: CallCounters, label: str = None):
+        found = self.violations(counters)
+        if found:
+            breakdown = ", ".join(f"{k}={v['calls']}" for k, v in counters.to_dict().items())
+            raise CallBudgetExceeded(f"{label or 'Operation'} exceeded its remote call budget: "
+                                     f"{'; '.join(found)} ({breakdown})")
+
+
+@contextmanager
+def assert_call_budget(label: str = None, total: int = None,
+                       per_provider: Dict[str, int] = None, per_operation: Dict[str, int] = None):
+    """Count the remote calls made inside the block and raise CallBudgetExceeded
+    if they exceed the declared budget. Yields the CallCounters being filled."""
+    budget = CallBudget(total, per_provider or {}, per_operation or {})
+    with get_tracer().collect() as counters:
+        yield counters
+    budget.check(counters, label)
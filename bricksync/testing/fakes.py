@@ -0,0 +1,881 @@
+"""Offline stand-ins for the remote systems BrickSync talks to.
+
+The fakes replace the Snowflake connector, the Databricks ``WorkspaceClient`` and
+Spark session, and the pyiceberg Glue catalog with in-memory implementations that
+serve a shared :class:`FakeLakehouse`. Every call they serve is recorded in a
+:class:`RemoteCallLog`, which can also inject a per-call latency so wall time
+behaves like a real deployment.
+"""
+from bricksync import BrickSync
+from bricksync.config import ProviderConfig, ProviderType
+from bricksync.provider.catalog.databricks import DatabricksCatalog, SqlWarehouse, split_statements
+from bricksync.provider.catalog.snowflake import SnowflakeCatalog
+from bricksync.provider.catalog.glue import GlueCatalog
+from bricksync.delta import LogFileSystem, DeltaLogReader
+from bricksync.convert import DeltaIcebergConverter
+from databricks.sdk.errors import NotFound, ResourceAlreadyExists
+from databricks.sdk.service.catalog import (TableInfo, TableType, DataSourceFormat,
+                                            DependencyList, Dependency, TableDependency)
+from databricks.sdk.service import sql as dbsql
+from snowflake.connector.errors import ProgrammingError
+from pyiceberg.serializers import FromInputFile
+from pyiceberg import exceptions
+from dataclasses import dataclass, field
+from collections import Counter
+from types import SimpleNamespace
+from typing import List, Dict, Optional, Tuple
+import threading, time, json, io, re, uuid
+
+_NAMESPACE_UUID = uuid.UUID("6c0a3b3e-7d55-4b7c-9d1e-2f0c1b8a4e10")
+
+
+class RemoteCallLog:
+    """Thread-safe record of the calls served by the fakes.
+
+    ``latency`` is the default delay (seconds) added to every call; ``latencies``
+    overrides it per provider (``{"snowflake": 0.05}``) or per operation
+    (``{"snowflake.execute": 0.08}``).
+    """
+    def __init__(self, latency: float = 0.0, latencies: Dict[str, float] = None):
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def delay(self, provider: str, operation: str) -> float:
+        return self.latencies.get(f"{provider}.{operation}",
+                                  self.latencies.get(provider, self.latency))
+
+    def record(self, provider: str, operation: str, target: str = None, wait: bool = True) -> float:
+        """Count a call and sleep for its latency, or with ``wait=False`` return the
+        latency so the caller can model a call that completes in the background"""
+        with self._lock:
+            self.counts[(provider, operation)] += 1
+        delay = self.delay(provider, operation)
+        if delay and wait:
+            time.sleep(delay)
+        return delay
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def by_provider(self) -> Dict[str, int]:
+        totals = Counter()
+        for (provider, _), count in self.counts.items():
+            totals[provider] += count
+        return dict(totals)
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+
+def iceberg_metadata_json(table_uuid: str, location: str, snapshots: int = 1) -> bytes:
+    """Build a minimal but valid format-version 2 Iceberg metadata file."""
+    snaps = []
+    for i in range(snapshots):
+        snap = {"snapshot-id": 1000 + i, "sequence-number": i + 1,
+                "timestamp-ms": 1700000000000 + i,
+                "manifest-list": f"{location}/metadata/snap-{1000 + i}.avro",
+                "summary": {"operation": "append"}, "schema-id": 0}
+        if i:
+            snap["parent-snapshot-id"] = 999 + i
+        snaps.append(snap)
+    current = snaps[-1]["snapshot-id"] if snaps else None
+    metadata = {
+        "format-version": 2,
+        "table-uuid": table_uuid,
+        "location": location,
+        "last-sequence-number": snapshots,
+        "last-updated-ms": 1700000000000 + snapshots,
+        "last-column-id": 2,
+        "current-schema-id": 0,
+        "schemas": [{"type": "struct", "schema-id": 0, "fields": [
+            {"id": 1, "name": "id", "required": True, "type": "long"},
+            {"id": 2, "name": "value", "required": False, "type": "string"}]}],
+        "default-spec-id": 0,
+        "partition-specs": [{"spec-id": 0, "fields": []}],
+        "last-partition-id": 999,
+        "default-sort-order-id": 0,
+        "sort-orders": [{"order-id": 0, "fields": []}],
+        "properties": {},
+        "current-snapshot-id": current,
+        "snapshots": snaps,
+        "snapshot-log": [{"snapshot-id": s["snapshot-id"], "timestamp-ms": s["timestamp-ms"]} for s in snaps],
+        "metadata-log": [],
+        "refs": {"main": {"snapshot-id": current, "type": "branch"}} if snaps else {},
+    }
+    return json.dumps(metadata).encode()
+
+
+@dataclass
+class FakeTableSpec:
+    name: str
+    storage_location: str
+    table_uuid: str
+    snapshots: int = 1
+    metadata_version: int = 1
+    delta_version: int = 1
+    uniform_version: Optional[int] = 1
+
+    @property
+    def metadata_location(self) -> str:
+        file_id = uuid.uuid5(_NAMESPACE_UUID, f"{self.table_uuid}/{self.metadata_version}")
+        return f"{self.storage_location}/metadata/{self.metadata_version:05d}-{file_id}.metadata.json"
+
+
+@dataclass
+class FakeViewSpec:
+    name: str
+    base_tables: List[str]
+
+    @property
+    def view_definition(self) -> str:
+        first = self.base_tables[0]
+        query = f"select t0.id, t0.value from {first} as t0"
+        for i, bt in enumerate(self.base_tables[1:], start=1):
+            query += f" join {bt} as t{i} on t0.id = t{i}.id"
+        return query
+
+
+class FakeLakehouse:
+    """Source of truth shared by the fakes: Delta/UniForm tables, views and the
+    Iceberg metadata files that live in object storage."""
+    def __init__(self, bucket: str = "s3://bench-bucket"):
+        self.bucket = bucket
+        self.tables: Dict[str, FakeTableSpec] = {}
+        self.views: Dict[str, FakeViewSpec] = {}
+        self.metadata_files: Dict[str, Tuple[str, str, int]] = {}
+
+    @classmethod
+    def generate(cls, tables: int = 10000, schemas: int = 10, catalog: str = "bench",
+                 snapshots: int = 1, uniform: bool = True) -> "FakeLakehouse":
+        lakehouse = cls()
+        for i in range(tables):
+            lakehouse.add_table(f"{catalog}.schema_{i % schemas}.table_{i}",
+                                snapshots=snapshots, uniform=uniform)
+        return lakehouse
+
+    def _storage_location(self, name: str) -> str:
+        return f"{self.bucket}/{name.replace('.', '/')}"
+
+    def _publish(self, spec: FakeTableSpec):
+        self.metadata_files[spec.metadata_location] = (spec.table_uuid, spec.storage_location, spec.snapshots)
+
+    def add_table(self, name: str, snapshots: int = 1, uniform: bool = True) -> FakeTableSpec:
+        spec = FakeTableSpec(name=name,
+                             storage_location=self._storage_location(name),
+                             table_uuid=str(uuid.uuid5(_NAMESPACE_UUID, name)),
+                             snapshots=snapshots,
+                             uniform_version=1 if uniform else None)
+        self.tables[name] = spec
+        if uniform:
+            self._publish(spec)
+        return spec
+
+    def add_view(self, name: str, base_tables: List[str]) -> FakeViewSpec:
+        view = FakeViewSpec(name=name, base_tables=list(base_tables))
+        self.views[name] = view
+        return view
+
+    def add_view_graph(self, prefix: str, depth: int, width: int = 2, snapshots: int = 1) -> str:
+        """Build a layered view graph ``depth`` levels deep over ``width`` base tables.
+        Each view joins two views of the level below, so nodes are shared. Returns
+        the name of the single root view."""
+        level = [self.add_table(f"{prefix}_t{j}", snapshots=snapshots).name for j in range(width)]
+        for d in range(1, depth + 1):
+            level = [self.add_view(f"{prefix}_v{d}_{j}",
+                                   [level[j], level[(j + 1) % width]] if width > 1 else [level[j]]).name
+                     for j in range(width)]
+        return self.add_view(f"{prefix}_root", level).name
+
+    def commit(self, name: str) -> FakeTableSpec:
+        """Append a snapshot, producing a new metadata file for a UniForm table."""
+        spec = self.tables[name]
+        spec.snapshots += 1
+        spec.metadata_version += 1
+        spec.delta_version += 1
+        if spec.uniform_version is not None:
+            spec.uniform_version = spec.delta_version
+            self._publish(spec)
+        return spec
+
+    def overwrite(self, name: str) -> FakeTableSpec:
+        """Replace the table, which gives its metadata a new table uuid."""
+        spec = self.tables[name]
+        spec.table_uuid = str(uuid.uuid4())
+        spec.metadata_version += 1
+        spec.delta_version += 1
+        spec.uniform_version = spec.delta_version
+        self._publish(spec)
+        return spec
+
+    def read_metadata(self, path: str) -> bytes:
+        if path not in self.metadata_files:
+            raise FileNotFoundError(path)
+        table_uuid, location, snapshots = self.metadata_files[path]
+        return iceberg_metadata_json(table_uuid, location, snapshots)
+
+    def metadata_uuid(self, path: str) -> Optional[str]:
+        entry = self.metadata_files.get(path)
+        return entry[0] if entry else None
+
+
+class FakeFileIO:
+    def __init__(self, lakehouse: FakeLakehouse, log: RemoteCallLog):
+        self.lakehouse = lakehouse
+        self.log = log
+
+    def new_input(self, location: str) -> "FakeInputFile":
+        return FakeInputFile(location, self)
+
+
+class FakeInputFile:
+    def __init__(self, location: str, io: FakeFileIO):
+        self.location = location
+        self._io = io
+
+    def exists(self) -> bool:
+        return self.location in self._io.lakehouse.metadata_files
+
+    def open(self, seekable: bool = True):
+        self._io.log.record("storage", "get_object", self.location)
+        return io.BytesIO(self._io.lakehouse.read_metadata(self.location))
+
+
+class FakeDeltaLogFileSystem(LogFileSystem):
+    """The _delta_log of every lakehouse table: one commit file per Delta version and
+    a checkpoint every ``checkpoint_interval`` versions"""
+    def __init__(self, lakehouse: FakeLakehouse, log: RemoteCallLog, checkpoint_interval: int = 10):
+        self.lakehouse = lakehouse
+        self.log = log
+        self.checkpoint_interval = checkpoint_interval
+
+    def _spec(self, log_directory: str) -> FakeTableSpec:
+        location = log_directory.rstrip("/").rpartition("/_delta_log")[0]
+        for spec in self.lakehouse.tables.values():
+            if spec.storage_location == location:
+                return spec
+        raise FileNotFoundError(log_directory)
+
+    def read(self, path: str) -> bytes:
+        self.log.record("storage", "get_object", path)
+        directory, _, name = path.rpartition("/")
+        checkpoint = self._spec(directory).delta_version // self.checkpoint_interval * self.checkpoint_interval
+        if name != "_last_checkpoint" or not checkpoint:
+            raise FileNotFoundError(path)
+        return json.dumps({"version": checkpoint, "size": checkpoint}).encode()
+
+    def list(self, directory: str, start_after: str = None):
+        self.log.record("storage", "list_objects", directory)
+        spec = self._spec(directory)
+        names = [f"{v:020d}.json" for v in range(spec.delta_version + 1)]
+        names += [f"{v:020d}.checkpoint.parquet" for v in range(self.checkpoint_interval, spec.delta_version + 1,
+                                                                 self.checkpoint_interval)]
+        return iter(sorted(n for n in names + ["_last_checkpoint"] if start_after is None or n > start_after))
+
+
+# Databricks
+
+class _FakeTablesAPI:
+    def __init__(self, workspace: "FakeWorkspaceClient"):
+        self.workspace = workspace
+
+    def get(self, full_name: str, include_delta_metadata: bool = None, **kwargs) -> TableInfo:
+        self.workspace.log.record("databricks", "tables.get", full_name)
+        return self._table_info(full_name)
+
+    def list(self, catalog_name: str, schema_name: str, **kwargs) -> Iterator[TableInfo]:
+        self.workspace.log.record("databricks", "tables.list", f"{catalog_name}.{schema_name}")
+        lakehouse = self.workspace.lakehouse
+        prefix = f"{catalog_name}.{schema_name}."
+        return iter([self._table_info(n) for n in sorted(list(lakehouse.tables) + list(lakehouse.views))
+                     if n.startswith(prefix)])
+
+    def _table_info(self, full_name: str) -> TableInfo:
+        lakehouse = self.workspace.lakehouse
+        if full_name in lakehouse.tables:
+            spec = lakehouse.tables[full_name]
+            return TableInfo(full_name=full_name,
+                             table_type=TableType.EXTERNAL,
+                             data_source_format=DataSourceFormat.DELTA,
+                             storage_location=spec.storage_location,
+                             properties={"delta.enableIcebergCompatV2": "true",
+                                         "delta.universalFormat.enabledFormats": "iceberg"})
+        if full_name in lakehouse.views:
+            view = lakehouse.views[full_name]
+            return TableInfo(full_name=full_name,
+                             table_type=TableType.VIEW,
+                             view_definition=view.view_definition,
+                             view_dependencies=DependencyList(dependencies=[
+                                 Dependency(table=TableDependency(table_full_name=bt)) for bt in view.base_tables]))
+        raise NotFound(f"Table '{full_name}' does not exist.")
+
+
+class _FakeApiClient:
+    def __init__(self, workspace: "FakeWorkspaceClient"):
+        self.workspace = workspace
+
+    def do(self, method: str, path: str, query: dict = None, body: dict = None, **kwargs) -> dict:
+        self.workspace.log.record("databricks", f"rest.{method.lower()}", path)
+        prefix = "/api/2.1/unity-catalog/tables/"
+        if method == "GET" and path.startswith(prefix):
+            spec = self.workspace.lakehouse.tables.get(path[len(prefix):])
+            if spec is None:
+                raise NotFound(f"Table '{path[len(prefix):]}' does not exist.")
+            response = {"full_name": spec.name, "storage_location": spec.storage_location}
+            if spec.uniform_version is not None:
+                response["delta_uniform_iceberg"] = {
+                    "metadata_location": spec.metadata_location,
+                    "converted_delta_version": spec.uniform_version,
+                    "converted_delta_timestamp": "2024-01-01T00:00:00Z",
+                }
+            return response
+        if method == "GET" and path in ("/api/2.1/unity-catalog/schemas", "/api/2.1/unity-catalog/tables"):
+            return self._list_page(path.rsplit("/", 1)[-1], query or {})
+        raise NotFound(f"No fake handler for {method} {path}")
+
+    def _list_page(self, key: str, query: dict) -> dict:
+        lakehouse = self.workspace.lakehouse
+        names = sorted(list(lakehouse.tables) + list(lakehouse.views))
+        if key == "schemas":
+            items = sorted({".".join(n.split(".")[:2]) for n in names if n.split(".")[0] == query["catalog_name"]})
+            items = [{"name": n.split(".")[1], "full_name": n} for n in items]
+        else:
+            prefix = f"{query['catalog_name']}.{query['schema_name']}."
+            items = [{"full_name": n, "name": n.split(".")[-1]} for n in names if n.startswith(prefix)]
+        start = int(query.get("page_token") or 0)
+        end = start + int(query.get("max_results") or len(items) or 1)
+        response = {key: items[start:end]}
+        if end < len(items):
+            response["next_page_token"] = str(end)
+        return response
+
+
+class _FakeNamespaceAPI:
+    def __init__(self, workspace: "FakeWorkspaceClient", operation: str):
+        self.workspace = workspace
+        self.operation = operation
+        self.created = set()
+
+    def create(self, name: str, catalog_name: str = None, **kwargs):
+        full_name = f"{catalog_name}.{name}" if catalog_name else name
+        self.workspace.log.record("databricks", self.operation, full_name)
+        if full_name in self.created:
+            raise ResourceAlreadyExists(f"{full_name} already exists")
+        self.created.add(full_name)
+
+
+def _answer_databricks_statement(lakehouse: FakeLakehouse, statement: str) -> List[SimpleNamespace]:
+    """Rows of the handful of statements DatabricksCatalog sends, through Spark or a SQL
+    warehouse, and of information_schema.tables reads"""
+    history = re.match(r"\s*DESCRIBE HISTORY (\S+)", statement, re.IGNORECASE)
+    if history:
+        return [SimpleNamespace(version=lakehouse.tables[history.group(1)].delta_version)]
+    repair = re.match(r"\s*MSCK REPAIR TABLE (\S+) SYNC METADATA", statement, re.IGNORECASE)
+    if repair:
+        spec = lakehouse.tables[repair.group(1)]
+        if spec.uniform_version != spec.delta_version:
+            spec.uniform_version = spec.delta_version
+            spec.metadata_version += 1
+            lakehouse._publish(spec)
+    if re.search(r"FROM system\.information_schema\.tables", statement, re.IGNORECASE):
+        schemas = set(re.findall(r"t\.table_catalog = '([^']+)' AND t\.table_schema = '([^']+)'", statement))
+        rows = []
+        for objects, table_type in [(lakehouse.tables, "EXTERNAL"), (lakehouse.views, "VIEW")]:
+            for name, obj in objects.items():
+                catalog_name, schema_name, table_name = name.split(".")
+                if (catalog_name, schema_name) in schemas:
+                    rows.append(SimpleNamespace(table_catalog=catalog_name, table_schema=schema_name,
+                                                table_name=table_name, table_type=table_type,
+                                                view_definition=getattr(obj, "view_definition", None)))
+        return rows
+    return []
+
+
+def _column_type(values) -> dbsql.ColumnInfoTypeName:
+    value = next((v for v in values if v is not None), None)
+    if isinstance(value, bool):
+        return dbsql.ColumnInfoTypeName.BOOLEAN
+    if isinstance(value, int):
+        return dbsql.ColumnInfoTypeName.LONG
+    return dbsql.ColumnInfoTypeName.STRING
+
+
+class _FakeStatementExecutionAPI:
+    """SQL warehouse statement execution. A statement submitted with a zero wait is
+    still RUNNING for the first ``polls`` status checks; otherwise it finishes within
+    the call. Results come back ``chunk_size`` rows at a time. A statement matching
+    ``fail_on`` fails with ``fail_code``, and so does a script of several statements,
+    as the real API only takes one."""
+    def __init__(self, workspace: "FakeWorkspaceClient"):
+        self.workspace = workspace
+        self.statements: List[str] = []
+        self.polls = 1
+        self.chunk_size: Optional[int] = None
+        self.fail_on: Optional[str] = None
+        self.fail_code = dbsql.ServiceErrorCode.BAD_REQUEST
+        self._pending: Dict[str, int] = {}
+        self._responses: Dict[str, dbsql.StatementResponse] = {}
+        self._chunks: Dict[str, List[dbsql.ResultData]] = {}
+
+    def _run(self, statement_id: str, statement: str) -> dbsql.StatementResponse:
+        if len(split_statements(statement)) > 1:
+            return self._failed(statement_id, dbsql.ServiceErrorCode.BAD_REQUEST,
+                                "[PARSE_SYNTAX_ERROR] Only one statement is allowed")
+        if self.fail_on and re.search(self.fail_on, statement, re.IGNORECASE):
+            return self._failed(statement_id, self.fail_code, f"Statement failed: {statement.split()[0]}")
+        rows = _answer_databricks_statement(self.workspace.lakehouse, statement)
+        names = list(vars(rows[0])) if rows else []
+        columns = [dbsql.ColumnInfo(name=n, position=i, type_name=_column_type([vars(r)[n] for r in rows]))
+                   for i, n in enumerate(names)]
+        data = [[None if vars(r)[n] is None else str(vars(r)[n]).lower() if isinstance(vars(r)[n], bool)
+                 else str(vars(r)[n]) for n in names] for r in rows]
+        size = self.chunk_size or max(len(data), 1)
+        chunks = [dbsql.ResultData(chunk_index=i, data_array=data[start:start + size],
+                                   next_chunk_index=i + 1 if start + size < len(data) else None)
+                  for i, start in enumerate(range(0, max(len(data), 1), size))]
+        self._chunks[statement_id] = chunks
+        return dbsql.StatementResponse(
+            statement_id=statement_id, status=dbsql.StatementStatus(state=dbsql.StatementState.SUCCEEDED),
+            manifest=dbsql.ResultManifest(schema=dbsql.ResultSchema(column_count=len(columns), columns=columns),
+                                          total_chunk_count=len(chunks), total_row_count=len(data)),
+            result=chunks[0])
+
+    def _failed(self, statement_id: str, code: dbsql.ServiceErrorCode, message: str) -> dbsql.StatementResponse:
+        return dbsql.StatementResponse(statement_id=statement_id, status=dbsql.StatementStatus(
+            state=dbsql.StatementState.FAILED, error=dbsql.ServiceError(error_code=code, message=message)))
+
+    def execute_statement(self, statement: str, warehouse_id: str, wait_timeout: str = None, **kwargs):
+        self.workspace.log.record("databricks", "statements.execute", statement.split()[0].upper())
+        self.statements.append(statement)
+        statement_id = str(uuid.uuid4())
+        self._responses[statement_id] = self._run(statement_id, statement)
+        if wait_timeout == "0s" and self.polls:
+            self._pending[statement_id] = self.polls
+            return dbsql.StatementResponse(statement_id=statement_id,
+                                           status=dbsql.StatementStatus(state=dbsql.StatementState.PENDING))
+        return self._responses[statement_id]
+
+    def get_statement(self, statement_id: str) -> dbsql.StatementResponse:
+        self.workspace.log.record("databricks", "statements.get", statement_id)
+        remaining = self._pending.get(statement_id, 0)
+        if remaining > 1:
+            self._pending[statement_id] = remaining - 1
+            return dbsql.StatementResponse(statement_id=statement_id,
+                                           status=dbsql.StatementStatus(state=dbsql.StatementState.RUNNING))
+        self._pending.pop(statement_id, None)
+        return self._responses[statement_id]
+
+    def get_statement_result_chunk_n(self, statement_id: str, chunk_index: int) -> dbsql.ResultData:
+        self.workspace.log.record("databricks", "statements.get_chunk", statement_id)
+        return self._chunks[statement_id][chunk_index]
+
+
+class FakeWorkspaceClient:
+    def __init__(self, lakehouse: FakeLakehouse, log: RemoteCallLog):
+        self.lakehouse = lakehouse
+        self.log = log
+        self.tables = _FakeTablesAPI(self)
+        self.api_client = _FakeApiClient(self)
+        self.catalogs = _FakeNamespaceAPI(self, "catalogs.create")
+        self.schemas = _FakeNamespaceAPI(self, "schemas.create")
+        self.statement_execution = _FakeStatementExecutionAPI(self)
+
+
+class FakeSparkSession:
+    """Answers the handful of statements DatabricksCatalog sends through Spark."""
+    version = "15.1.0"
+
+    def __init__(self, lakehouse: FakeLakehouse, log: RemoteCallLog):
+        self.lakehouse = lakehouse
+        self.log = log
+        self.statements: List[str] = []
+
+    def sql(self, statement: str):
+        self.log.record("databricks", "spark.sql", statement.split()[0].upper() if statement.strip() else "")
+        self.statements.append(statement)
+        rows = _answer_databricks_statement(self.lakehouse, statement)
+        return SimpleNamespace(collect=lambda: rows)
+
+
+# Snowflake
+
+_SF_PATTERNS = [
+    ("reference", re.compile(r"SELECT SYSTEM\$REFERENCE\('(\w+)', '([^']+)'\)", re.IGNORECASE)),
+    ("object_dependencies", re.compile(r"WITH RECURSIVE .*?OBJECT_DEPENDENCIES .*?referencing_object_name IN "
+                                       r"\(((?:'(?:[^']|'')*'|[\s,])*)\)",
+                                       re.IGNORECASE | re.DOTALL)),
+    ("get_ddl", re.compile(r"SELECT (GET_DDL\(.*)", re.IGNORECASE)),
+    ("iceberg_info", re.compile(r"SELECT (SYSTEM\$GET_ICEBERG_TABLE_INFORMATION\(.*)", re.IGNORECASE)),
+    ("show_integrations", re.compile(r"SHOW CATALOG INTEGRATIONS", re.IGNORECASE)),
+    ("show_objects", re.compile(r"SHOW (SCHEMAS|ICEBERG TABLES|VIEWS) IN (?:DATABASE|SCHEMA) (\S+) LIMIT (\d+)"
+                                r"(?: FROM '([^']*)')?", re.IGNORECASE)),
+    ("describe_integration", re.compile(r"DESCRIBE CATALOG INTEGRATION (\S+)", re.IGNORECASE)),
+    ("show_volumes", re.compile(r"SHOW EXTERNAL VOLUMES", re.IGNORECASE)),
+    ("describe_volume", re.compile(r"DESCRIBE EXTERNAL VOLUME (\S+)", re.IGNORECASE)),
+    ("create_database", re.compile(r"CREATE DATABASE IF NOT EXISTS (\S+)", re.IGNORECASE)),
+    ("create_schema", re.compile(r"CREATE SCHEMA IF NOT EXISTS (\S+)", re.IGNORECASE)),
+    ("create_table", re.compile(r"CREATE (OR REPLACE )?ICEBERG TABLE (?:IF NOT EXISTS )?(\S+).*?"
+                                r"METADATA_FILE_PATH='([^']+)'", re.IGNORECASE | re.DOTALL)),
+    ("refresh_table", re.compile(r"ALTER ICEBERG TABLE (\S+) REFRESH '([^']+)'", re.IGNORECASE)),
+    ("create_view", re.compile(r"CREATE OR REPLACE VIEW (\S+)\s+COPY GRANTS AS (.*)", re.IGNORECASE | re.DOTALL)),
+]
+
+
+class FakeSnowflakeCursor:
+    def __init__(self, connection: "FakeSnowflakeConnection"):
+        self.connection = connection
+        self._rows: List[dict] = []
+
+        self.sfqid: Optional[str] = None
+
+    def _run(self, sql: str) -> List[dict]:
+        self.connection.statements.append(sql)
+        statement = " ".join(sql.split())
+        for kind, pattern in _SF_PATTERNS:
+            match = pattern.match(statement)
+            if match:
+                return getattr(self.connection, f"_handle_{kind}")(*match.groups())
+        raise ProgrammingError(f"Fake Snowflake cannot handle statement: {statement}")
+
+    def execute(self, sql: str):
+        self.connection.log.record("snowflake", "execute", sql.split()[0].upper() if sql.strip() else "")
+        self._rows = self._run(sql)
+        return self
+
+    def execute_async(self, sql: str) -> dict:
+        """Submit sql and return after a round trip; the query then reports as
+        running for the call latency, without blocking any thread"""
+        self.connection._round_trip()
+        delay = self.connection.log.record("snowflake", "execute", sql.split()[0].upper() if sql.strip() else "",
+                                           wait=False)
+        try:
+            outcome = (self._run(sql), None)
+        except ProgrammingError as e:
+            outcome = (None, e)
+        self.sfqid = self.connection._submit(outcome, delay)
+        return {"queryId": self.sfqid}
+
+    def get_results_from_sfqid(self, sfqid: str):
+        self.connection._round_trip()
+        rows, error = self.connection._result(sfqid)
+        if error:
+            raise error
+        self._rows = rows
+
+    def fetchone(self) -> Optional[dict]:
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self) -> List[dict]:
+        return list(self._rows)
+
+    def fetchmany(self, size: int = 1) -> List[dict]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+
+class FakeSnowflakeConnection:
+    """In-memory Snowflake account with Iceberg tables, views, one external volume
+    over the lakehouse bucket and one object store catalog integration."""
+    def __init__(self, lakehouse: FakeLakehouse, log: RemoteCallLog,
+                 volume_name: str = "bench_volume", integration_name: str = "bench_integration"):
+        self.lakehouse = lakehouse
+        self.log = log
+        self.statements: List[str] = []
+        self.databases = set()
+        self.schemas = set()
+        self.tables: Dict[str, str] = {}
+        self.views: Dict[str, str] = {}
+        # ACCOUNT_USAGE.OBJECT_DEPENDENCIES: view -> [(referenced object, domain)], readable
+        # only while account_usage is set, as with IMPORTED PRIVILEGES on SNOWFLAKE
+        self.dependencies: Dict[str, List[Tuple[str, str]]] = {}
+        self.account_usage = True
+        self.volumes = {volume_name.upper(): f"{lakehouse.bucket}/"}
+        self.integrations = {integration_name.upper(): {"catalog_source": "OBJECT_STORE",
+                                                        "table_format": "ICEBERG",
+                                                        "enabled": "true"}}
+        self._queries: Dict[str, Tuple[float, Tuple[Optional[List[dict]], Optional[Exception]]]] = {}
+
+    def cursor(self, cursor_class=None) -> FakeSnowflakeCursor:
+        return FakeSnowflakeCursor(self)
+
+    def _submit(self, outcome, delay: float) -> str:
+        query_id = str(uuid.uuid4())
+        self._queries[query_id] = (time.monotonic() + delay, outcome)
+        return query_id
+
+    def _result(self, query_id: str):
+        return self._queries.pop(query_id)[1]
+
+    def _round_trip(self):
+        """Submitting, polling and fetching an async query each block for the
+        ``snowflake.round_trip`` latency, which defaults to the call latency"""
+        delay = self.log.delay("snowflake", "round_trip")
+        if delay:
+            time.sleep(delay)
+
+    def get_query_status_throw_if_error(self, query_id: str) -> str:
+        self._round_trip()
+        ready_at, (_, error) = self._queries[query_id]
+        if time.monotonic() < ready_at:
+            return "RUNNING"
+        if error:
+            raise error
+        return "SUCCESS"
+
+    def is_still_running(self, status: str) -> bool:
+        return status == "RUNNING"
+
+    def mirror(self, lakehouse: FakeLakehouse = None):
+        """Expose every lakehouse table and view as a Snowflake object, for
+        scenarios where Snowflake is the source catalog."""
+        lakehouse = lakehouse or self.lakehouse
+        for name, spec in lakehouse.tables.items():
+            if spec.uniform_version is not None:
+                self.tables[name.upper()] = spec.metadata_location
+        for name, view in lakehouse.views.items():
+            self.views[name.upper()] = f"create or replace view {name} as {view.view_definition}"
+            self.dependencies[name.upper()] = [(bt.upper(), "VIEW" if bt in lakehouse.views else "TABLE")
+                                               for bt in view.base_tables]
+
+    def _handle_reference(self, kind: str, name: str):
+        objects = self.views if kind.upper() == "VIEW" else self.tables
+        if name.upper() not in objects:
+            raise ProgrammingError(f"Object '{name}' does not exist or not authorized.")
+        return [{"REFERENCE": f"ENT_REF_{kind.upper()}_{name.upper()}"}]
+
+    def _handle_get_ddl(self, columns: str):
+        row = {}
+        for name, alias in re.findall(r"GET_DDL\('VIEW',\s*'((?:[^']|'')+)',\s*true\)\s+as\s+(\w+)", columns, re.IGNORECASE):
+            name = name.replace("''", "'")
+            if name.upper() not in self.views:
+                raise ProgrammingError(f"Object '{name}' does not exist or not authorized.")
+            row[alias.upper()] = self.views[name.upper()]
+        return [row]
+
+    def _handle_object_dependencies(self, roots: str):
+        if not self.account_usage:
+            raise ProgrammingError("Schema 'SNOWFLAKE.ACCOUNT_USAGE' does not exist or not authorized.")
+        pending = [name.replace("''", "'") for name in re.findall(r"'((?:[^']|'')*)'", roots)]
+        rows, seen = [], set()
+        while pending:
+            view = pending.pop()
+            if view in seen:
+                continue
+            seen.add(view)
+            for referenced, domain in self.dependencies.get(view, []):
+                rows.append({"REFERENCING": view, "REFERENCED": referenced, "REFERENCED_DOMAIN": domain})
+                if domain == "VIEW":
+                    pending.append(referenced)
+        return rows
+
+    def _handle_iceberg_info(self, columns: str):
+        row = {}
+        for name, alias in re.findall(r"SYSTEM\$GET_ICEBERG_TABLE_INFORMATION\('((?:[^']|'')+)'\)\s+as\s+(\w+)",
+                                      columns, re.IGNORECASE):
+            name = name.replace("''", "'")
+            if name.upper() not in self.tables:
+                raise ProgrammingError(f"Table '{name}' does not exist or not authorized.")
+            row[alias.upper()] = json.dumps({"status": "success", "metadataLocation": self.tables[name.upper()]})
+        return [row]
+
+    def _handle_show_objects(self, kind: str, scope: str, limit: str, start: Optional[str]):
+        scope = scope.upper()
+        rows = {}
+        objects = self.tables if kind.upper() == "ICEBERG TABLES" else self.views
+        for name in (list(self.tables) + list(self.views) if kind.upper() == "SCHEMAS" else objects):
+            database_name, schema_name, table_name = name.split(".")
+            if kind.upper() == "SCHEMAS" and database_name == scope:
+                rows[schema_name] = {"name": schema_name, "database_name": database_name}
+            elif f"{database_name}.{schema_name}" == scope:
+                rows[table_name] = {"name": table_name, "database_name": database_name, "schema_name": schema_name}
+        # Like Snowflake, FROM includes the name it starts from
+        return [rows[n] for n in sorted(rows) if start is None or n >= start][:int(limit)]
+
+    def _handle_show_integrations(self):
+        return [{"name": name} for name in self.integrations]
+
+    def _handle_describe_integration(self, name: str):
+        if name.upper() not in self.integrations:
+            raise ProgrammingError(f"Integration '{name}' does not exist or not authorized.")
+        return [{"property": k.upper(), "property_value": v} for k, v in self.integrations[name.upper()].items()]
+
+    def _handle_show_volumes(self):
+        return [{"name": name} for name in self.volumes]
+
+    def _handle_describe_volume(self, name: str):
+        if name.upper() not in self.volumes:
+            raise ProgrammingError(f"External volume '{name}' does not exist or not authorized.")
+        location = {"NAME": name, "STORAGE_PROVIDER": "S3", "STORAGE_BASE_URL": self.volumes[name.upper()]}
+        return [{"property": "ACTIVE", "property_value": ""},
+                {"property": "STORAGE_LOCATION_1", "property_value": json.dumps(location)}]
+
+    def _handle_create_database(self, name: str):
+        self.databases.add(name.upper())
+        return [{"status": f"{name} already exists, statement succeeded."}]
+
+    def _handle_create_schema(self, name: str):
+        self.schemas.add(name.upper())
+        return [{"status": f"{name} already exists, statement succeeded."}]
+
+    def _volume_path(self, relative_path: str) -> str:
+        return next(iter(self.volumes.values())) + relative_path
+
+    def _handle_create_table(self, replace: Optional[str], name: str, metadata_file_path: str):
+        if name.upper() in self.tables and not replace:
+            return [{"status": f"{name} already exists, statement succeeded."}]
+        path = self._volume_path(metadata_file_path)
+        if path not in self.lakehouse.metadata_files:
+            raise ProgrammingError(f"Metadata file '{path}' does not exist.")
+        self.tables[name.upper()] = path
+        return [{"status": f"Table {name.upper()} successfully created."}]
+
+    def _handle_refresh_table(self, name: str, metadata_file_path: str):
+        if name.upper() not in self.tables:
+            raise ProgrammingError(f"Table '{name}' does not exist or not authorized.")
+        path = self._volume_path(metadata_file_path)
+        if path not in self.lakehouse.metadata_files:
+            raise ProgrammingError(f"Metadata file '{path}' does not exist.")
+        current_uuid = self.lakehouse.metadata_uuid(self.tables[name.upper()])
+        if current_uuid != self.lakehouse.metadata_uuid(path):
+            raise ProgrammingError(f"Table uuid {current_uuid} does not match the table uuid in metadata file {path}")
+        self.tables[name.upper()] = path
+        return [{"status": "Statement executed successfully."}]
+
+    def _handle_create_view(self, name: str, definition: str):
+        self.views[name.upper()] = f"create or replace view {name} as {definition}"
+        return [{"status": f"View {name.upper()} successfully created."}]
+
+
+# Glue
+
+class FakePyIcebergTable:
+    def __init__(self, identifier: Tuple[str, str], metadata, metadata_location: str):
+        self._identifier = identifier
+        self.metadata = metadata
+        self._location = metadata.location
+        self.metadata_location = metadata_location
+
+    def name(self) -> Tuple[str, str]:
+        return self._identifier
+
+    def location(self) -> str:
+        return self._location
+
+
+class FakeGlueCatalog:
+    """Stand-in for ``pyiceberg.catalog.glue.GlueCatalog`` covering the calls
+    GlueCatalog makes. Loading a table parses its metadata file like pyiceberg does."""
+    def __init__(self, lakehouse: FakeLakehouse, log: RemoteCallLog):
+        self.lakehouse = lakehouse
+        self.log = log
+        self.databases = set()
+        self.tables: Dict[Tuple[str, str], dict] = {}
+
+    def _identifier(self, identifier) -> Tuple[str, str]:
+        parts = tuple(identifier.split(".")) if isinstance(identifier, str) else tuple(identifier)
+        return parts[-2], parts[-1]
+
+    def create_namespace(self, namespace, properties=None):
+        self.log.record("glue", "create_database", str(namespace))
+        if namespace in self.databases:
+            raise exceptions.NamespaceAlreadyExistsError(f"Database {namespace} already exists")
+        self.databases.add(namespace)
+
+    def list_tables(self, namespace) -> List[Tuple[str, str]]:
+        self.log.record("glue", "get_tables", str(namespace))
+        return [key for key in self.tables if key[0] == namespace]
+
+    def _get_glue_table(self, database_name: str, table_name: str) -> dict:
+        self.log.record("glue", "get_table", f"{database_name}.{table_name}")
+        if (database_name, table_name) not in self.tables:
+            raise exceptions.NoSuchTableError(f"Table does not exist: {database_name}.{table_name}")
+        return json.loads(json.dumps(self.tables[(database_name, table_name)]))
+
+    def _update_glue_table(self, database_name: str, table_name: str, table_input: dict, version_id: str):
+        self.log.record("glue", "update_table", f"{database_name}.{table_name}")
+        current = self.tables[(database_name, table_name)]
+        if current["VersionId"] != version_id:
+            raise exceptions.CommitFailedException(f"Cannot commit {database_name}.{table_name} because Glue detected concurrent update")
+        self.tables[(database_name, table_name)] = {"Name": table_name,
+                                                    "VersionId": str(int(version_id) + 1),
+                                                    "Parameters": dict(table_input["Parameters"]),
+                                                    "StorageDescriptor": table_input["StorageDescriptor"]}
+
+    def _load_file_io(self, properties=None, location: str = None) -> FakeFileIO:
+        return FakeFileIO(self.lakehouse, self.log)
+
+    def load_table(self, identifier) -> FakePyIcebergTable:
+        database_name, table_name = self._identifier(identifier)
+        glue_table = self._get_glue_table(database_name, table_name)
+        metadata_location = glue_table["Parameters"]["metadata_location"]
+        metadata = FromInputFile.table_metadata(self._load_file_io().new_input(metadata_location))
+        return FakePyIcebergTable((database_name, table_name), metadata, metadata_location)
+
+    def register_table(self, identifier, metadata_location: str) -> FakePyIcebergTable:
+        database_name, table_name = self._identifier(identifier)
+        self.log.record("glue", "create_table", f"{database_name}.{table_name}")
+        if (database_name, table_name) in self.tables:
+            raise exceptions.TableAlreadyExistsError(f"Table {database_name}.{table_name} already exists")
+        metadata = FromInputFile.table_metadata(self._load_file_io().new_input(metadata_location))
+        self.tables[(database_name, table_name)] = {"Name": table_name, "VersionId": "1",
+                                                    "Parameters": {"table_type": "ICEBERG",
+                                                                   "metadata_location": metadata_location},
+                                                    "StorageDescriptor": {"Location": metadata.location}}
+        return FakePyIcebergTable((database_name, table_name), metadata, metadata_location)
+
+
+class FakeProvider:
+    """Carries the attributes the catalog classes read from their provider."""
+    def __init__(self, provider_config: ProviderConfig, client=None, spark=None):
+        self.provider_config = provider_config
+        self.client = client
+        self.spark = spark
+        self.boto_session = None
+
+
+class FakeEnvironment:
+    """One lakehouse with Databricks, Snowflake and Glue stand-ins wired to it.
+
+    ``bricksync()`` returns a BrickSync instance whose ``databricks``,
+    ``snowflake`` and ``glue`` providers are real catalog classes backed by the fakes.
+    """
+    def __init__(self, lakehouse: FakeLakehouse = None, latency: float = 0.0,
+                 latencies: Dict[str, float] = None):
+        self.lakehouse = lakehouse if lakehouse is not None else FakeLakehouse()
+        self.log = RemoteCallLog(latency, latencies)
+        self.workspace = FakeWorkspaceClient(self.lakehouse, self.log)
+        self.spark = FakeSparkSession(self.lakehouse, self.log)
+        self.snowflake = FakeSnowflakeConnection(self.lakehouse, self.log)
+        self.glue = FakeGlueCatalog(self.lakehouse, self.log)
+        self.delta_log = FakeDeltaLogFileSystem(self.lakehouse, self.log)
+
+    def databricks_catalog(self, read_delta_log: bool = False, converter: DeltaIcebergConverter = None,
+                           warehouse: bool = False) -> DatabricksCatalog:
+        """With read_delta_log, Delta versions are read from the fake _delta_log
+        instead of with DESCRIBE HISTORY. With a converter, tables that are not
+        UniForm are converted by it. With warehouse, statements run on a fake SQL
+        warehouse and the catalog has no Spark session."""
+        sql_warehouse = SqlWarehouse(self.workspace, "fake-warehouse") if warehouse else None
+        if sql_warehouse is not None:
+            sql_warehouse.poll_interval = 0
+        return DatabricksCatalog(FakeProvider(ProviderConfig(ProviderType.DATABRICKS), client=self.workspace,
+                                              spark=None if warehouse else self.spark),
+                                 delta_log=DeltaLogReader(self.delta_log) if read_delta_log else None,
+                                 converter=converter, warehouse=sql_warehouse)
+
+    def snowflake_catalog(self) -> SnowflakeCatalog:
+        return SnowflakeCatalog(FakeProvider(ProviderConfig(ProviderType.SNOWFLAKE), client=self.snowflake))
+
+    def glue_catalog(self) -> GlueCatalog:
+        return GlueCatalog(FakeProvider(ProviderConfig(ProviderType.GLUE)), client=self.glue)
+
+    def bricksync(self) -> BrickSync:
+        bs = BrickSync.new()
+        for name, catalog in [("databricks", self.databricks_catalog()),
+                              ("snowflake", self.snowflake_catalog()),
+                              ("glue", self.glue_catalog())]:
+            bs._register_provider(name, catalog)
+        return bs
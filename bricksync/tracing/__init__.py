@@ -0,0 +1,255 @@
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+from enum import Enum
+import logging, threading, time, re
+
+
+class SpanOutcome(Enum):
+    OK = "ok"
+    ERROR = "error"
+
+
+@dataclass
+class Span:
+    """A single remote call made by a catalog provider"""
+    provider: str
+    operation: str
+    target: Optional[str]
+    start_time: float
+    latency: float
+    outcome: SpanOutcome
+    error: Optional[str] = None
+
+
+@dataclass
+class OperationCounter:
+    calls: int = 0
+    errors: int = 0
+    latency: float = 0.0
+    max_latency: float = 0.0
+
+    def add(self, span: Span):
+        self.calls += 1
+        self.errors += span.outcome == SpanOutcome.ERROR
+        self.latency += span.latency
+        self.max_latency = max(self.max_latency, span.latency)
+
+
+@dataclass
+class CallCounters:
+    """Remote call counters aggregated per (provider, operation)"""
+    operations: Dict[Tuple[str, str], OperationCounter] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            key = (span.provider, span.operation)
+            if key not in self.operations:
+                self.operations[key] = OperationCounter()
+            self.operations[key].add(span)
+
+    def merge(self, other: "CallCounters"):
+        for (provider, operation), counter in other.operations.items():
+            with self._lock:
+                current = self.operations.setdefault((provider, operation), OperationCounter())
+                current.calls += counter.calls
+                current.errors += counter.errors
+                current.latency += counter.latency
+                current.max_latency = max(current.max_latency, counter.max_latency)
+
+    @property
+    def calls(self) -> int:
+        return sum(c.calls for c in self.operations.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(c.errors for c in self.operations.values())
+
+    @property
+    def latency(self) -> float:
+        return sum(c.latency for c in self.operations.values())
+
+    def calls_for(self, provider: str = None, operation: str = None) -> int:
+        return sum(c.calls for (p, o), c in self.operations.items()
+                   if (provider is None or p == provider) and (operation is None or o == operation))
+
+    def by_provider(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for (provider, _), counter in self.operations.items():
+            totals[provider] = totals.get(provider, 0) + counter.calls
+        return totals
+
+    def hottest(self, n: int = 5) -> List[Tuple[Tuple[str, str], OperationCounter]]:
+        return sorted(self.operations.items(), key=lambda kv: kv[1].latency, reverse=True)[:n]
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {f"{p}.{o}": {"calls": c.calls, "errors": c.errors,
+                             "latency": round(c.latency, 6), "max_latency": round(c.max_latency, 6)}
+                for (p, o), c in sorted(self.operations.items())}
+
+
+class TraceSink():
+    def on_span(self, span: Span):
+        pass
+
+    def on_counters(self, counters: CallCounters, label: str = None):
+        pass
+
+
+class CallbackSink(TraceSink):
+    """Forwards spans and per-sync counters to plain callables"""
+    def __init__(self, on_span: Callable[[Span], None] = None,
+                 on_counters: Callable[[CallCounters, Optional[str]], None] = None):
+        self._on_span = on_span
+        self._on_counters = on_counters
+
+    def on_span(self, span: Span):
+        if self._on_span:
+            self._on_span(span)
+
+    def on_counters(self, counters: CallCounters, label: str = None):
+        if self._on_counters:
+            self._on_counters(counters, label)
+
+
+class LoggingSink(TraceSink):
+    """Logs every span at ``span_level`` and the per-sync counters at ``counters_level``"""
+    def __init__(self, logger: logging.Logger = None,
+                 span_level: int = logging.DEBUG, counters_level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("bricksync.tracing")
+        self.span_level = span_level
+        self.counters_level = counters_level
+
+    def on_span(self, span: Span):
+        self.logger.log(self.span_level,
+                        f"{span.provider} {span.operation} {span.target or ''} "
+                        f"{span.outcome.value} in {span.latency * 1000:.1f}ms"
+                        + (f": {span.error}" if span.error else ""))
+
+    def on_counters(self, counters: CallCounters, label: str = None):
+        self.logger.log(self.counters_level,
+                        f"{label or 'sync'}: {counters.calls} remote calls, {counters.errors} errors, "
+                        f"{counters.latency:.3f}s in remote calls {counters.to_dict()}")
+
+
+class OpenTelemetrySink(TraceSink):
+    """Exports spans and call metrics through the OpenTelemetry API. Requires the
+    ``opentelemetry-api`` package; exporters are configured through the usual
+    OpenTelemetry SDK setup."""
+    def __init__(self, tracer_provider=None, meter_provider=None):
+        try:
+            from opentelemetry import trace, metrics
+        except ImportError:
+            raise ImportError("OpenTelemetrySink requires the opentelemetry-api package")
+        self._trace = trace
+        self.tracer = trace.get_tracer("bricksync", tracer_provider=tracer_provider)
+        meter = metrics.get_meter("bricksync", meter_provider=meter_provider)
+        self.calls = meter.create_counter("bricksync.remote_calls", unit="1",
+                                          description="Remote calls made by catalog providers")
+        self.latency = meter.create_histogram("bricksync.remote_call.duration", unit="s",
+                                              description="Latency of remote calls made by catalog providers")
+
+    def on_span(self, span: Span):
+        attributes = {"bricksync.provider": span.provider,
+                      "bricksync.operation": span.operation,
+                      "bricksync.outcome": span.outcome.value}
+        if span.target:
+            attributes["bricksync.target"] = span.target
+        start_ns = int(span.start_time * 1e9)
+        otel_span = self.tracer.start_span(f"{span.provider} {span.operation}",
+                                           start_time=start_ns, attributes=attributes)
+        if span.error:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=start_ns + int(span.latency * 1e9))
+        metric_attributes = {k: v for k, v in attributes.items() if k != "bricksync.target"}
+        self.calls.add(1, metric_attributes)
+        self.latency.record(span.latency, metric_attributes)
+
+
+_collectors: ContextVar[Tuple[CallCounters, ...]] = ContextVar("bricksync_trace_collectors", default=())
+
+_STATEMENT_KEYWORDS = {"CREATE", "OR", "REPLACE", "ALTER", "DROP", "ICEBERG", "EXTERNAL", "TABLE", "TABLES",
+                       "VIEW", "VIEWS", "DATABASE", "SCHEMA", "SHOW", "DESCRIBE", "VOLUME", "VOLUMES",
+                       "CATALOG", "INTEGRATION", "INTEGRATIONS", "MSCK", "REPAIR", "REFRESH", "HISTORY",
+                       "DETAIL", "INSERT", "INTO", "USE", "GRANT", "WITH", "RECURSIVE", "SCHEMAS"}
+
+
+def statement_operation(statement: str) -> str:
+    """Short, low-cardinality operation name for a SQL statement, e.g.
+    ``ALTER ICEBERG TABLE`` or ``SELECT SYSTEM$GET_ICEBERG_TABLE_INFORMATION``"""
+    select = re.match(r"\s*SELECT\s+([\w$]+)\s*\(", statement, re.IGNORECASE)
+    if select:
+        return f"SELECT {select.group(1).upper()}"
+    words = []
+    for token in statement.split():
+        if token.upper() not in _STATEMENT_KEYWORDS:
+            break
+        words.append(token.upper())
+    return " ".join(words) if words else (statement.split()[0].upper() if statement.strip() else "")
+
+
+class Tracer():
+    """Records a span for every remote call and fans it out to the registered sinks
+    and to every counter collection active in the current context"""
+    def __init__(self, sinks: List[TraceSink] = None):
+        self.sinks: List[TraceSink] = list(sinks or [])
+
+    def add_sink(self, sink: TraceSink):
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink: TraceSink):
+        self.sinks.remove(sink)
+
+    def record(self, span: Span):
+        for counters in _collectors.get():
+            counters.add(span)
+        for sink in self.sinks:
+            try:
+                sink.on_span(span)
+            except Exception as e:
+                logging.warning(f"Trace sink {type(sink).__name__} failed: {e}")
+
+    @contextmanager
+    def span(self, provider: str, operation: str, target: str = None):
+        start_time = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.record(Span(provider, operation, target, start_time, time.perf_counter() - start,
+                             SpanOutcome.ERROR, f"{type(e).__name__}: {e}"))
+            raise
+        self.record(Span(provider, operation, target, start_time, time.perf_counter() - start, SpanOutcome.OK))
+
+    def call(self, provider: str, operation: str, target: Optional[str], fn: Callable, *args, **kwargs):
+        with self.span(provider, operation, target):
+            return fn(*args, **kwargs)
+
+    @contextmanager
+    def collect(self):
+        """Aggregate the spans recorded in this context (and in any context copied
+        from it) into a fresh CallCounters"""
+        counters = CallCounters()
+        token = _collectors.set(_collectors.get() + (counters,))
+        try:
+            yield counters
+        finally:
+            _collectors.reset(token)
+
+    def export(self, counters: CallCounters, label: str = None):
+        for sink in self.sinks:
+            try:
+                sink.on_counters(counters, label)
+            except Exception as e:
+                logging.warning(f"Trace sink {type(sink).__name__} failed: {e}")
+
+
+_default_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _default_tracer
@@ -0,0 +1,202 @@
+from bricksync.config import SyncConfig
+from bricksync.sqlite import SQLiteDatabase
+from bricksync.exceptions import LeaseLostError
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+import threading, time, os, socket, uuid, logging
+
+if TYPE_CHECKING:
+    from bricksync import BrickSync, SyncRunResult
+
+_SCHEMA = """CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_provider TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target_provider TEXT NOT NULL,
+    state TEXT NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    UNIQUE (source_provider, source, target_provider))"""
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+
+@dataclass
+class SyncTask:
+    task_id: int
+    source_provider: str
+    source: str
+    target_provider: str
+    attempts: int
+
+    def to_sync_config(self) -> SyncConfig:
+        return SyncConfig(self.source, self.source_provider, self.target_provider)
+
+
+class WorkQueue():
+    """Queue of table-sync tasks kept in a SQLite file, shared by every worker process
+    pointing at the same path, e.g. on a shared volume.
+
+    A worker claims a task by taking a lease on it for ``lease_seconds`` and keeps the
+    lease alive with heartbeats while it syncs. A lease that is not renewed expires and
+    the task is handed to the next worker that claims. There is one task per source and
+    target provider, and it is leased to one worker at a time. A worker renews its lease
+    right before each write to the target and stops the sync if the lease is gone, so
+    as long as a single write takes less than ``lease_seconds``, no table is synced
+    twice at once. A task that fails or loses its lease ``max_attempts`` times is
+    marked failed."""
+    def __init__(self, path: str, lease_seconds: float = 60.0, max_attempts: int = 3,
+                 timeout: float = 30.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.clock = clock
+        self._db = SQLiteDatabase(path, timeout)
+        with self._db.transaction() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_expires)")
+
+    def enqueue(self, syncs: List[SyncConfig], requeue: bool = False) -> int:
+        """Add a task for each sync that has none yet. With requeue, finished and failed
+        tasks for syncs are made pending again, e.g. to start a new sweep. Returns the
+        number of tasks that became pending."""
+        added = 0
+        with self._db.transaction() as conn:
+            for sync in syncs:
+                key = (sync.source_provider, sync.source, sync.target_provider)
+                cursor = conn.execute("INSERT OR IGNORE INTO tasks (source_provider, source, target_provider, state) "
+                                      "VALUES (?, ?, ?, ?)", key + (PENDING,))
+                if not cursor.rowcount and requeue:
+                    cursor = conn.execute("UPDATE tasks SET state = ?, worker = NULL, lease_expires = NULL, "
+                                          "attempts = 0, last_error = NULL WHERE source_provider = ? AND source = ? "
+                                          "AND target_provider = ? AND state IN (?, ?)", (PENDING,) + key + (DONE, FAILED))
+                added += cursor.rowcount
+        return added
+
+    def claim(self, worker: str, limit: int = 1) -> List[SyncTask]:
+        """Lease up to limit pending tasks, or tasks whose lease has expired, to worker"""
+        now = self.clock()
+        with self._db.transaction() as conn:
+            # Expired leases that used up their attempts are not handed out again
+            conn.execute("UPDATE tasks SET state = ?, worker = NULL, last_error = ? "
+                         "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                         (FAILED, "Lease expired", LEASED, now, self.max_attempts))
+            rows = conn.execute("SELECT task_id, source_provider, source, target_provider, attempts FROM tasks "
+                                "WHERE state = ? OR (state = ? AND lease_expires < ?) ORDER BY task_id LIMIT ?",
+                                (PENDING, LEASED, now, limit)).fetchall()
+            tasks = [SyncTask(task_id, source_provider, source, target_provider, attempts + 1)
+                     for task_id, source_provider, source, target_provider, attempts in rows]
+            conn.executemany("UPDATE tasks SET state = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                             "WHERE task_id = ?",
+                             [(LEASED, worker, now + self.lease_seconds, t.task_id) for t in tasks])
+        return tasks
+
+    def heartbeat(self, task: SyncTask, worker: str) -> bool:
+        """Extend worker's lease on task. False if the lease was lost to another worker."""
+        with self._db.transaction() as conn:
+            cursor = conn.execute("UPDATE tasks SET lease_expires = ? WHERE task_id = ? AND state = ? AND worker = ?",
+                                  (self.clock() + self.lease_seconds, task.task_id, LEASED, worker))
+            return cursor.rowcount == 1
+
+    def complete(self, task: SyncTask, worker: str, error: Optional[Exception] = None) -> bool:
+        """Record the outcome of worker's attempt at task. A failed attempt makes the task
+        pending again until it runs out of attempts. False if the lease was lost."""
+        if error is None:
+            state = DONE
+        else:
+            state = FAILED if task.attempts >= self.max_attempts else PENDING
+        with self._db.transaction() as conn:
+            cursor = conn.execute("UPDATE tasks SET state = ?, worker = NULL, lease_expires = NULL, last_error = ? "
+                                  "WHERE task_id = ? AND state = ? AND worker = ?",
+                                  (state, str(error) if error else None, task.task_id, LEASED, worker))
+            return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks in each state"""
+        rows = self._db.connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()
+        return {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def failures(self) -> Dict[str, str]:
+        """Last error of each failed task, keyed by source_provider:source -> target_provider"""
+        rows = self._db.connection.execute("SELECT source_provider, source, target_provider, last_error FROM tasks "
+                                           "WHERE state = ?", (FAILED,)).fetchall()
+        return {f"{sp}:{s} -> {tp}": e for sp, s, tp, e in rows}
+
+    def close(self):
+        self._db.close()
+
+
+class _Heartbeat():
+    """Renews a task's lease from a background thread while the task is being synced"""
+    def __init__(self, queue: WorkQueue, task: SyncTask, worker: str, interval: float):
+        self.queue = queue
+        self.task = task
+        self.worker = worker
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.task, self.worker):
+                    logging.warning(f"Lease on {self.task.source} -> {self.task.target_provider} was lost")
+                    self.lost = True
+                    return
+            except Exception as e:
+                logging.warning(f"Heartbeat for {self.task.source} failed: {e}")
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+class SyncWorker():
+    """Claims table-sync tasks from a WorkQueue and runs them with a BrickSync instance.
+    Any number of workers, in threads, processes or on other hosts, can drain the same
+    queue."""
+    def __init__(self, bricksync: "BrickSync", queue: WorkQueue, worker_id: str = None,
+                 heartbeat_interval: float = None, poll_interval: float = 1.0):
+        self.bricksync = bricksync
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.heartbeat_interval = heartbeat_interval or queue.lease_seconds / 3
+        self.poll_interval = poll_interval
+
+    def _renew_lease(self, task: SyncTask, heartbeat: _Heartbeat):
+        """Fence a write to the target: it only goes ahead under a freshly renewed lease"""
+        if heartbeat.lost or not self.queue.heartbeat(task, self.worker_id):
+            heartbeat.lost = True
+            raise LeaseLostError(f"Lease on {task.source} -> {task.target_provider} was lost, "
+                                 f"stopping before writing to the target")
+
+    def run(self, max_tasks: int = None) -> List["SyncRunResult"]:
+        """Sync claimed tasks until max_tasks have been handled or the queue is drained,
+        i.e. nothing is pending and no other worker holds a lease that could expire"""
+        results = []
+        while max_tasks is None or len(results) < max_tasks:
+            tasks = self.queue.claim(self.worker_id)
+            if not tasks:
+                if not self.queue.counts()[LEASED]:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            task = tasks[0]
+            with _Heartbeat(self.queue, task, self.worker_id, self.heartbeat_interval) as heartbeat:
+                result = self.bricksync.run_sync(task.to_sync_config(),
+                                                 before_write=lambda: self._renew_lease(task, heartbeat))
+            # Once the lease is lost the task belongs to whichever worker claimed it next
+            if heartbeat.lost or not self.queue.complete(task, self.worker_id, result.error):
+                logging.warning(f"Lease on {task.source} -> {task.target_provider} was lost, abandoning the attempt")
+                result.abandoned = True
+            results.append(result)
+        return results
@@ -0,0 +1,86 @@
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+from bricksync.provider.catalog import AsyncCatalogProvider
+from bricksync.provider.catalog.snowflake import AsyncSnowflakeCatalog
+from unittest.mock import MagicMock
+import asyncio, threading, time
+
+TABLE = "bench.schema_0.table_0"
+
+
+def test_to_async_picks_native_snowflake_implementation():
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    bs = env.bricksync()
+    assert isinstance(bs.get_async_provider("snowflake"), AsyncSnowflakeCatalog)
+    assert type(bs.get_async_provider("glue")) is AsyncCatalogProvider
+    assert bs.get_async_provider("glue") is bs.get_async_provider("glue")
+    bs.close()
+
+def test_sync_async_creates_then_refreshes():
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    asyncio.run(bs.sync_async("databricks", TABLE, "snowflake", TABLE))
+    assert env.snowflake.tables[TABLE.upper()] == lakehouse.tables[TABLE].metadata_location
+    lakehouse.overwrite(TABLE)
+    asyncio.run(bs.sync_async("databricks", TABLE, "snowflake", TABLE))
+    assert env.snowflake.tables[TABLE.upper()] == lakehouse.tables[TABLE].metadata_location
+    assert any("CREATE OR REPLACE ICEBERG TABLE" in s for s in env.snowflake.statements)
+    bs.close()
+
+def test_async_snowflake_get_table_matches_blocking():
+    lakehouse = FakeLakehouse.generate(tables=0)
+    root = lakehouse.add_view_graph("bench.views.v", depth=2, width=2)
+    env = FakeEnvironment(lakehouse)
+    env.snowflake.mirror()
+    catalog = env.snowflake_catalog()
+    expected = catalog.get_table(root)
+    view = asyncio.run(catalog.to_async().get_table(root))
+    assert view.view_definition == expected.view_definition
+    assert [t.name for t in view.base_tables] == [t.name for t in expected.base_tables]
+
+def test_sync_many_async_keeps_statements_in_flight_without_threads():
+    lakehouse = FakeLakehouse.generate(tables=200, schemas=4)
+    # Each submit, status check and fetch blocks for a 2ms round trip
+    env = FakeEnvironment(lakehouse, latencies={"snowflake": 0.05, "snowflake.round_trip": 0.002})
+    bs = env.bricksync()
+    threads_before = threading.active_count()
+    start = time.perf_counter()
+    results = asyncio.run(bs.sync_many_async("databricks", list(lakehouse.tables), "snowflake"))
+    elapsed = time.perf_counter() - start
+    assert all(r.succeeded for r in results.values())
+    assert len(env.snowflake.tables) == 200
+    # Hundreds of 50ms statements overlap on one loop...
+    assert elapsed < 0.05 * env.log.by_provider()["snowflake"] / 10
+    # ...while only the two bounded provider pools add threads
+    assert threading.active_count() - threads_before <= 16
+    bs.close()
+
+def test_sync_async_writes_shared_view_objects_once():
+    lakehouse = FakeLakehouse.generate(tables=0)
+    root = lakehouse.add_view_graph("bench.views.g", depth=2, width=2)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    result = asyncio.run(bs.sync_async("databricks", root, "snowflake", root))
+    assert len(result.objects) == len({o.name for o in result.objects}) == 7
+    assert sum(s.startswith("CREATE OR REPLACE VIEW") for s in env.snowflake.statements) == 5
+    bs.close()
+
+def test_sync_all_async_isolates_target_failures():
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    bs = env.bricksync()
+    bs.get_provider("glue").create_or_refresh_external_table = MagicMock(side_effect=RuntimeError("down"))
+    results = asyncio.run(bs.sync_all_async("databricks", TABLE, ["snowflake", "glue"], TABLE))
+    assert results["snowflake"].succeeded
+    assert str(results["glue"].error) == "down"
+    bs.close()
+
+def test_ensure_namespace_runs_once_for_concurrent_callers():
+    env = FakeEnvironment()
+    provider = env.snowflake_catalog().to_async()
+
+    async def ensure_many():
+        await asyncio.gather(*[provider.ensure_namespace("bench", "schema_0") for _ in range(50)])
+
+    asyncio.run(ensure_many())
+    assert sum("CREATE DATABASE" in s for s in env.snowflake.statements) == 1
+    assert sum("CREATE SCHEMA" in s for s in env.snowflake.statements) == 1
@@ -0,0 +1,46 @@
+from benchmarks.sync_benchmark import BenchmarkSettings, SCENARIOS, run, format_results
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+import pytest
+
+
+@pytest.fixture
+def settings():
+    return BenchmarkSettings(tables=20, schemas=2, bulk=5, view_depth=2, view_width=2,
+                             snapshots=2, track_memory=False)
+
+def test_all_scenarios_run(settings):
+    results = run(settings)
+    assert [r.scenario for r in results] == list(SCENARIOS)
+    for result in results:
+        assert result.objects >= 1
+        assert result.remote_calls > 0
+        assert result.calls_per_object > 0
+    assert "bulk-glue" in format_results(results)
+
+def test_bulk_counts_every_table(settings):
+    result = run(settings, ["bulk-snowflake"])[0]
+    assert result.objects == 5
+    assert result.calls_by_provider["databricks"] == 10
+
+def test_view_graph_shares_nodes():
+    lakehouse = FakeLakehouse()
+    root = lakehouse.add_view_graph("c.s.g", depth=3, width=2)
+    assert len(lakehouse.views) == 7
+    assert len(lakehouse.tables) == 2
+    assert lakehouse.views[root].base_tables == ["c.s.g_v3_0", "c.s.g_v3_1"]
+
+def test_fake_snowflake_detects_overwrite():
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    name = "bench.schema_0.table_0"
+    bs.sync("databricks", name, "snowflake", name)
+    lakehouse.overwrite(name)
+    bs.sync("databricks", name, "snowflake", name)
+    assert env.snowflake.tables[name.upper()] == lakehouse.tables[name].metadata_location
+    assert any("CREATE OR REPLACE ICEBERG TABLE" in s for s in env.snowflake.statements)
+
+def test_latency_is_injected():
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1), latency=0.01)
+    env.databricks_catalog().get_table("bench.schema_0.table_0")
+    assert env.log.total == 2
@@ -1,11 +1,12 @@
 from bricksync import BrickSync
 from bricksync.config import BrickSyncConfig, ProviderType, ProviderConfig
-import tempfile, pytest
+import tempfile, pytest, time
 from unittest.mock import MagicMock, create_autospec, patch
 from bricksync.provider.databricks import DatabricksProvider
 from bricksync.provider.catalog.databricks import DatabricksCatalog
 from bricksync.provider.catalog.snowflake import SnowflakeCatalog
 from bricksync.provider.catalog import Table, CatalogProvider
+from bricksync.exceptions import SyncRunError
 from databricks.connect import DatabricksSession
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.credentials_provider import credentials_strategy
@@ -121,3 +122,194 @@ def test_sync(bricksync):
 
 
 
+
+def test_sync_all_reads_source_once_and_fans_out():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse, latency=0.02)
+    bs = env.bricksync()
+    name = "bench.schema_0.table_0"
+    start = time.perf_counter()
+    results = bs.sync_all("databricks", name, ["snowflake", "glue"], name)
+    elapsed = time.perf_counter() - start
+    assert all(r.succeeded for r in results.values())
+    assert set(results) == {"snowflake", "glue"}
+    assert env.log.by_provider()["databricks"] == 2
+    assert env.snowflake.tables[name.upper()] == lakehouse.tables[name].metadata_location
+    assert ("schema_0", "table_0") in env.glue.tables
+    # Targets overlap: wall time is well below the sum of every call's latency
+    assert elapsed < 0.02 * env.log.total * 0.8
+
+def test_sync_all_isolates_target_failures():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    bs = env.bricksync()
+    bs.get_provider("snowflake").create_or_refresh_external_table = MagicMock(side_effect=RuntimeError("down"))
+    name = "bench.schema_0.table_0"
+    results = bs.sync_all("databricks", name, ["snowflake", "glue"], name)
+    assert not results["snowflake"].succeeded
+    assert str(results["snowflake"].error) == "down"
+    assert results["glue"].succeeded
+
+def test_sync_chain_passes_table_between_hops():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    name = "bench.schema_0.table_0"
+    results = bs.sync_chain(["databricks", "glue", "snowflake"], name)
+    assert [r.target_provider for r in results] == ["glue", "snowflake"]
+    assert all(r.succeeded for r in results)
+    assert env.log.by_provider()["databricks"] == 2
+    # Glue is only probed once and never loaded back: the table flows straight to Snowflake
+    assert env.log.counts[("glue", "get_table")] == 1
+    assert env.glue.tables[("schema_0", "table_0")]["Parameters"]["metadata_location"] == lakehouse.tables[name].metadata_location
+    assert env.snowflake.tables[name.upper()] == lakehouse.tables[name].metadata_location
+
+def test_sync_chain_views_stop_after_failed_hop():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse()
+    root = lakehouse.add_view_graph("cat.views.g", depth=1, width=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    results = bs.sync_chain(["databricks", "glue", "snowflake"], root)
+    assert isinstance(results[0].error, NotImplementedError)
+    assert "Skipped" in str(results[1].error)
+    assert env.snowflake.views == {}
+
+def test_sync_chain_needs_a_target():
+    with pytest.raises(ValueError):
+        BrickSync.new().sync_chain(["databricks"], "a.b.c")
+
+def test_run_executes_configured_syncs():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=4, schemas=2)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    for name in lakehouse.tables:
+        bs.add_sync(name, "databricks", "snowflake")
+    report = bs.run(max_workers=2)
+    assert len(report.results) == 4
+    assert report.failures == []
+    assert report.tables_per_second > 0
+    assert report.latency(50) <= report.latency(95)
+    assert all(env.snowflake.tables[name.upper()] == spec.metadata_location
+               for name, spec in lakehouse.tables.items())
+
+def test_run_skip_failures_isolates_failures():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=3, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    bs.config.skip_failures = True
+    bs.add_sync("bench.schema_0.missing", "databricks", "glue")
+    for name in lakehouse.tables:
+        bs.add_sync(name, "databricks", "glue")
+    report = bs.run()
+    assert [r.sync.source for r in report.failures] == ["bench.schema_0.missing"]
+    assert len(report.results) == 4
+    assert len(env.glue.tables) == 3
+    assert "FAILED databricks:bench.schema_0.missing -> glue" in report.summary()
+
+def test_run_raises_without_skip_failures():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    bs = env.bricksync()
+    bs.add_sync("bench.schema_0.missing", "databricks", "glue")
+    with pytest.raises(SyncRunError) as context:
+        bs.run()
+    assert "bench.schema_0.missing" in str(context.value)
+    assert [r.sync.source for r in context.value.report.failures] == ["bench.schema_0.missing"]
+
+def test_run_resumes_from_checkpoint(tmp_path):
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    from bricksync.checkpoint import SyncCheckpoint
+    lakehouse = FakeLakehouse.generate(tables=4, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    bs.config.skip_failures = True
+    for name in lakehouse.tables:
+        bs.add_sync(name, "databricks", "snowflake")
+    checkpoint = SyncCheckpoint(str(tmp_path / "checkpoint.db"))
+    glitch = "bench.schema_0.table_2"
+    sf = bs.get_provider("snowflake")
+    create = sf.create_or_refresh_external_table
+    def flaky_create(table, **kwargs):
+        if table.name == glitch:
+            raise RuntimeError("down")
+        return create(table, **kwargs)
+    sf.create_or_refresh_external_table = flaky_create
+    assert len(bs.run(checkpoint=checkpoint).failures) == 1
+    assert len(checkpoint) == 3
+
+    sf.create_or_refresh_external_table = create
+    lakehouse.commit("bench.schema_0.table_0")
+    report = bs.run(checkpoint=checkpoint, resume=True)
+    assert report.failures == []
+    assert sorted(r.sync.source for r in report.skipped) == ["bench.schema_0.table_1", "bench.schema_0.table_3"]
+    assert len(checkpoint) == 4
+    assert all(env.snowflake.tables[name.upper()] == spec.metadata_location
+               for name, spec in lakehouse.tables.items())
+
+def test_run_resyncs_converted_delta_table_after_a_commit(tmp_path):
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    from bricksync.checkpoint import SyncCheckpoint
+    from bricksync.table import IcebergTable
+    lakehouse = FakeLakehouse.generate(tables=0, schemas=1)
+    spec = lakehouse.add_table("bench.schema_0.plain", uniform=False)
+    env = FakeEnvironment(lakehouse)
+    converted = []
+    class Converter:
+        def convert(self, table):
+            converted.append(lakehouse.tables[table.name].delta_version)
+            lakehouse._publish(lakehouse.tables[table.name])
+            return IcebergTable(table.name, table.storage_location, lakehouse.tables[table.name].metadata_location)
+    bs = env.bricksync()
+    bs._register_provider("databricks", env.databricks_catalog(read_delta_log=True, converter=Converter()))
+    bs.add_sync(spec.name, "databricks", "snowflake")
+    checkpoint = SyncCheckpoint(str(tmp_path / "checkpoint.db"))
+    bs.run(checkpoint=checkpoint)
+    assert [r.sync.source for r in bs.run(checkpoint=checkpoint, resume=True).skipped] == [spec.name]
+
+    lakehouse.commit(spec.name)
+    report = bs.run(checkpoint=checkpoint, resume=True)
+    assert report.skipped == []
+    assert converted == [1, 2]
+    assert env.snowflake.tables[spec.name.upper()] == spec.metadata_location
+
+def test_sync_returns_structured_result():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    from bricksync.result import SyncAction, SyncPhase
+    lakehouse = FakeLakehouse.generate(tables=2, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    table = "bench.schema_0.table_0"
+    created = bs.sync("databricks", table, "glue", table)
+    assert created.action == SyncAction.CREATED
+    assert created.source_metadata_location == lakehouse.tables[table].metadata_location
+    assert created.target_metadata_location == lakehouse.tables[table].metadata_location
+    assert set(created.phases) == set(SyncPhase)
+    assert created.remote_calls == created.calls.calls > 0
+    assert bs.sync("databricks", table, "glue", table).action == SyncAction.UNCHANGED
+    lakehouse.commit(table)
+    assert bs.sync("databricks", table, "glue", table).action == SyncAction.REFRESHED
+
+    root = lakehouse.add_view_graph("bench.views.g", depth=1, width=2)
+    view = bs.sync("databricks", root, "snowflake", root)
+    assert view.objects[-1].name == root and view.objects[-1].is_view
+    assert {o.action for o in view.objects if not o.is_view} == {SyncAction.CREATED}
+
+def test_run_report_aggregates_sync_results():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    from bricksync.result import SyncAction, SyncPhase
+    lakehouse = FakeLakehouse.generate(tables=3, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    for name in lakehouse.tables:
+        bs.add_sync(name, "databricks", "glue")
+    bs.run()
+    report = bs.run()
+    assert report.action_counts() == {SyncAction.UNCHANGED: 3}
+    assert report.remote_calls == sum(r.result.remote_calls for r in report.results)
+    assert report.phase_seconds()[SyncPhase.SOURCE_READ] > 0
+    assert "3 unchanged" in report.summary()
@@ -0,0 +1,224 @@
+from bricksync.testing import (FakeEnvironment, FakeLakehouse, CallBudget,
+                               CallBudgetExceeded, assert_call_budget)
+from bricksync.tracing import get_tracer, CallCounters
+from bricksync.table import IcebergTable
+import pytest, time
+
+TABLE = "bench.schema_0.table_0"
+
+
+@pytest.fixture
+def lakehouse():
+    return FakeLakehouse.generate(tables=3, schemas=1)
+
+@pytest.fixture
+def env(lakehouse):
+    return FakeEnvironment(lakehouse)
+
+@pytest.fixture
+def bs(env):
+    return env.bricksync()
+
+
+def test_budget_passes_within_limits():
+    with assert_call_budget(total=2, per_provider={"a": 1}, per_operation={"a.op": 1}) as counters:
+        get_tracer().call("a", "op", None, lambda: None)
+    assert counters.calls == 1
+
+def test_budget_reports_every_violation():
+    with pytest.raises(CallBudgetExceeded) as e:
+        with assert_call_budget("scenario", total=1, per_provider={"a": 1}, per_operation={"b.op": 0}):
+            get_tracer().call("a", "op", None, lambda: None)
+            get_tracer().call("a", "op", None, lambda: None)
+            get_tracer().call("b", "op", None, lambda: None)
+    message = str(e.value)
+    assert message.startswith("scenario exceeded its remote call budget")
+    assert "3 remote calls, budget is 1" in message
+    assert "2 a calls, budget is 1" in message
+    assert "1 b.op calls, budget is 0" in message
+
+def test_budget_is_not_checked_on_error():
+    with pytest.raises(ValueError):
+        with assert_call_budget(total=0):
+            get_tracer().call("a", "op", None, lambda: None)
+            raise ValueError()
+
+def test_call_budget_violations_empty():
+    assert CallBudget(total=5).violations(CallCounters()) == []
+
+
+# Databricks
+
+def test_databricks_source_table(env):
+    with assert_call_budget("Databricks get_table", per_provider={"databricks": 2}):
+        env.databricks_catalog().get_table(TABLE)
+
+def test_databricks_view_graph(env, lakehouse):
+    # The root's tables.get, one listing of its schema and the two base tables, however
+    # deep the graph is
+    for depth in (2, 6):
+        root = lakehouse.add_view_graph(f"bench.views.g{depth}", depth=depth, width=2)
+        with assert_call_budget(f"Databricks view graph of depth {depth}", per_provider={"databricks": 4}) as counters:
+            env.databricks_catalog().get_table(root)
+        assert counters.calls_for("databricks", "tables.get") == 1
+        assert counters.calls_for("databricks", "tables.list") == 1
+
+def test_databricks_view_base_tables_are_fetched_concurrently(lakehouse):
+    env = FakeEnvironment(lakehouse, latency=0.02)
+    view = lakehouse.add_view("bench.views.wide", list(lakehouse.tables)[:3] +
+                              [lakehouse.add_table(f"bench.wide.t_{i}").name for i in range(13)])
+    start = time.perf_counter()
+    with assert_call_budget("wide Databricks view", per_provider={"databricks": 19}):
+        resolved = env.databricks_catalog().get_table(view.name)
+    assert len(resolved.base_tables) == 16
+    # 16 table fetches at 20ms each take 320ms one after another
+    assert time.perf_counter() - start < 0.2
+
+def test_databricks_target_iceberg(env, lakehouse):
+    table = IcebergTable(TABLE, lakehouse.tables[TABLE].storage_location,
+                         lakehouse.tables[TABLE].metadata_location)
+    with assert_call_budget("Iceberg->Databricks", per_operation={"databricks.CREATE TABLE": 1},
+                            per_provider={"databricks": 1}):
+        env.databricks_catalog().create_or_refresh_external_table(table)
+
+
+# Snowflake
+
+def test_snowflake_cold_create(bs):
+    with assert_call_budget("cold Delta->Snowflake", per_provider={"snowflake": 8, "databricks": 2}):
+        bs.sync("databricks", TABLE, "snowflake", TABLE)
+
+def test_snowflake_warm_refresh(bs, lakehouse):
+    bs.sync("databricks", TABLE, "snowflake", TABLE)
+    lakehouse.commit(TABLE)
+    with assert_call_budget("warm Delta->Snowflake", per_provider={"snowflake": 2, "databricks": 2}):
+        bs.sync("databricks", TABLE, "snowflake", TABLE)
+
+def test_snowflake_refresh_after_overwrite(bs, lakehouse):
+    bs.sync("databricks", TABLE, "snowflake", TABLE)
+    lakehouse.overwrite(TABLE)
+    with assert_call_budget("overwritten Delta->Snowflake", per_provider={"snowflake": 2}):
+        bs.sync("databricks", TABLE, "snowflake", TABLE)
+
+def test_snowflake_replaces_overwritten_table_in_one_statement(bs, env, lakehouse):
+    glue_name = "schema_0.table_0"
+    bs.sync("databricks", TABLE, "glue", TABLE)
+    bs.sync("glue", glue_name, "snowflake", TABLE)
+    lakehouse.overwrite(TABLE)
+    bs.sync("databricks", TABLE, "glue", TABLE)
+    with assert_call_budget("overwritten Glue->Snowflake", per_provider={"snowflake": 1},
+                            per_operation={"snowflake.ALTER ICEBERG TABLE": 0}):
+        bs.sync("glue", glue_name, "snowflake", TABLE)
+    # The table keeps its Glue name in Snowflake
+    assert env.snowflake.tables[glue_name.upper()] == lakehouse.tables[TABLE].metadata_location
+
+def test_snowflake_reads_source_uuid_with_file_io(bs, env, lakehouse):
+    from bricksync.testing import FakeFileIO
+    bs.get_provider("snowflake").file_io = FakeFileIO(lakehouse, env.log)
+    bs.sync("databricks", TABLE, "snowflake", TABLE)
+    lakehouse.overwrite(TABLE)
+    with assert_call_budget("overwritten Delta->Snowflake with file io",
+                            per_operation={"snowflake.read_metadata": 1, "snowflake.ALTER ICEBERG TABLE": 0,
+                                           "snowflake.CREATE OR REPLACE ICEBERG TABLE": 1}):
+        bs.sync("databricks", TABLE, "snowflake", TABLE)
+    assert env.snowflake.tables[TABLE.upper()] == lakehouse.tables[TABLE].metadata_location
+
+def test_snowflake_volume_and_integration_lookups_are_cached(bs):
+    bs.sync("databricks", TABLE, "snowflake", TABLE)
+    with assert_call_budget("second table", per_operation={"snowflake.SHOW EXTERNAL VOLUMES": 0,
+                                                           "snowflake.DESCRIBE EXTERNAL VOLUME": 0,
+                                                           "snowflake.SHOW CATALOG INTEGRATIONS": 0,
+                                                           "snowflake.DESCRIBE CATALOG INTEGRATION": 0}):
+        bs.sync("databricks", "bench.schema_0.table_1", "snowflake", "bench.schema_0.table_1")
+
+def test_snowflake_source_table(env):
+    env.snowflake.mirror()
+    with assert_call_budget("Snowflake get_table", per_provider={"snowflake": 3}):
+        env.snowflake_catalog().get_table(TABLE)
+
+def test_snowflake_view_graph(env, lakehouse):
+    root = lakehouse.add_view_graph("bench.views.g", depth=2, width=2)
+    env.snowflake.mirror()
+    with assert_call_budget("Snowflake view graph", per_provider={"snowflake": 4}):
+        env.snowflake_catalog().get_table(root)
+
+def test_snowflake_view_graph_round_trips_do_not_grow_with_depth(env, lakehouse):
+    root = lakehouse.add_view_graph("bench.views.deep", depth=8, width=4)
+    env.snowflake.mirror()
+    with assert_call_budget("deep Snowflake view graph", per_provider={"snowflake": 4}):
+        view = env.snowflake_catalog().get_table(root)
+    # Shared nodes are resolved once and shared in the graph
+    assert view.base_tables[0].base_tables[1] is view.base_tables[1].base_tables[0]
+
+def test_snowflake_view_graph_without_account_usage(env, lakehouse):
+    root = lakehouse.add_view_graph("bench.views.g", depth=2, width=2)
+    env.snowflake.mirror()
+    env.snowflake.dependencies.clear()
+    view = env.snowflake_catalog().get_table(root)
+    assert {t.name for t in view.base_tables[0].base_tables} == {"bench.views.g_v1_0", "bench.views.g_v1_1"}
+
+def test_snowflake_view_graph_without_imported_privileges(env, lakehouse):
+    root = lakehouse.add_view_graph("bench.views.g", depth=2, width=2)
+    env.snowflake.mirror()
+    env.snowflake.account_usage = False
+    view = env.snowflake_catalog().get_table(root)
+    assert {t.name for t in view.base_tables[0].base_tables} == {"bench.views.g_v1_0", "bench.views.g_v1_1"}
+
+def test_snowflake_view_dependencies_skip_other_objects(env, lakehouse):
+    root = lakehouse.add_view_graph("bench.views.g", depth=2, width=2)
+    env.snowflake.mirror()
+    env.snowflake.dependencies[root.upper()].append(("BENCH.UDFS.PARSE_ID", "FUNCTION"))
+    with assert_call_budget("Snowflake view graph with a function", per_provider={"snowflake": 4}):
+        env.snowflake_catalog().get_table(root)
+    assert not any("PARSE_ID" in s for s in env.snowflake.statements)
+
+def test_snowflake_view_dependencies_skip_dropped_views(env, lakehouse):
+    root = lakehouse.add_view_graph("bench.views.g", depth=2, width=2)
+    env.snowflake.mirror()
+    # ACCOUNT_USAGE still lists a view that was dropped since
+    env.snowflake.dependencies[root.upper()].append(("BENCH.VIEWS.DROPPED", "VIEW"))
+    view = env.snowflake_catalog().get_table(root)
+    assert {t.name for t in view.base_tables} == {"bench.views.g_v1_0", "bench.views.g_v1_1"}
+
+def test_snowflake_missing_dependencies_are_fetched_concurrently(lakehouse):
+    env = FakeEnvironment(lakehouse, latency=0.02)
+    view = lakehouse.add_view("bench.views.wide", [lakehouse.add_table(f"bench.wide.t_{i}").name for i in range(16)])
+    env.snowflake.mirror()
+    env.snowflake.dependencies.clear()
+    start = time.perf_counter()
+    resolved = env.snowflake_catalog().get_table(view.name)
+    assert len(resolved.base_tables) == 16
+    assert time.perf_counter() - start < 0.5
+
+def test_databricks_views_to_snowflake(bs, lakehouse):
+    root = lakehouse.add_view_graph("bench.views.g", depth=2, width=2)
+    with assert_call_budget("Databricks views->Snowflake", per_provider={"databricks": 4, "snowflake": 15}):
+        result = bs.sync("databricks", root, "snowflake", root)
+    # Shared objects are written once: 2 tables and 5 views
+    assert len(result.objects) == len({o.name for o in result.objects}) == 7
+
+
+# Glue
+
+def test_glue_cold_register(bs):
+    with assert_call_budget("cold Delta->Glue", per_provider={"glue": 3, "databricks": 2},
+                            per_operation={"glue.load_table": 0}):
+        bs.sync("databricks", TABLE, "glue", TABLE)
+
+def test_glue_warm_refresh(bs, lakehouse):
+    bs.sync("databricks", TABLE, "glue", TABLE)
+    lakehouse.commit(TABLE)
+    with assert_call_budget("warm Delta->Glue", per_provider={"glue": 3},
+                            per_operation={"glue.load_table": 0}):
+        bs.sync("databricks", TABLE, "glue", TABLE)
+
+def test_glue_unchanged(bs):
+    bs.sync("databricks", TABLE, "glue", TABLE)
+    with assert_call_budget("unchanged Delta->Glue", per_provider={"glue": 1},
+                            per_operation={"glue.update_glue_table": 0}):
+        bs.sync("databricks", TABLE, "glue", TABLE)
+
+def test_glue_source_table(bs, env):
+    bs.sync("databricks", TABLE, "glue", TABLE)
+    with assert_call_budget("Glue get_table", per_provider={"glue": 1}):
+        env.glue_catalog().get_table("schema_0.table_0")
@@ -45,4 +45,11 @@ def test_get_table_from_name():
 def test_replace_table_identifiers():
     tbl = Table("cat.schema.a", "s3://foo/bar")
     new_all_table = cat.replace_table_identifiers(tbl_a, "newcat", "newschema", "a_new")
-    assert new_all_table.name == "newcat.newschema.a_new"
\ No newline at end of file
+    assert new_all_table.name == "newcat.newschema.a_new"
+
+def test_quoted_names():
+    quoted = Table("`my.cat`.schema.`a.b`", "s3://foo/bar")
+    assert cat.get_fqtn_parts(quoted) == ("my.cat", "schema", "a.b")
+    assert cat.get_catalog_from_name("`my.cat`.schema.`a.b`") == "my.cat"
+    assert cat.get_table_from_name(quoted) == "a.b"
+
@@ -0,0 +1,186 @@
+from bricksync.convert import DeltaIcebergConverter, DELTA_VERSION_PROPERTY, NAME_MAPPING_PROPERTY
+from bricksync.delta import DeltaLogReader, LocalFileSystem
+from bricksync.table import DeltaTable
+from bricksync.testing import FakeEnvironment, FakeLakehouse, assert_call_budget
+from pyiceberg.io import load_file_io
+from pyiceberg.serializers import FromInputFile
+from pyiceberg.table.snapshots import Operation
+import json, os, pytest
+
+TABLE_ID = "5f0f3b9e-7c1a-4d2e-9b8a-2c6d4e8f1a3b"
+SCHEMA = {"type": "struct", "fields": [
+    {"name": "id", "type": "long", "nullable": False, "metadata": {}},
+    {"name": "name", "type": "string", "nullable": True, "metadata": {}},
+    {"name": "tags", "type": {"type": "array", "elementType": "string", "containsNull": True},
+     "nullable": True, "metadata": {}},
+    {"name": "day", "type": "date", "nullable": True, "metadata": {}}]}
+
+
+class CountingFileSystem(LocalFileSystem):
+    def __init__(self):
+        self.reads = []
+
+    def read(self, path):
+        self.reads.append(os.path.basename(path))
+        return super().read(path)
+
+
+def metadata(schema=SCHEMA, partition_columns=("day",), configuration=None):
+    return {"metaData": {"id": TABLE_ID, "format": {"provider": "parquet", "options": {}},
+                         "schemaString": json.dumps(schema), "partitionColumns": list(partition_columns),
+                         "configuration": configuration or {}, "createdTime": 0}}
+
+def add(path, day="2024-01-01", records=10, **extra):
+    return {"add": {"path": path, "partitionValues": {"day": day}, "size": 1000, "modificationTime": 0,
+                    "dataChange": True, "stats": json.dumps({"numRecords": records, "nullCount": {"id": 0, "name": 1}}),
+                    **extra}}
+
+def remove(path):
+    return {"remove": {"path": path, "deletionTimestamp": 0, "dataChange": True}}
+
+def commit(location, version, *actions):
+    log = location / "_delta_log"
+    log.mkdir(exist_ok=True)
+    (log / f"{version:020d}.json").write_text("\n".join(json.dumps(a) for a in actions))
+
+def delta_table(location) -> DeltaTable:
+    return DeltaTable(name="main.sales.orders", storage_location=str(location),
+                      delta_properties={}, uniform_iceberg_info=None)
+
+def converter(location, filesystem=None) -> DeltaIcebergConverter:
+    return DeltaIcebergConverter(DeltaLogReader(filesystem or LocalFileSystem()), load_file_io(location=str(location)))
+
+def live_files(location, metadata_location):
+    io = load_file_io(location=str(location))
+    table_metadata = FromInputFile.table_metadata(io.new_input(metadata_location))
+    snapshot = table_metadata.snapshot_by_id(table_metadata.current_snapshot_id)
+    files = {e.data_file.file_path: e.data_file
+             for m in snapshot.manifests(io) for e in m.fetch_manifest_entry(io, discard_deleted=True)}
+    return table_metadata, snapshot, files
+
+
+def test_full_conversion(tmp_path):
+    commit(tmp_path, 0, {"protocol": {"minReaderVersion": 1, "minWriterVersion": 2}}, metadata(),
+           add("day=2024-01-01/part-0.parquet"), add("day=2024-01-02/part%201.parquet", day="2024-01-02", records=5))
+    commit(tmp_path, 1, add("day=2024-01-02/part-2.parquet", day="2024-01-02"))
+    table = converter(tmp_path).convert(delta_table(tmp_path))
+    assert table.iceberg_metadata_location == f"{tmp_path}/metadata/v1.metadata.json"
+    assert (tmp_path / "metadata" / "version-hint.text").read_text() == "1"
+    table_metadata, snapshot, files = live_files(tmp_path, table.iceberg_metadata_location)
+    assert str(table_metadata.table_uuid) == table.table_uuid == TABLE_ID
+    assert table_metadata.properties[DELTA_VERSION_PROPERTY] == "1"
+    assert [f.name for f in table_metadata.schema().fields] == ["id", "name", "tags", "day"]
+    assert [f.name for f in table_metadata.spec().fields] == ["day"]
+    mapping = json.loads(table_metadata.properties[NAME_MAPPING_PROPERTY])
+    assert [m["names"] for m in mapping] == [["id"], ["name"], ["tags"], ["day"]]
+    assert mapping[2]["fields"][0]["names"] == ["element"]
+    assert sorted(files) == [f"{tmp_path}/day=2024-01-01/part-0.parquet", f"{tmp_path}/day=2024-01-02/part 1.parquet",
+                             f"{tmp_path}/day=2024-01-02/part-2.parquet"]
+    data_file = files[f"{tmp_path}/day=2024-01-02/part 1.parquet"]
+    assert data_file.record_count == 5
+    assert data_file.partition[0] == 19724
+    assert snapshot.summary.operation == Operation.APPEND
+
+def test_incremental_conversion_reads_only_new_commits(tmp_path):
+    commit(tmp_path, 0, metadata(), add("day=2024-01-01/part-0.parquet"), add("day=2024-01-01/part-1.parquet"))
+    filesystem = CountingFileSystem()
+    convert = converter(tmp_path, filesystem)
+    first = convert.convert(delta_table(tmp_path))
+    commit(tmp_path, 1, remove("day=2024-01-01/part-0.parquet"), add("day=2024-01-01/part-2.parquet"))
+    filesystem.reads.clear()
+    second = convert.convert(delta_table(tmp_path))
+    assert filesystem.reads == [f"{1:020d}.json"]
+    assert second.iceberg_metadata_location == f"{tmp_path}/metadata/v2.metadata.json"
+    table_metadata, snapshot, files = live_files(tmp_path, second.iceberg_metadata_location)
+    assert sorted(files) == [f"{tmp_path}/day=2024-01-01/part-1.parquet", f"{tmp_path}/day=2024-01-01/part-2.parquet"]
+    assert snapshot.summary.operation == Operation.OVERWRITE
+    assert snapshot.parent_snapshot_id == FromInputFile.table_metadata(
+        load_file_io(location=str(tmp_path)).new_input(first.iceberg_metadata_location)).current_snapshot_id
+    assert [e.metadata_file for e in table_metadata.metadata_log] == [first.iceberg_metadata_location]
+    # A new converter resumes from the version hint
+    commit(tmp_path, 2, add("day=2024-01-03/part-3.parquet", day="2024-01-03"))
+    third = converter(tmp_path).convert(delta_table(tmp_path))
+    assert third.iceberg_metadata_location == f"{tmp_path}/metadata/v3.metadata.json"
+    assert len(live_files(tmp_path, third.iceberg_metadata_location)[2]) == 3
+
+def test_up_to_date_table_is_not_rewritten(tmp_path):
+    commit(tmp_path, 0, metadata(), add("day=2024-01-01/part-0.parquet"))
+    convert = converter(tmp_path)
+    first = convert.convert(delta_table(tmp_path))
+    files = sorted(os.listdir(tmp_path / "metadata"))
+    assert convert.convert(delta_table(tmp_path)).iceberg_metadata_location == first.iceberg_metadata_location
+    assert sorted(os.listdir(tmp_path / "metadata")) == files
+
+def test_schema_evolution_keeps_field_ids(tmp_path):
+    commit(tmp_path, 0, metadata(), add("day=2024-01-01/part-0.parquet"))
+    convert = converter(tmp_path)
+    first = live_files(tmp_path, convert.convert(delta_table(tmp_path)).iceberg_metadata_location)[0]
+    schema = {**SCHEMA, "fields": SCHEMA["fields"] + [{"name": "amount", "type": "decimal(10,2)",
+                                                       "nullable": True, "metadata": {}}]}
+    commit(tmp_path, 1, metadata(schema=schema))
+    second = live_files(tmp_path, convert.convert(delta_table(tmp_path)).iceberg_metadata_location)[0]
+    assert second.current_schema_id == 1 and len(second.schemas) == 2
+    before = {f.name: f.field_id for f in first.schema().fields}
+    after = {f.name: f.field_id for f in second.schema().fields}
+    assert {k: after[k] for k in before} == before
+    assert after["amount"] == first.last_column_id + 1
+    # Only the schema changed, so the snapshot stays
+    assert second.current_snapshot_id == first.current_snapshot_id
+
+def test_changed_partition_columns_convert_in_full(tmp_path):
+    commit(tmp_path, 0, metadata(), add("day=2024-01-01/part-0.parquet"))
+    convert = converter(tmp_path)
+    convert.convert(delta_table(tmp_path))
+    commit(tmp_path, 1, metadata(partition_columns=()), remove("day=2024-01-01/part-0.parquet"),
+           {"add": {**add("part-1.parquet")["add"], "partitionValues": {}}})
+    table_metadata, _, files = live_files(tmp_path, convert.convert(delta_table(tmp_path)).iceberg_metadata_location)
+    assert table_metadata.spec().fields == () and len(table_metadata.partition_specs) == 2
+    assert list(files) == [f"{tmp_path}/part-1.parquet"]
+
+def test_unsupported_tables(tmp_path):
+    commit(tmp_path, 0, metadata(), add("day=2024-01-01/part-0.parquet", deletionVector={"storageType": "u"}))
+    with pytest.raises(NotImplementedError, match="deletion vectors"):
+        converter(tmp_path).convert(delta_table(tmp_path))
+    mapped = tmp_path / "mapped"
+    mapped.mkdir()
+    commit(mapped, 0, metadata(configuration={"delta.columnMapping.mode": "name"}))
+    with pytest.raises(NotImplementedError, match="column mapping"):
+        converter(mapped).convert(delta_table(mapped))
+
+def test_conversion_from_checkpoint(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    commit(tmp_path, 0, metadata(), add("day=2024-01-01/part-0.parquet"))
+    commit(tmp_path, 1, add("day=2024-01-01/part-1.parquet"))
+    strings = pa.map_(pa.string(), pa.string())
+    schema = pa.schema([
+        ("add", pa.struct([("path", pa.string()), ("partitionValues", strings), ("size", pa.int64()),
+                           ("modificationTime", pa.int64()), ("dataChange", pa.bool_()), ("stats", pa.string())])),
+        ("metaData", pa.struct([("id", pa.string()), ("schemaString", pa.string()),
+                                ("partitionColumns", pa.list_(pa.string())), ("configuration", strings)]))])
+    rows = [{"add": {**a["add"], "partitionValues": list(a["add"]["partitionValues"].items())}, "metaData": None}
+            for a in (add("day=2024-01-01/part-0.parquet"), add("day=2024-01-01/part-1.parquet"))]
+    rows.append({"add": None, "metaData": {**{k: metadata()["metaData"][k] for k in ("id", "schemaString",
+                                                                                      "partitionColumns")},
+                                           "configuration": []}})
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema),
+                   tmp_path / "_delta_log" / f"{1:020d}.checkpoint.parquet")
+    (tmp_path / "_delta_log" / "_last_checkpoint").write_text(json.dumps({"version": 1, "size": 3}))
+    # Commits before the checkpoint may have been cleaned up
+    (tmp_path / "_delta_log" / f"{0:020d}.json").unlink()
+    commit(tmp_path, 2, remove("day=2024-01-01/part-0.parquet"))
+    table = converter(tmp_path).convert(delta_table(tmp_path))
+    assert list(live_files(tmp_path, table.iceberg_metadata_location)[2]) == [
+        f"{tmp_path}/day=2024-01-01/part-1.parquet"]
+
+def test_databricks_converts_non_uniform_tables(tmp_path):
+    commit(tmp_path, 0, metadata(), add("day=2024-01-01/part-0.parquet"))
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    catalog = env.databricks_catalog(converter=converter(tmp_path))
+    with assert_call_budget("Delta conversion", per_operation={"databricks.convert_delta": 1}) as counters:
+        table = catalog.to_iceberg_table(delta_table(tmp_path))
+    assert counters.calls_for("databricks", "convert_delta") == 1
+    assert table.iceberg_metadata_location == f"{tmp_path}/metadata/v1.metadata.json"
+    # UniForm tables keep the metadata Databricks wrote
+    uniform = catalog.get_table("bench.schema_0.table_0")
+    assert catalog.to_iceberg_table(uniform).iceberg_metadata_location == uniform.uniform_iceberg_info.metadata_location
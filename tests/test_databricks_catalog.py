@@ -105,6 +105,18 @@ def delta_view_nested():
                          ]
                      ))
 
+def serve_tables(databricks_catalog, *table_infos):
+    """Answer tables.get and tables.list for the given objects, in any order"""
+    by_name = {t.full_name: t for t in table_infos}
+    tables = databricks_catalog.client.tables
+    tables.get.side_effect = lambda full_name, **kwargs: by_name[full_name]
+    tables.list.side_effect = lambda catalog_name, schema_name, **kwargs: iter(
+        [t for n, t in by_name.items() if n.startswith(f"{catalog_name}.{schema_name}.")])
+    databricks_catalog.sql = MagicMock(side_effect=AssertionError("views are resolved without SQL"))
+
+def depends_on(*names):
+    return DependencyList(dependencies=[Dependency(table=TableDependency(table_full_name=n)) for n in names])
+
 @patch("databricks.connect.DatabricksSession")
 def get_spark_client(mocker):
     spark = create_autospec(DatabricksSession)
@@ -164,7 +176,7 @@ def test_non_uniform_table_to_iceberg(databricks_catalog, delta_table):
     assert "Table my.uc.delta_table does not have Iceberg metadatata" in str(context.value)
 
 def test_get_view(databricks_catalog, delta_view, delta_table):
-    databricks_catalog.client.tables.get.side_effect = [delta_view, delta_table]
+    serve_tables(databricks_catalog, delta_view, delta_table)
     view = databricks_catalog.get_table("my.uc.delta_view")
     assert view.name == "my.uc.delta_view"
     assert view.is_view()
@@ -172,20 +184,66 @@ def test_get_view(databricks_catalog, delta_view, delta_table):
     assert view.base_tables[0].is_delta()
 
 def test_get_mv(databricks_catalog, delta_mv, delta_table):
-    databricks_catalog.client.tables.get.side_effect = [delta_mv, delta_table]
+    serve_tables(databricks_catalog, delta_mv, delta_table)
     mv = databricks_catalog.get_table("my.uc.delta_view")
     assert mv.name == "my.uc.delta_view"
     assert mv.is_view()
+    assert mv.view_definition == "select * from my.uc.delta_table"
     assert "my.uc.delta_table" == mv.base_tables[0].name
     assert mv.base_tables[0].is_delta()
 
 def test_get_nested_view(databricks_catalog, delta_view_nested, delta_view, delta_table):
-    databricks_catalog.client.tables.get.side_effect = [delta_view_nested, delta_view, delta_table]
+    serve_tables(databricks_catalog, delta_view_nested, delta_view, delta_table)
     view = databricks_catalog.get_table("my.uc.delta_with_nested_view")
     assert view.name == "my.uc.delta_with_nested_view"
     assert view.is_view()
-    names = [t.name for t in view.base_tables]
-    assert "my.uc.delta_table" in names
+    nodes = {t.name: t for t in view.base_tables}
+    assert set(nodes) == {"my.uc.delta_table", "my.uc.delta_view"}
+    assert nodes["my.uc.delta_view"].base_tables[0] is nodes["my.uc.delta_table"]
+    assert nodes["my.uc.delta_view"].view_definition == "select * from my.uc.delta_table"
+
+def test_get_view_graph_shares_nodes(databricks_catalog, delta_table):
+    # v2 was created under USE my.other, so its unqualified v1 is my.other.v1 and not
+    # a view in its own schema. The edges come from Unity Catalog, not the definition.
+    views = [TableInfo(full_name="my.uc.v1", table_type=TableType.VIEW,
+                       view_definition="select * from `my.uc.delta_table`", view_dependencies=depends_on("my.uc.delta_table")),
+             TableInfo(full_name="my.other.v1", table_type=TableType.VIEW,
+                       view_definition="select * from `my.uc.delta_table`", view_dependencies=depends_on("my.uc.delta_table")),
+             TableInfo(full_name="my.uc.v2", table_type=TableType.VIEW,
+                       view_definition="select * from v1 join my.uc.delta_table using (col1)",
+                       view_dependencies=depends_on("my.other.v1", "my.uc.delta_table")),
+             TableInfo(full_name="my.uc.root", table_type=TableType.VIEW,
+                       view_definition="with t as (select * from my.uc.v1) select * from t join my.uc.v2 using (col1)",
+                       view_dependencies=depends_on("my.uc.v1", "my.uc.v2"))]
+    serve_tables(databricks_catalog, *views, delta_table)
+    root = databricks_catalog.get_views(["my.uc.root"])["my.uc.root"]
+    nodes = {t.name: t for t in root.base_tables}
+    assert set(nodes) == {"my.uc.v1", "my.uc.v2"}
+    v2_nodes = {t.name: t for t in nodes["my.uc.v2"].base_tables}
+    assert set(v2_nodes) == {"my.other.v1", "my.uc.delta_table"}
+    assert v2_nodes["my.other.v1"].base_tables[0] is nodes["my.uc.v1"].base_tables[0]
+    assert v2_nodes["my.uc.delta_table"] is nodes["my.uc.v1"].base_tables[0]
+    assert v2_nodes["my.uc.delta_table"].is_delta()
+    # One listing per schema and no lookups of single objects
+    assert databricks_catalog.client.tables.list.call_count == 2
+    databricks_catalog.client.tables.get.assert_not_called()
+
+def test_get_view_cycle(databricks_catalog):
+    views = [TableInfo(full_name="my.uc.a", table_type=TableType.VIEW, view_definition="select * from my.uc.b",
+                       view_dependencies=depends_on("my.uc.b")),
+             TableInfo(full_name="my.uc.b", table_type=TableType.VIEW, view_definition="select * from my.uc.a",
+                       view_dependencies=depends_on("my.uc.a"))]
+    serve_tables(databricks_catalog, *views)
+    with pytest.raises(Exception) as context:
+        databricks_catalog.get_views(["my.uc.a"])
+    assert "Circular view dependency" in str(context.value)
+
+def test_get_view_looks_up_unlisted_objects(databricks_catalog, delta_view, delta_table):
+    serve_tables(databricks_catalog, delta_view, delta_table)
+    databricks_catalog.client.tables.list.side_effect = lambda **kwargs: iter([delta_view])
+    view = databricks_catalog.get_table("my.uc.delta_view")
+    assert view.base_tables[0].is_delta()
+    assert databricks_catalog.client.tables.get.call_count == 2
 
 def test_create_catalog_schema(databricks_catalog):
     databricks_catalog.create_catalog("my_catalog")
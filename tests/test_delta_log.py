@@ -0,0 +1,72 @@
+from bricksync.delta import DeltaLogReader, LocalFileSystem
+from bricksync.testing import FakeEnvironment, FakeLakehouse, assert_call_budget
+import json, pytest
+
+TABLE = "bench.schema_0.table_0"
+
+
+class CountingFileSystem(LocalFileSystem):
+    def __init__(self):
+        self.reads = 0
+        self.lists = 0
+
+    def read(self, path):
+        self.reads += 1
+        return super().read(path)
+
+    def list(self, directory, start_after=None):
+        self.lists += 1
+        return super().list(directory, start_after)
+
+
+def _commit(table_path, *versions):
+    log = table_path / "_delta_log"
+    log.mkdir(parents=True, exist_ok=True)
+    for v in versions:
+        (log / f"{v:020d}.json").write_text("{}")
+        (log / f"{v:020d}.crc").write_text("{}")
+
+def _checkpoint(table_path, version):
+    (table_path / "_delta_log" / f"{version:020d}.checkpoint.parquet").write_bytes(b"")
+    (table_path / "_delta_log" / "_last_checkpoint").write_text(json.dumps({"version": version, "size": 1}))
+
+
+def test_latest_version_from_checkpoint_and_commits(tmp_path):
+    _commit(tmp_path, *range(13))
+    _checkpoint(tmp_path, 10)
+    fs = CountingFileSystem()
+    reader = DeltaLogReader(fs)
+    assert reader.latest_version(str(tmp_path)) == 12
+    assert (fs.reads, fs.lists) == (1, 1)
+    # Later checks list from the cached version only
+    _commit(tmp_path, 13, 14)
+    assert reader.latest_version(f"file://{tmp_path}/") == 14
+    assert (fs.reads, fs.lists) == (1, 2)
+
+def test_latest_version_without_checkpoint(tmp_path):
+    _commit(tmp_path, 0, 1, 2)
+    assert DeltaLogReader(LocalFileSystem()).latest_version(str(tmp_path)) == 2
+
+def test_checkpoint_without_newer_commits(tmp_path):
+    # Commits older than the checkpoint may have been cleaned up
+    _commit(tmp_path, 20)
+    _checkpoint(tmp_path, 20)
+    (tmp_path / "_delta_log" / f"{20:020d}.json").unlink()
+    assert DeltaLogReader(LocalFileSystem()).latest_version(str(tmp_path)) == 20
+
+def test_missing_log(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DeltaLogReader(LocalFileSystem()).latest_version(str(tmp_path / "missing"))
+
+def test_generate_iceberg_metadata_reads_the_delta_log():
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    spec = lakehouse.tables[TABLE]
+    spec.delta_version = 12
+    catalog = env.databricks_catalog(read_delta_log=True)
+    with assert_call_budget("Delta version check", per_operation={"storage.get_object": 1,
+                                                                   "storage.list_objects": 1,
+                                                                   "databricks.spark.sql": 1}):
+        table = catalog.generate_iceberg_metadata(TABLE)
+    assert table.uniform_iceberg_info.converted_delta_version == 12
+    assert not any("DESCRIBE HISTORY" in s for s in env.spark.statements)
@@ -0,0 +1,75 @@
+from bricksync.config import SyncConfig
+from bricksync.events import MetadataFileEvent, DirectoryEventSource, S3EventQueueSource, EventDrivenSync
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+from unittest.mock import MagicMock
+import json, os
+
+TABLE = "bench.schema_0.table_0"
+OTHER = "bench.schema_0.table_1"
+
+
+def write_metadata(lakehouse: FakeLakehouse, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(lakehouse.read_metadata(path))
+
+def setup_env(tmp_path):
+    lakehouse = FakeLakehouse(bucket=str(tmp_path))
+    for name in [TABLE, OTHER]:
+        lakehouse.add_table(name)
+        write_metadata(lakehouse, lakehouse.tables[name].metadata_location)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    bs.add_sync(TABLE, "databricks", "snowflake")
+    bs.add_sync(TABLE, "databricks", "glue")
+    return lakehouse, env, bs
+
+
+def test_event_parses_location_and_version():
+    event = MetadataFileEvent("s3://b/cat/sch/tbl/metadata/00007-abc.metadata.json")
+    assert event.storage_location == "s3://b/cat/sch/tbl"
+    assert event.version == 7
+    assert MetadataFileEvent("s3://b/cat/sch/tbl/other.json").storage_location is None
+
+def test_new_metadata_file_is_pushed_without_reading_source(tmp_path):
+    lakehouse, env, bs = setup_env(tmp_path)
+    source = DirectoryEventSource(str(tmp_path), interval=0.01)
+    watcher = EventDrivenSync(bs).index()
+    env.log.reset()
+
+    spec = lakehouse.commit(TABLE)
+    write_metadata(lakehouse, spec.metadata_location)
+    lakehouse.commit(OTHER)
+    write_metadata(lakehouse, lakehouse.tables[OTHER].metadata_location)
+    assert watcher.run(source, poll_timeout=1.0, max_events=2) == 2
+
+    assert env.log.by_provider().get("databricks", 0) == 0
+    assert env.snowflake.tables[TABLE.upper()] == spec.metadata_location
+    assert env.glue.tables[("schema_0", "table_0")]["Parameters"]["metadata_location"] == spec.metadata_location
+    # table_1 has no registered sync
+    assert OTHER.upper() not in env.snowflake.tables
+
+def test_older_metadata_file_is_ignored(tmp_path):
+    lakehouse, env, bs = setup_env(tmp_path)
+    watcher = EventDrivenSync(bs).index()
+    old = lakehouse.tables[TABLE].metadata_location
+    new = lakehouse.commit(TABLE).metadata_location
+    assert all(r.succeeded for r in watcher.handle(MetadataFileEvent(new)).values())
+    assert watcher.handle(MetadataFileEvent(old)) == {}
+    assert env.snowflake.tables[TABLE.upper()] == new
+
+def test_s3_queue_events_are_acked_after_handling():
+    body = {"Records": [{"eventName": "ObjectCreated:Put",
+                         "s3": {"bucket": {"name": "b"}, "object": {"key": "t/metadata/00002-x.metadata.json"}}},
+                        {"eventName": "ObjectCreated:Put",
+                         "s3": {"bucket": {"name": "b"}, "object": {"key": "t/data/part-0.parquet"}}}]}
+    sqs = MagicMock()
+    sqs.receive_message.return_value = {"Messages": [
+        {"MessageId": "1", "ReceiptHandle": "r1", "Body": json.dumps({"Message": json.dumps(body)})},
+        {"MessageId": "2", "ReceiptHandle": "r2", "Body": json.dumps({"Records": []})}]}
+    source = S3EventQueueSource("queue", sqs_client=sqs)
+    events = source.poll(0)
+    assert events == [MetadataFileEvent("s3://b/t/metadata/00002-x.metadata.json")]
+    sqs.delete_message.assert_called_once_with(QueueUrl="queue", ReceiptHandle="r2")
+    source.ack(events)
+    sqs.delete_message.assert_called_with(QueueUrl="queue", ReceiptHandle="r1")
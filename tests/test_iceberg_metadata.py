@@ -0,0 +1,76 @@
+from bricksync.iceberg import read_metadata_summary, PartialMetadataParseError
+from bricksync.testing import FakeEnvironment, FakeLakehouse, iceberg_metadata_json
+from pyiceberg.serializers import FromInputFile
+from pyiceberg.catalog import glue
+import io, json, pytest
+
+LOCATION = "s3://bucket/cat/sch/tbl"
+
+
+class CountingStream(io.BytesIO):
+    bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class BytesInputFile:
+    def __init__(self, data: bytes):
+        self.location = f"{LOCATION}/metadata/00001-x.metadata.json"
+        self.data = data
+        self.stream = None
+
+    def open(self, seekable: bool = True):
+        self.stream = CountingStream(self.data)
+        return self.stream
+
+
+def metadata(snapshots: int = 50, snapshots_first: bool = False) -> dict:
+    doc = json.loads(iceberg_metadata_json("0b5c9a3e-1d2f-4e6a-8b7c-9d0e1f2a3b4c", LOCATION, snapshots))
+    if snapshots_first:
+        # Bracket and quote characters inside skipped strings must not confuse the scanner
+        doc["snapshots"][0]["summary"]["note"] = 'a "quoted" ]}[{ \\ value'
+        doc = {"snapshots": doc.pop("snapshots"), "metadata-log": [{"x": "ü"}] * 10, **doc}
+    return doc
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 65536])
+@pytest.mark.parametrize("snapshots_first", [False, True])
+def test_summary_matches_full_parse(chunk_size, snapshots_first):
+    data = json.dumps(metadata(snapshots_first=snapshots_first), indent=2).encode()
+    full = FromInputFile.table_metadata(BytesInputFile(data))
+    summary = read_metadata_summary(BytesInputFile(data), chunk_size=chunk_size)
+    assert summary.table_uuid == str(full.table_uuid)
+    assert summary.location == full.location
+    assert summary.current_snapshot_id == full.current_snapshot_id
+    assert summary.schema() == full.schema()
+    assert glue._to_columns(summary) == glue._to_columns(full)
+
+def test_reading_stops_before_snapshots():
+    data = json.dumps(metadata(snapshots=5000)).encode()
+    file = BytesInputFile(data)
+    read_metadata_summary(file, chunk_size=1024)
+    assert file.stream.bytes_read < len(data) / 10
+
+def test_unsummarizable_metadata_raises():
+    doc = metadata()
+    doc["schema"] = doc.pop("schemas")[0]
+    with pytest.raises(PartialMetadataParseError):
+        read_metadata_summary(BytesInputFile(json.dumps(doc).encode()))
+    with pytest.raises(PartialMetadataParseError):
+        read_metadata_summary(BytesInputFile(b'{"location": "s3://b", "schemas": ['))
+
+def test_glue_refresh_reads_summary():
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1, snapshots=20)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    name = "bench.schema_0.table_0"
+    bs.sync("databricks", name, "glue", name)
+    spec = lakehouse.commit(name)
+    bs.sync("databricks", name, "glue", name)
+    record = env.glue.tables[("schema_0", "table_0")]
+    assert record["Parameters"]["metadata_location"] == spec.metadata_location
+    assert record["StorageDescriptor"]["Location"] == spec.storage_location
+    assert [c["Name"] for c in record["StorageDescriptor"]["Columns"]] == ["id", "value"]
@@ -0,0 +1,120 @@
+from bricksync import BrickSync
+from bricksync.cache import MetadataCache, CacheEntryType
+from bricksync.config import BrickSyncConfig
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+from multiprocessing import get_context
+import pytest, os
+
+TABLE = "bench.schema_0.table_0"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "metadata.db")
+
+
+def test_put_get_and_invalidate(cache_path):
+    cache = MetadataCache(cache_path)
+    cache.put(CacheEntryType.PROVIDER, "volumes", [{"name": "v"}])
+    assert cache.get(CacheEntryType.PROVIDER, "volumes") == [{"name": "v"}]
+    assert cache.get(CacheEntryType.TARGET_STATE, "volumes") is None
+    cache.invalidate(CacheEntryType.PROVIDER, "volumes")
+    assert cache.get(CacheEntryType.PROVIDER, "volumes") is None
+
+def test_entries_expire_per_type(cache_path):
+    clock = Clock()
+    cache = MetadataCache(cache_path, ttls={"target_state": 10, "provider": 100}, clock=clock)
+    cache.put(CacheEntryType.TARGET_STATE, "t", "s3://a")
+    cache.put(CacheEntryType.PROVIDER, "p", "x")
+    clock.now += 11
+    assert cache.get(CacheEntryType.TARGET_STATE, "t") is None
+    assert cache.get(CacheEntryType.PROVIDER, "p") == "x"
+
+def test_least_recently_used_entries_are_evicted(cache_path):
+    clock = Clock()
+    cache = MetadataCache(cache_path, ttls={"source_table": 100}, max_entries=2, clock=clock)
+    cache.put(CacheEntryType.SOURCE_TABLE, "a", 1)
+    clock.now += 10
+    cache.put(CacheEntryType.SOURCE_TABLE, "b", 2)
+    clock.now += 10
+    cache.get(CacheEntryType.SOURCE_TABLE, "a")
+    clock.now += 10
+    cache.put(CacheEntryType.SOURCE_TABLE, "c", 3)
+    assert len(cache) == 2
+    assert cache.get(CacheEntryType.SOURCE_TABLE, "b") is None
+    assert cache.get(CacheEntryType.SOURCE_TABLE, "a") == 1
+
+def test_reads_touch_entries_sparingly(cache_path):
+    clock = Clock()
+    cache = MetadataCache(cache_path, ttls={"source_table": 100}, clock=clock)
+    cache.put(CacheEntryType.SOURCE_TABLE, "a", 1)
+    accessed_at = lambda: cache._db.connection.execute("SELECT accessed_at FROM entries").fetchone()[0]
+    clock.now += 5
+    cache.get(CacheEntryType.SOURCE_TABLE, "a")
+    assert accessed_at() == 1000
+    clock.now += 5
+    cache.get(CacheEntryType.SOURCE_TABLE, "a")
+    assert accessed_at() == 1010
+
+def test_eviction_runs_every_few_puts(cache_path):
+    cache = MetadataCache(cache_path, max_entries=200)
+    assert cache.evict_every == 2
+    for i in range(203):
+        cache.put(CacheEntryType.SOURCE_TABLE, str(i), i)
+    # The odd put only inserts; the next one evicts
+    assert len(cache) == 201
+    cache.put(CacheEntryType.SOURCE_TABLE, "last", 0)
+    assert len(cache) == 200
+
+def _write_entries(path, worker):
+    cache = MetadataCache(path)
+    for i in range(50):
+        cache.put(CacheEntryType.TARGET_STATE, f"{worker}-{i}", i)
+        cache.get(CacheEntryType.TARGET_STATE, f"{worker}-{i}")
+
+def test_concurrent_processes_share_the_cache(cache_path):
+    MetadataCache(cache_path)
+    ctx = get_context("fork")
+    workers = [ctx.Process(target=_write_entries, args=(cache_path, w)) for w in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert all(w.exitcode == 0 for w in workers)
+    assert len(MetadataCache(cache_path)) == 200
+
+def test_warm_run_only_checks_what_may_have_changed(cache_path):
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    cold = FakeEnvironment(lakehouse)
+    bs = cold.bricksync()
+    bs.set_metadata_cache(MetadataCache(cache_path))
+    bs.sync("databricks", TABLE, "snowflake", TABLE)
+
+    # A new process: fresh providers, same cache file, same Snowflake account
+    warm = FakeEnvironment(lakehouse)
+    warm.snowflake = cold.snowflake
+    cold.snowflake.log = warm.log
+    bs = warm.bricksync()
+    bs.set_metadata_cache(MetadataCache(cache_path))
+    bs.sync("databricks", TABLE, "snowflake", TABLE)
+    assert warm.log.counts == {("databricks", "rest.get"): 1}
+
+    lakehouse.commit(TABLE)
+    bs.sync("databricks", TABLE, "snowflake", TABLE)
+    assert warm.log.by_provider()["snowflake"] == 1
+    assert cold.snowflake.tables[TABLE.upper()] == lakehouse.tables[TABLE].metadata_location
+
+def test_config_enables_cache(cache_path, tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f"providers: []\nmetadata_cache:\n  path: {cache_path}\n  ttls:\n    target_state: 30\n")
+    bs = BrickSync.load(str(config_path))
+    assert bs.metadata_cache.ttls[CacheEntryType.TARGET_STATE] == 30
+    assert os.path.exists(cache_path)
@@ -0,0 +1,68 @@
+from bricksync.pipeline import SyncPipeline
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+from unittest.mock import MagicMock
+import pytest
+
+
+@pytest.fixture
+def lakehouse():
+    return FakeLakehouse.generate(tables=12, schemas=3)
+
+@pytest.fixture
+def env(lakehouse):
+    return FakeEnvironment(lakehouse)
+
+
+def test_databricks_iter_tables_pages(env, lakehouse):
+    names = list(env.databricks_catalog().iter_tables("bench", page_size=2))
+    assert sorted(names) == sorted(lakehouse.tables)
+    # 3 schemas of 4 tables: 2 schema pages, then 2 table pages per schema
+    assert env.log.counts[("databricks", "rest.get")] == 2 + 3 * 2
+
+def test_snowflake_iter_tables_pages(env, lakehouse):
+    lakehouse.add_view("bench.schema_0.v", ["bench.schema_0.table_0"])
+    env.snowflake.mirror()
+    names = list(env.snowflake_catalog().iter_tables("bench.schema_0", page_size=2))
+    assert sorted(names) == sorted(n.upper() for n in list(lakehouse.tables) + ["bench.schema_0.v"]
+                                   if n.startswith("bench.schema_0."))
+    assert len(list(env.snowflake_catalog().iter_tables("bench", page_size=2))) == 13
+
+def test_sync_namespace_streams_to_target(env, lakehouse):
+    bs = env.bricksync()
+    report = bs.sync_namespace("databricks", "bench", "snowflake", queue_size=2)
+    assert len(report.results) == 12
+    assert report.failures == []
+    assert all(env.snowflake.tables[name.upper()] == spec.metadata_location
+               for name, spec in lakehouse.tables.items())
+
+def test_sync_namespace_isolates_failures(env, lakehouse):
+    lakehouse.add_table("bench.schema_0.plain", uniform=False)
+    bs = env.bricksync()
+    report = bs.sync_namespace("databricks", "bench.schema_0", "glue")
+    assert [r.sync.source for r in report.failures] == ["bench.schema_0.plain"]
+    assert len(env.glue.tables) == 4
+
+def test_pipeline_applies_backpressure(env):
+    lakehouse = FakeLakehouse.generate(tables=500, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    listed = []
+    databricks = bs.get_provider("databricks")
+    list_tables = databricks.iter_tables
+    def counting_iter_tables(namespace):
+        for name in list_tables(namespace):
+            listed.append(name)
+            yield name
+    databricks.iter_tables = counting_iter_tables
+    results = SyncPipeline(bs, "databricks", "glue", queue_size=2, resolve_workers=1, write_workers=1).run("bench")
+    first = next(results)
+    assert first.succeeded
+    # Only what fits in the queues and stages has been listed when the first table lands
+    assert len(listed) < 20
+    results.close()
+
+def test_listing_failure_is_raised(env):
+    bs = env.bricksync()
+    bs.get_provider("databricks").iter_tables = MagicMock(side_effect=RuntimeError("listing down"))
+    with pytest.raises(RuntimeError):
+        list(SyncPipeline(bs, "databricks", "glue").run("bench"))
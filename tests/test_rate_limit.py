@@ -0,0 +1,66 @@
+from bricksync.ratelimit import TokenBucket, RateLimiter, OperationClass, operation_class
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+from concurrent.futures import ThreadPoolExecutor
+import asyncio, pytest, time
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_paces():
+    clock = Clock()
+    bucket = TokenBucket(rate=10, burst=2, clock=clock)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+    clock.now += 1.0
+    # Tokens accrue up to the burst only
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1)
+
+def test_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_operation_class():
+    assert operation_class("SELECT SYSTEM$GET_ICEBERG_TABLE_INFORMATION") == OperationClass.READ
+    assert operation_class("ALTER ICEBERG TABLE") == OperationClass.WRITE
+    assert operation_class("CREATE OR REPLACE VIEW") == OperationClass.WRITE
+    assert operation_class("update_glue_table", frozenset({"update_glue_table"})) == OperationClass.WRITE
+    assert operation_class("read_metadata") is None
+
+def test_limiter_is_shared_across_threads():
+    limiter = RateLimiter(read_rate=100, read_burst=1)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: limiter.acquire(OperationClass.READ), range(21)))
+    assert time.perf_counter() - start >= 0.19
+    # Writes have no budget, so they are not held back
+    start = time.perf_counter()
+    for _ in range(50):
+        limiter.acquire(OperationClass.WRITE)
+    assert time.perf_counter() - start < 0.05
+
+def test_limiter_paces_coroutines():
+    limiter = RateLimiter(write_rate=100, write_burst=1)
+    async def run():
+        await asyncio.gather(*[limiter.acquire_async(OperationClass.WRITE) for _ in range(11)])
+    start = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - start >= 0.09
+
+def test_provider_calls_are_rate_limited():
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    glue = env.glue_catalog()
+    glue.rate_limiter = RateLimiter(read_rate=50, read_burst=1)
+    start = time.perf_counter()
+    for _ in range(6):
+        glue._list_tables("schema_0")
+    assert time.perf_counter() - start >= 0.09
@@ -0,0 +1,120 @@
+from bricksync.retry import (ErrorClass, ErrorClassifier, RetryPolicy, CircuitBreaker,
+                             call_with_retry, call_with_retry_async)
+from bricksync.exceptions import CircuitOpenError
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+import asyncio, pytest
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0)
+CLASSIFIER = ErrorClassifier(retryable=("Session no longer exists",), idempotent_success=("already exists",))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Flaky:
+    """Fails with each of errors in turn, then returns "ok" """
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_classify():
+    assert CLASSIFIER.classify(Exception("Session no longer exists")) == ErrorClass.RETRYABLE
+    assert CLASSIFIER.classify(ConnectionResetError()) == ErrorClass.RETRYABLE
+    assert CLASSIFIER.classify(Exception("Read timed out")) == ErrorClass.RETRYABLE
+    assert CLASSIFIER.classify(Exception("Table T already exists")) == ErrorClass.IDEMPOTENT_SUCCESS
+    assert CLASSIFIER.classify(Exception("Table T does not exist")) == ErrorClass.FATAL
+    assert CLASSIFIER.classify(CircuitOpenError("timed out")) == ErrorClass.FATAL
+
+def test_backoff_is_bounded_and_jittered():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    delays = [policy.backoff(10) for _ in range(100)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy.backoff(1) <= 1.0
+
+def test_retries_transient_errors():
+    fn = Flaky(Exception("Session no longer exists"), TimeoutError())
+    assert call_with_retry(fn, CLASSIFIER, NO_WAIT, CircuitBreaker()) == "ok"
+    assert fn.calls == 3
+
+def test_gives_up_after_max_attempts():
+    fn = Flaky(*[Exception("Session no longer exists")] * 3)
+    with pytest.raises(Exception, match="Session"):
+        call_with_retry(fn, CLASSIFIER, NO_WAIT, CircuitBreaker())
+    assert fn.calls == 3
+
+def test_fatal_and_non_idempotent_are_not_retried():
+    fn = Flaky(Exception("does not exist"))
+    with pytest.raises(Exception):
+        call_with_retry(fn, CLASSIFIER, NO_WAIT, CircuitBreaker())
+    fn = Flaky(Exception("Session no longer exists"))
+    with pytest.raises(Exception):
+        call_with_retry(fn, CLASSIFIER, NO_WAIT, CircuitBreaker(), idempotent=False)
+    assert fn.calls == 1
+
+def test_already_exists_is_success_only_on_a_retry():
+    with pytest.raises(Exception, match="already exists"):
+        call_with_retry(Flaky(Exception("already exists")), CLASSIFIER, NO_WAIT, CircuitBreaker())
+    fn = Flaky(Exception("Session no longer exists"), Exception("already exists"))
+    assert call_with_retry(fn, CLASSIFIER, NO_WAIT, CircuitBreaker()) is None
+    assert fn.calls == 2
+
+def test_nested_calls_defer_to_the_outer_retry():
+    inner = Flaky(Exception("Session no longer exists"))
+    outer = lambda: call_with_retry(inner, CLASSIFIER, NO_WAIT, CircuitBreaker())
+    assert call_with_retry(outer, CLASSIFIER, NO_WAIT, CircuitBreaker()) == "ok"
+    assert inner.calls == 2
+
+def test_circuit_opens_and_half_opens():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=clock)
+    fn = Flaky(*[Exception("Session no longer exists")] * 3)
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(fn, CLASSIFIER, NO_WAIT, breaker)
+    assert fn.calls == 2 and breaker.is_open
+    clock.now += 10
+    # The trial call fails, which opens the circuit again
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(fn, CLASSIFIER, NO_WAIT, breaker)
+    assert fn.calls == 3
+    clock.now += 10
+    assert call_with_retry(fn, CLASSIFIER, NO_WAIT, breaker) == "ok"
+    assert not breaker.is_open
+
+def test_retry_async():
+    fn = Flaky(Exception("Session no longer exists"))
+    async def call():
+        return fn()
+    assert asyncio.run(call_with_retry_async(call, CLASSIFIER, NO_WAIT, CircuitBreaker())) == "ok"
+    assert fn.calls == 2
+
+def test_glue_refresh_survives_concurrent_update():
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    bs = env.bricksync()
+    table = "bench.schema_0.table_0"
+    bs.sync("databricks", table, "glue", table)
+    bs.get_provider("glue").retry_policy = NO_WAIT
+    lakehouse.commit(table)
+    update = env.glue._update_glue_table
+    def racing_update(database_name, table_name, table_input, version_id):
+        # Another writer commits between our read and our update, once
+        env.glue._update_glue_table = update
+        env.glue.tables[(database_name, table_name)]["VersionId"] = str(int(version_id) + 1)
+        return update(database_name, table_name, table_input, version_id)
+    env.glue._update_glue_table = racing_update
+    bs.sync("databricks", table, "glue", table)
+    assert env.glue.tables[("schema_0", "table_0")]["Parameters"]["metadata_location"] == \
+        lakehouse.tables[table].metadata_location
@@ -177,3 +177,80 @@ def test_get_table(mock_connect):
     assert iceberg_table.name == 'test_table'
     assert iceberg_table.iceberg_metadata_location == 's3://bucket/path/metadata'
 
+
+def test_snowflake_catalog_bulk_metadata_locations():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=25, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    env.snowflake.mirror()
+    catalog = env.snowflake_catalog()
+    names = list(lakehouse.tables) + ["bench.schema_0.missing"]
+    locations = catalog.get_iceberg_metadata_locations(names, chunk_size=10)
+    assert locations == {name: spec.metadata_location for name, spec in lakehouse.tables.items()}
+    # Three chunks, and the chunk with the missing table is split to isolate it
+    assert env.log.total < 15
+
+def test_snowflake_catalog_bulk_lookups_escape_names():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=2, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    env.snowflake.mirror()
+    quoted = 'bench.schema_0."it\'s"'
+    env.snowflake.tables[quoted.upper()] = "s3://bucket/quoted/metadata.json"
+    env.snowflake.views['BENCH.SCHEMA_0."O\'BRIEN"'] = "create or replace view v as select 1"
+    catalog = env.snowflake_catalog()
+    names = list(lakehouse.tables) + [quoted]
+    assert len(catalog.get_iceberg_metadata_locations(names)) == 3
+    assert catalog.get_view_ddls(['bench.schema_0."o\'brien"'])
+    # Each batch is a single statement, not split around the quoted name
+    assert len(env.snowflake.statements) == 2
+
+def test_snowflake_catalog_stale_tables():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=3, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    env.snowflake.mirror()
+    catalog = env.snowflake_catalog()
+    lakehouse.commit("bench.schema_0.table_1")
+    tables = [IcebergTable(name, spec.storage_location, spec.metadata_location)
+              for name, spec in lakehouse.tables.items()]
+    assert [t.name for t in catalog.stale_tables(tables)] == ["bench.schema_0.table_1"]
+    assert env.log.total == 1
+
+def test_snowflake_catalog_forgets_uuid_of_unknown_metadata():
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    catalog = env.snowflake_catalog()
+    name = "bench.schema_0.table_0"
+    spec = lakehouse.tables[name]
+    catalog.create_or_refresh_external_table(IcebergTable(name, spec.storage_location, spec.metadata_location,
+                                                          table_uuid=spec.table_uuid))
+    # The table is replaced behind our back, then refreshed to metadata of unknown uuid
+    lakehouse.overwrite(name)
+    env.snowflake.tables[name.upper()] = env.snowflake._volume_path(spec.metadata_location)
+    lakehouse.commit(name)
+    catalog.create_or_refresh_external_table(IcebergTable(name, spec.storage_location, spec.metadata_location))
+    assert catalog._target_table_uuid(name) is None
+    lakehouse.commit(name)
+    catalog.create_or_refresh_external_table(IcebergTable(name, spec.storage_location, spec.metadata_location,
+                                                          table_uuid=spec.table_uuid))
+    assert not any("CREATE OR REPLACE" in s for s in env.snowflake.statements)
+
+def test_snowflake_catalog_only_creates_tables_that_are_missing(tmp_path):
+    from bricksync.testing import FakeEnvironment, FakeLakehouse
+    from bricksync.cache import MetadataCache
+    lakehouse = FakeLakehouse.generate(tables=1, schemas=1)
+    env = FakeEnvironment(lakehouse)
+    catalog = env.snowflake_catalog()
+    catalog.metadata_cache = MetadataCache(str(tmp_path / "cache.db"))
+    name = "bench.schema_0.table_0"
+    spec = lakehouse.tables[name]
+    catalog.create_or_refresh_external_table(IcebergTable(name, spec.storage_location, spec.metadata_location))
+    assert catalog._is_missing_table_error(Exception(f"Table '{name.upper()}' does not exist or not authorized."), name)
+    # A missing metadata file is not a missing table, so the table is not "created" in place
+    missing = IcebergTable(name, spec.storage_location, f"{spec.storage_location}/metadata/99999-gone.metadata.json")
+    with pytest.raises(Exception, match="Metadata file"):
+        catalog.create_or_refresh_external_table(missing)
+    assert sum("CREATE ICEBERG TABLE IF NOT EXISTS" in s for s in env.snowflake.statements) == 1
+    assert not catalog._is_current(missing)
@@ -0,0 +1,127 @@
+from bricksync.config import ProviderConfig, ProviderType
+from bricksync.provider.catalog.databricks import (DatabricksCatalog, AsyncDatabricksCatalog, DBSQLException,
+                                                   split_statements)
+from bricksync.table import IcebergTable
+from bricksync.testing import FakeEnvironment, FakeLakehouse, assert_call_budget
+import asyncio, pytest, time
+
+TABLE = "bench.schema_0.table_0"
+
+
+@pytest.fixture
+def lakehouse():
+    return FakeLakehouse.generate(tables=3, schemas=1)
+
+@pytest.fixture
+def env(lakehouse):
+    return FakeEnvironment(lakehouse)
+
+def iceberg_table(lakehouse) -> IcebergTable:
+    spec = lakehouse.tables[TABLE]
+    return IcebergTable(TABLE, spec.storage_location, spec.metadata_location)
+
+
+def test_split_statements():
+    assert split_statements("CREATE TABLE a; REFRESH TABLE a METADATA_PATH 's3://b;c';\n") == [
+        "CREATE TABLE a", "REFRESH TABLE a METADATA_PATH 's3://b;c'"]
+    assert split_statements("SELECT 'it''s; fine', \"x;y\", `z;`") == ["SELECT 'it''s; fine', \"x;y\", `z;`"]
+    assert split_statements(" ; ") == []
+
+def test_initialize_requires_a_warehouse_id():
+    with pytest.raises(ValueError, match="warehouse_id"):
+        DatabricksCatalog.initialize(ProviderConfig(ProviderType.DATABRICKS, configuration={"sql_backend": "warehouse"}))
+    with pytest.raises(ValueError, match="sql_backend"):
+        DatabricksCatalog.initialize(ProviderConfig(ProviderType.DATABRICKS, configuration={"sql_backend": "jdbc"}))
+
+def test_generate_iceberg_metadata_without_spark(env, lakehouse):
+    lakehouse.tables[TABLE].delta_version = 12
+    catalog = env.databricks_catalog(warehouse=True)
+    table = catalog.generate_iceberg_metadata(TABLE)
+    assert table.uniform_iceberg_info.converted_delta_version == 12
+    assert env.spark.statements == []
+    assert [s.split()[0] for s in env.workspace.statement_execution.statements] == ["DESCRIBE", "MSCK"]
+
+def test_scripts_run_one_statement_at_a_time(env, lakehouse):
+    catalog = env.databricks_catalog(warehouse=True)
+    with assert_call_budget("Iceberg->Databricks on a warehouse", per_provider={"databricks": 2}) as counters:
+        catalog.create_or_refresh_external_table(iceberg_table(lakehouse))
+    assert counters.calls_for("databricks", "CREATE TABLE") == 1
+    assert counters.calls_for("databricks", "REFRESH TABLE") == 1
+    statements = env.workspace.statement_execution.statements
+    assert [s.split()[0] for s in statements] == ["CREATE", "REFRESH"]
+    assert not any(s.rstrip().endswith(";") for s in statements)
+
+def test_rows_are_typed_and_read_across_chunks(env, lakehouse):
+    env.workspace.statement_execution.chunk_size = 1
+    catalog = env.databricks_catalog(warehouse=True)
+    assert catalog.latest_delta_version(catalog.get_table(TABLE)) == lakehouse.tables[TABLE].delta_version
+    query = ("SELECT t.table_name, t.table_type FROM system.information_schema.tables t "
+             "WHERE (t.table_catalog = 'bench' AND t.table_schema = 'schema_0')")
+    rows = [(r.table_name, r.table_type) for r in catalog.sql(query)]
+    assert rows == [(r.table_name, r.table_type) for r in env.databricks_catalog().sql(query)]
+    assert len(rows) == len(lakehouse.tables) + len(lakehouse.views)
+    assert env.log.counts[("databricks", "statements.get_chunk")] == len(rows) - 1
+
+def test_batch_is_submitted_before_it_is_polled(env, lakehouse):
+    api = env.workspace.statement_execution
+    api.polls = 2
+    get_statement = api.get_statement
+    def get_after_all_submitted(statement_id):
+        assert len(api.statements) == len(lakehouse.tables)
+        return get_statement(statement_id)
+    api.get_statement = get_after_all_submitted
+    catalog = env.databricks_catalog(warehouse=True)
+    results = catalog.sql_batch([f"DESCRIBE HISTORY {name} LIMIT 1" for name in lakehouse.tables])
+    assert [rows[0].version for rows in results] == [spec.delta_version for spec in lakehouse.tables.values()]
+    assert env.log.counts[("databricks", "statements.get")] == 2 * len(lakehouse.tables)
+
+def test_failed_statement_raises(env, lakehouse):
+    env.workspace.statement_execution.fail_on = "REFRESH TABLE"
+    catalog = env.databricks_catalog(warehouse=True)
+    with pytest.raises(DBSQLException, match="BAD_REQUEST"):
+        catalog.create_or_refresh_external_table(iceberg_table(lakehouse))
+
+def test_async_create_polls_from_the_event_loop(env, lakehouse):
+    env.workspace.statement_execution.polls = 3
+    provider = env.databricks_catalog(warehouse=True).to_async()
+    assert isinstance(provider, AsyncDatabricksCatalog)
+    asyncio.run(provider.create_or_refresh_external_table(iceberg_table(lakehouse)))
+    assert env.log.counts[("databricks", "statements.get")] == 6
+    assert env.spark.statements == []
+    # Without a warehouse the generic thread pool wrapper is used
+    assert not isinstance(env.databricks_catalog().to_async(), AsyncDatabricksCatalog)
+
+def test_async_statements_overlap_without_blocking_the_loop():
+    lakehouse = FakeLakehouse.generate(tables=16, schemas=1)
+    # Every submit and status check is a 20ms HTTP round trip
+    env = FakeEnvironment(lakehouse, latency=0.02)
+    env.workspace.statement_execution.polls = 2
+    provider = env.databricks_catalog(warehouse=True).to_async()
+    tables = [IcebergTable(name, spec.storage_location, spec.metadata_location) for name, spec in lakehouse.tables.items()]
+    gaps = []
+
+    async def tick(done: asyncio.Event):
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    async def create_all():
+        done = asyncio.Event()
+        ticker = asyncio.ensure_future(tick(done))
+        await asyncio.gather(*[provider.create_or_refresh_external_table(t) for t in tables])
+        done.set()
+        await ticker
+
+    start = time.perf_counter()
+    asyncio.run(create_all())
+    elapsed = time.perf_counter() - start
+    provider.close()
+    round_trips = env.log.counts[("databricks", "statements.execute")] + env.log.counts[("databricks", "statements.get")]
+    assert round_trips == 16 * 2 * 3
+    # The round trips overlap on the thread pool...
+    assert elapsed < 0.02 * round_trips / 3
+    # ...and none of them holds up the loop
+    assert max(gaps) < 0.02
@@ -1,4 +1,5 @@
-from bricksync.table import Table, View, DeltaTable, IcebergTable, UniformIcebergInfo
+from bricksync.table import Table, View, DeltaTable, IcebergTable, UniformIcebergInfo, TableIdentifier
+import pytest, copy, pickle
 from pytest import fixture
 
 @fixture
@@ -58,4 +59,41 @@ def test_view(view):
     assert not view.is_table()
     assert view.is_view()
 
+def test_tables_are_slotted(delta_table, iceberg_table, view):
+    for obj in [delta_table, iceberg_table, view, view.base_tables[0]]:
+        assert not hasattr(obj, "__dict__")
 
+def test_identifier_is_parsed_once_per_name(iceberg_table):
+    identifier = iceberg_table.identifier
+    assert identifier.parts == ("cat", "schema", "b")
+    assert iceberg_table.identifier is identifier
+    assert TableIdentifier.parse("cat.schema.b") is identifier
+    iceberg_table.set_name("cat.other.b")
+    assert iceberg_table.identifier.schema == "other"
+
+def test_quoted_identifiers():
+    identifier = TableIdentifier.parse('`my.cat`."sch""ema".t')
+    assert identifier.parts == ("my.cat", 'sch"ema', "t")
+    assert (identifier.catalog, identifier.schema, identifier.table) == ("my.cat", 'sch"ema', "t")
+    assert TableIdentifier.parse("schema.t").catalog is None
+    with pytest.raises(ValueError):
+        TableIdentifier.parse("`my.cat.t")
+    with pytest.raises(ValueError):
+        TableIdentifier.parse("cat.schema.t.extra")
+
+def test_delta_properties_are_shared(delta_table):
+    other = DeltaTable(name="cat.schema.z",
+                       storage_location="s3://foo/baz",
+                       delta_properties={"delta": "properties"},
+                       uniform_iceberg_info=None)
+    assert other.delta_properties is delta_table.delta_properties
+    with pytest.raises(TypeError):
+        other.delta_properties["delta"] = "changed"
+    assert delta_table.delta_properties == {"delta": "properties"}
+
+def test_delta_tables_can_be_copied_and_pickled(delta_table):
+    for copied in [copy.deepcopy(delta_table), pickle.loads(pickle.dumps(delta_table))]:
+        assert copied == delta_table
+        assert copied.delta_properties is delta_table.delta_properties
+        with pytest.raises(TypeError):
+            copied.delta_properties["delta"] = "changed"
@@ -0,0 +1,79 @@
+from bricksync.tracing import (Tracer, CallbackSink, LoggingSink, SpanOutcome,
+                               CallCounters, statement_operation)
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+import threading, contextvars, logging, pytest
+
+
+def test_statement_operation():
+    assert statement_operation("ALTER ICEBERG TABLE a.b.c REFRESH 'x'") == "ALTER ICEBERG TABLE"
+    assert statement_operation("CREATE OR REPLACE ICEBERG TABLE a.b.c") == "CREATE OR REPLACE ICEBERG TABLE"
+    assert statement_operation("SELECT SYSTEM$GET_ICEBERG_TABLE_INFORMATION('a') as I") == "SELECT SYSTEM$GET_ICEBERG_TABLE_INFORMATION"
+    assert statement_operation("  SHOW EXTERNAL VOLUMES") == "SHOW EXTERNAL VOLUMES"
+    assert statement_operation("MSCK REPAIR TABLE a.b.c SYNC METADATA") == "MSCK REPAIR TABLE"
+
+def test_span_records_outcome():
+    spans = []
+    tracer = Tracer([CallbackSink(on_span=spans.append)])
+    assert tracer.call("snowflake", "op", "t", lambda x: x + 1, 1) == 2
+    with pytest.raises(ValueError):
+        with tracer.span("glue", "load_table", "s.t"):
+            raise ValueError("boom")
+    assert [s.outcome for s in spans] == [SpanOutcome.OK, SpanOutcome.ERROR]
+    assert spans[1].error == "ValueError: boom"
+    assert spans[1].target == "s.t"
+    assert spans[0].latency >= 0
+
+def test_collect_is_scoped_and_nested():
+    tracer = Tracer()
+    tracer.call("a", "op", None, lambda: None)
+    with tracer.collect() as outer:
+        tracer.call("a", "op", None, lambda: None)
+        with tracer.collect() as inner:
+            tracer.call("b", "op", None, lambda: None)
+    assert outer.calls == 2
+    assert inner.calls == 1
+    assert outer.by_provider() == {"a": 1, "b": 1}
+
+def test_collect_follows_copied_context_into_threads():
+    tracer = Tracer()
+    with tracer.collect() as counters:
+        ctx = contextvars.copy_context()
+        t = threading.Thread(target=ctx.run, args=(tracer.call, "a", "op", None, lambda: None))
+        t.start(); t.join()
+    assert counters.calls == 1
+
+def test_counters_merge_and_export(caplog):
+    exported = []
+    tracer = Tracer([CallbackSink(on_counters=lambda c, label: exported.append((c.calls, label))),
+                     LoggingSink()])
+    with tracer.collect() as counters:
+        tracer.call("a", "op", None, lambda: None)
+    total = CallCounters()
+    total.merge(counters)
+    total.merge(counters)
+    assert total.calls_for("a", "op") == 2
+    with caplog.at_level(logging.INFO, logger="bricksync.tracing"):
+        tracer.export(counters, "label")
+    assert exported == [(1, "label")]
+    assert "1 remote calls" in caplog.text
+
+def test_failing_sink_does_not_break_calls():
+    def bad(span):
+        raise RuntimeError("sink down")
+    tracer = Tracer([CallbackSink(on_span=bad)])
+    assert tracer.call("a", "op", None, lambda: 5) == 5
+
+def test_sync_counters_cover_every_remote_call():
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    bs = env.bricksync()
+    exported = []
+    bs.add_trace_sink(CallbackSink(on_counters=lambda c, label: exported.append(c)))
+    name = "bench.schema_0.table_0"
+    bs.sync("databricks", name, "snowflake", name)
+    bs.sync("databricks", name, "glue", name)
+    assert len(exported) == 2
+    snowflake, glue = exported
+    assert snowflake.calls_for("snowflake") == env.log.counts[("snowflake", "execute")]
+    assert snowflake.calls_for("databricks", "tables.get") == 1
+    assert glue.calls_for("glue", "register_table") == 1
+    assert snowflake.errors >= 1  # SYSTEM$REFERENCE probe for a view fails on a table
@@ -0,0 +1,122 @@
+from bricksync.config import SyncConfig
+from bricksync.workqueue import WorkQueue, SyncWorker, DONE, FAILED, LEASED, PENDING
+from bricksync.testing import FakeEnvironment, FakeLakehouse
+from multiprocessing import get_context
+import pytest, sqlite3, threading, time
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / "queue.db")
+
+def _syncs(count, target="glue"):
+    return [SyncConfig(f"bench.schema_0.table_{i}", "databricks", target) for i in range(count)]
+
+
+def test_enqueue_is_idempotent(queue_path):
+    queue = WorkQueue(queue_path)
+    assert queue.enqueue(_syncs(3)) == 3
+    assert queue.enqueue(_syncs(4)) == 1
+    assert queue.counts()[PENDING] == 4
+
+def test_leased_task_is_not_claimed_twice(queue_path):
+    queue = WorkQueue(queue_path)
+    queue.enqueue(_syncs(1))
+    assert len(queue.claim("a")) == 1
+    assert queue.claim("b") == []
+
+def test_expired_lease_is_reclaimed(queue_path):
+    clock = Clock()
+    queue = WorkQueue(queue_path, lease_seconds=10, clock=clock)
+    queue.enqueue(_syncs(1))
+    task = queue.claim("a")[0]
+    clock.now += 5
+    assert queue.heartbeat(task, "a")
+    clock.now += 9
+    assert queue.claim("b") == []
+    clock.now += 2
+    reclaimed = queue.claim("b")[0]
+    assert reclaimed.attempts == 2
+    # The first worker lost its lease and can no longer complete the task
+    assert not queue.heartbeat(task, "a")
+    assert not queue.complete(task, "a")
+    assert queue.complete(reclaimed, "b")
+    assert queue.counts()[DONE] == 1
+
+def test_worker_stops_a_sync_whose_lease_was_lost(queue_path):
+    clock = Clock()
+    queue = WorkQueue(queue_path, lease_seconds=10, clock=clock)
+    queue.enqueue(_syncs(1))
+    env = FakeEnvironment(FakeLakehouse.generate(tables=1, schemas=1))
+    bs = env.bricksync()
+    databricks = bs.get_provider("databricks")
+    get_table = databricks.get_table
+    claimed = []
+    def stalled_get_table(name):
+        # The worker stalls past its lease and another worker takes the task over
+        clock.now += 11
+        claimed.extend(queue.claim("b"))
+        return get_table(name)
+    databricks.get_table = stalled_get_table
+    results = SyncWorker(bs, queue, worker_id="a").run(max_tasks=1)
+    assert results[0].abandoned and not results[0].succeeded
+    # Nothing was written under the lost lease
+    assert env.glue.tables == {}
+    assert queue.complete(claimed[0], "b")
+
+def test_failing_task_is_retried_then_failed(queue_path):
+    queue = WorkQueue(queue_path, max_attempts=2)
+    queue.enqueue(_syncs(1))
+    queue.complete(queue.claim("a")[0], "a", RuntimeError("down"))
+    assert queue.counts()[PENDING] == 1
+    queue.complete(queue.claim("a")[0], "a", RuntimeError("down"))
+    assert queue.counts()[FAILED] == 1
+    assert queue.failures() == {"databricks:bench.schema_0.table_0 -> glue": "down"}
+    assert queue.enqueue(_syncs(1), requeue=True) == 1
+    assert queue.counts()[PENDING] == 1
+
+def _drain(path, worker):
+    queue = WorkQueue(path)
+    while True:
+        tasks = queue.claim(worker)
+        if not tasks:
+            return
+        time.sleep(0.01)
+        assert queue.complete(tasks[0], worker)
+
+def test_workers_in_processes_drain_the_queue_once(queue_path):
+    WorkQueue(queue_path).enqueue(_syncs(40))
+    ctx = get_context("fork")
+    workers = [ctx.Process(target=_drain, args=(queue_path, f"w{w}")) for w in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert all(w.exitcode == 0 for w in workers)
+    conn = sqlite3.connect(queue_path)
+    assert conn.execute("SELECT state, attempts, COUNT(*) FROM tasks GROUP BY state, attempts").fetchall() == [(DONE, 1, 40)]
+
+def test_bricksync_workers_share_a_sweep(queue_path):
+    lakehouse = FakeLakehouse.generate(tables=6, schemas=1)
+    env = FakeEnvironment(lakehouse, latency=0.005)
+    queue = WorkQueue(queue_path)
+    queue.enqueue(_syncs(6) + [SyncConfig("bench.schema_0.missing", "databricks", "glue")])
+    reports = [None, None]
+    def work(i):
+        reports[i] = env.bricksync().work(queue, worker_id=f"w{i}")
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(len(r.results) for r in reports) == 6 + queue.max_attempts
+    assert len(env.glue.tables) == 6
+    assert queue.counts() == {PENDING: 0, LEASED: 0, DONE: 6, FAILED: 1}